@@ -1,19 +1,22 @@
-from agents.trend_agent import TrendDiscoveryAgent
-from agents.script_agent import ScriptWriterAgent
-from agents.image_agent import ImageCollectorAgent
-from agents.video_agent import VideoCreatorAgent
-from agents.voice_agent import VoiceGeneratorAgent
-from agents.music_agent import MusicAgent
-from agents.publisher_agent import PublisherAgent
-from agents.analytics_agent import AnalyticsAgent
+import importlib
 
-__all__ = [
-    "TrendDiscoveryAgent",
-    "ScriptWriterAgent",
-    "ImageCollectorAgent",
-    "VideoCreatorAgent",
-    "VoiceGeneratorAgent",
-    "MusicAgent",
-    "PublisherAgent",
-    "AnalyticsAgent",
-]
+# Agents are imported on first access so that "from agents.X import Y"
+# (and main's lazy agent proxies) only pull in the one module they need.
+_MODULES = {
+    "TrendDiscoveryAgent": "agents.trend_agent",
+    "ScriptWriterAgent": "agents.script_agent",
+    "ImageCollectorAgent": "agents.image_agent",
+    "VideoCreatorAgent": "agents.video_agent",
+    "VoiceGeneratorAgent": "agents.voice_agent",
+    "MusicAgent": "agents.music_agent",
+    "PublisherAgent": "agents.publisher_agent",
+    "AnalyticsAgent": "agents.analytics_agent",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(importlib.import_module(_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
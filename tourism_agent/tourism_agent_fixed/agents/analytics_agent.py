@@ -4,36 +4,128 @@ Fetches post metrics from YouTube and Instagram, stores them in SQLite,
 analyses performance trends, and generates weekly HTML/JSON reports.
 """
 
+import re
 import json
+import time
+import atexit
+import asyncio
 import sqlite3
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
-import requests
+# orjson is an optional, faster JSON codec; fall back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import config
 from utils.logger import logger
 from utils.file_manager import get_output_path
+from utils.http_client import create_session
 
-DB_PATH = Path(__file__).parent.parent / "logs" / "analytics.db"
+DB_PATH = config.LOGS_DIR / "analytics.db"
+
+
+# Video ID inside watch?v=, youtu.be/ and /shorts/ URLs
+_YT_ID = re.compile(r"(?:v=|youtu\.be/|/shorts/)([A-Za-z0-9_-]{11})")
+
+# Report markup, built once at import; rows are streamed between the parts
+_ROW_FMT = "<tr><td>{}</td><td>{:,.0f}</td></tr>".format
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Tourism Agent – Weekly Analytics Report</title>
+<style>
+  body {{ font-family: Arial, sans-serif; max-width: 900px; margin: 40px auto; color: #333; }}
+  h1   {{ color: #1a73e8; }}
+  table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
+  th, td {{ border: 1px solid #ddd; padding: 10px; text-align: left; }}
+  th {{ background: #f2f2f2; }}
+  .stat {{ background: #e8f5e9; padding: 20px; border-radius: 8px; margin: 10px; display: inline-block; }}
+</style>
+</head>
+<body>
+<h1>🌍 Tourism Agent – Weekly Report</h1>
+<p>Generated: {generated_at} &nbsp;|&nbsp;
+   Posts analysed: {total_posts}</p>
+
+<h2>Average Views per Platform</h2>
+<table><tr><th>Platform</th><th>Avg Views</th></tr>"""
+_HTML_MIDDLE = """</table>
+
+<h2>Top Performing Topics</h2>
+<table><tr><th>Topic</th><th>Avg Views</th></tr>"""
+_HTML_TAIL = """</table>
+</body>
+</html>"""
+
+
+def _dumps(obj) -> str:
+    """Serialise *obj* to a JSON string, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _today() -> str:
+    """Return today's date as YYYY-MM-DD without going through strftime."""
+    now = datetime.now()
+    return f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
 
 
 class AnalyticsAgent:
     """Tracks video performance across all publishing platforms."""
 
+    CACHE_TTL = 300.0  # seconds a fetched metrics dict is reused
+
     def __init__(self) -> None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # One connection for the agent's lifetime; the lock serialises access
+        # from the executor threads that run the platform fetchers.
+        self.conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        atexit.register(self.close)
         self._init_db()
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "TourismAgent/1.0"})
+        # Retry transient Graph API failures and keep a pool big enough for
+        # the concurrent fetches in fetch_all_analytics()
+        self.session = create_session(
+            pool_connections=16,
+            status_forcelist=(500, 502, 503, 504),
+        )
+        self._cache: dict[tuple[str, str], tuple[float, dict]] = {}
+        self._youtube = None     # Built on first use by _get_youtube()
+        # (MAX(performance.id), insights) from the last analyze_performance()
+        self._insights_cache: tuple[int, dict] | None = None
+        # (style, word set) pairs used to map topics back to video styles
+        self._style_tokens = [
+            (style, frozenset(style.lower().split()))
+            for style in config.CONTENT_STYLE["video_styles"]
+        ]
         logger.info("AnalyticsAgent ready")
 
     # ── Database ─────────────────────────────────────────────────────────────
 
+    def close(self) -> None:
+        """Close the shared SQLite connection."""
+        with self._db_lock:
+            self.conn.close()
+
     def _init_db(self) -> None:
         """Create the SQLite database schema if it doesn't exist."""
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(DB_PATH) as conn:
+        with self._db_lock, self.conn as conn:
+            # WAL is persistent on the DB file; it lets readers run alongside
+            # the writer and, with synchronous=NORMAL, avoids an fsync per commit.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA busy_timeout=5000")
+
+            conn.execute("BEGIN")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS performance (
                     id           INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -42,9 +134,32 @@ class AnalyticsAgent:
                     date         TEXT    NOT NULL,
                     metrics_json TEXT    NOT NULL,
                     topic        TEXT,
+                    views        INTEGER NOT NULL DEFAULT 0,
                     UNIQUE(platform, post_id, date)
                 )
             """)
+            # Databases created before the views column existed: add and backfill it
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(performance)")}
+            if "views" not in columns:
+                conn.execute(
+                    "ALTER TABLE performance ADD COLUMN views INTEGER NOT NULL DEFAULT 0"
+                )
+                conn.execute("""
+                    UPDATE performance SET views = COALESCE(
+                        json_extract(metrics_json, '$.views'),
+                        json_extract(metrics_json, '$.reach'),
+                        0
+                    )
+                """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_perf_date ON performance(date DESC)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_perf_platform ON performance(platform)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_perf_topic_date ON performance(topic, date)"
+            )
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS content (
                     id           INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -56,7 +171,6 @@ class AnalyticsAgent:
                     post_ids     TEXT
                 )
             """)
-            conn.commit()
 
     def store_metrics(
         self,
@@ -77,28 +191,54 @@ class AnalyticsAgent:
         Returns:
             True on success.
         """
+        return self.store_metrics_bulk([self._metrics_row(platform, post_id, metrics, topic)])
+
+    def store_metrics_bulk(self, rows: list[tuple]) -> bool:
+        """
+        Persist several metric rows in a single transaction.
+
+        Args:
+            rows: Tuples built by _metrics_row().
+
+        Returns:
+            True on success.
+        """
+        if not rows:
+            return True
         try:
-            with sqlite3.connect(DB_PATH) as conn:
-                conn.execute(
+            with self._db_lock, self.conn as conn:
+                conn.executemany(
                     """
                     INSERT OR REPLACE INTO performance
-                        (platform, post_id, date, metrics_json, topic)
-                    VALUES (?, ?, ?, ?, ?)
+                        (platform, post_id, date, metrics_json, topic, views)
+                    VALUES (?, ?, ?, ?, ?, ?)
                     """,
-                    (
-                        platform,
-                        post_id,
-                        datetime.now().strftime("%Y-%m-%d"),
-                        json.dumps(metrics),
-                        topic,
-                    ),
+                    rows,
                 )
-                conn.commit()
+            self._insights_cache = None
             return True
         except Exception as exc:
             logger.error(f"DB write failed: {exc}")
             return False
 
+    @staticmethod
+    def _metrics_row(
+        platform: str,
+        post_id: str,
+        metrics: dict,
+        topic: str = "",
+        date: str | None = None,
+    ) -> tuple:
+        """Build a performance-table row for store_metrics_bulk()."""
+        return (
+            platform,
+            post_id,
+            date or _today(),
+            _dumps(metrics),
+            topic,
+            metrics.get("views", metrics.get("reach", 0)),
+        )
+
     def log_content(
         self,
         topic: str,
@@ -109,7 +249,7 @@ class AnalyticsAgent:
     ) -> None:
         """Record a newly published video to the content log."""
         try:
-            with sqlite3.connect(DB_PATH) as conn:
+            with self._db_lock, self.conn as conn:
                 conn.execute(
                     """
                     INSERT INTO content (created_at, topic, style, script_path, video_path, post_ids)
@@ -121,21 +261,21 @@ class AnalyticsAgent:
                         style,
                         script_path,
                         video_path,
-                        json.dumps(post_ids),
+                        _dumps(post_ids),
                     ),
                 )
-                conn.commit()
         except Exception as exc:
             logger.warning(f"Content log failed: {exc}")
 
     # ── Platform metric fetchers ──────────────────────────────────────────────
 
-    def fetch_youtube_analytics(self, video_id: str) -> dict:
+    def fetch_youtube_analytics(self, video_id: str, defer_store: bool = False) -> dict:
         """
         Fetch views, likes, comments, and watch time for a YouTube video.
 
         Args:
-            video_id: YouTube video ID.
+            video_id:    YouTube video ID.
+            defer_store: Skip the DB write; the caller batches it instead.
 
         Returns:
             Metrics dict.
@@ -143,21 +283,13 @@ class AnalyticsAgent:
         if not all([config.YOUTUBE_CLIENT_ID, config.YOUTUBE_REFRESH_TOKEN]):
             return {}
 
-        try:
-            from googleapiclient.discovery import build
-            from google.oauth2.credentials import Credentials
-
-            creds = Credentials(
-                token=None,
-                refresh_token=config.YOUTUBE_REFRESH_TOKEN,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=config.YOUTUBE_CLIENT_ID,
-                client_secret=config.YOUTUBE_CLIENT_SECRET,
-            )
-            youtube = build("youtube", "v3", credentials=creds, cache_discovery=False)
+        cached = self._get_cached("youtube", video_id)
+        if cached is not None:
+            return cached
 
+        try:
             resp = (
-                youtube.videos()
+                self._get_youtube().videos()
                 .list(part="statistics", id=video_id)
                 .execute()
             )
@@ -172,7 +304,9 @@ class AnalyticsAgent:
                 "comments": int(stats.get("commentCount", 0)),
                 "fetched":  datetime.now().isoformat(),
             }
-            self.store_metrics("youtube", video_id, metrics)
+            self._cache[("youtube", video_id)] = (time.monotonic(), metrics)
+            if not defer_store:
+                self.store_metrics("youtube", video_id, metrics)
             logger.info(f"YouTube metrics: {metrics}")
             return metrics
 
@@ -180,12 +314,13 @@ class AnalyticsAgent:
             logger.warning(f"YouTube analytics error: {exc}")
             return {}
 
-    def fetch_instagram_analytics(self, post_id: str) -> dict:
+    def fetch_instagram_analytics(self, post_id: str, defer_store: bool = False) -> dict:
         """
         Fetch reach, impressions, saves, and shares for an Instagram post.
 
         Args:
-            post_id: Instagram media ID.
+            post_id:     Instagram media ID.
+            defer_store: Skip the DB write; the caller batches it instead.
 
         Returns:
             Metrics dict.
@@ -193,6 +328,10 @@ class AnalyticsAgent:
         if not all([config.INSTAGRAM_ACCESS_TOKEN, config.INSTAGRAM_PAGE_ID]):
             return {}
 
+        cached = self._get_cached("instagram", post_id)
+        if cached is not None:
+            return cached
+
         try:
             resp = self.session.get(
                 f"https://graph.facebook.com/v18.0/{post_id}/insights",
@@ -206,7 +345,9 @@ class AnalyticsAgent:
             raw = resp.json().get("data", [])
             metrics = {item["name"]: item.get("values", [{}])[0].get("value", 0) for item in raw}
             metrics["fetched"] = datetime.now().isoformat()
-            self.store_metrics("instagram", post_id, metrics)
+            self._cache[("instagram", post_id)] = (time.monotonic(), metrics)
+            if not defer_store:
+                self.store_metrics("instagram", post_id, metrics)
             logger.info(f"Instagram metrics: {metrics}")
             return metrics
 
@@ -214,6 +355,35 @@ class AnalyticsAgent:
             logger.warning(f"Instagram analytics error: {exc}")
             return {}
 
+    def _get_youtube(self):
+        """Build the authenticated YouTube client once and reuse it."""
+        if self._youtube is None:
+            from googleapiclient.discovery import build
+            from google.oauth2.credentials import Credentials
+
+            creds = Credentials(
+                token=None,
+                refresh_token=config.YOUTUBE_REFRESH_TOKEN,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=config.YOUTUBE_CLIENT_ID,
+                client_secret=config.YOUTUBE_CLIENT_SECRET,
+            )
+            self._youtube = build(
+                "youtube", "v3",
+                credentials=creds,
+                cache_discovery=False,
+                static_discovery=True,
+            )
+        return self._youtube
+
+    def _get_cached(self, platform: str, post_id: str) -> Optional[dict]:
+        """Return metrics fetched within CACHE_TTL seconds, else None."""
+        hit = self._cache.get((platform, post_id))
+        if hit and time.monotonic() - hit[0] < self.CACHE_TTL:
+            logger.debug("{} metrics for {} served from cache", platform, post_id)
+            return hit[1]
+        return None
+
     async def fetch_all_analytics(self, post_ids: dict) -> dict:
         """
         Fetch analytics for all platforms and return combined results.
@@ -224,18 +394,42 @@ class AnalyticsAgent:
         Returns:
             Dict of platform → metrics.
         """
-        results = {}
+        # Platform id → blocking fetcher, run concurrently in worker threads
+        jobs: dict[str, tuple[str, object]] = {}
         for platform, pid in post_ids.items():
             if pid is None:
                 continue
-            try:
-                if platform == "youtube":
-                    vid = str(pid).split("v=")[-1] if "youtube.com" in str(pid) else str(pid)
-                    results["youtube"] = self.fetch_youtube_analytics(vid)
-                elif platform == "instagram":
-                    results["instagram"] = self.fetch_instagram_analytics(str(pid))
-            except Exception as exc:
-                logger.warning(f"Analytics fetch error for {platform}: {exc}")
+            if platform == "youtube":
+                pid = str(pid)
+                match = _YT_ID.search(pid)
+                vid = match.group(1) if match else pid
+                jobs["youtube"] = (vid, self.fetch_youtube_analytics)
+            elif platform == "instagram":
+                jobs["instagram"] = (str(pid), self.fetch_instagram_analytics)
+
+        if not jobs:
+            return {}
+
+        loop = asyncio.get_event_loop()
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as pool:
+            fetched = await asyncio.gather(
+                *(loop.run_in_executor(pool, fn, pid, True) for pid, fn in jobs.values()),
+                return_exceptions=True,
+            )
+
+        results = {}
+        rows: list[tuple] = []
+        date = _today()
+        for (platform, (pid, _)), metrics in zip(jobs.items(), fetched):
+            if isinstance(metrics, Exception):
+                logger.warning(f"Analytics fetch error for {platform}: {metrics}")
+                continue
+            results[platform] = metrics
+            if metrics:
+                rows.append(self._metrics_row(platform, pid, metrics, date=date))
+
+        # One transaction for every platform instead of a commit per fetch
+        self.store_metrics_bulk(rows)
         return results
 
     # ── Performance analysis ──────────────────────────────────────────────────
@@ -247,52 +441,46 @@ class AnalyticsAgent:
         Returns:
             Insights dict with averages, best topics, and best posting times.
         """
+        # Aggregate over the 200 most recent rows inside SQLite
+        recent = (
+            "WITH recent AS ("
+            "SELECT platform, topic, views FROM performance "
+            "ORDER BY date DESC LIMIT 200) "
+        )
         try:
-            with sqlite3.connect(DB_PATH) as conn:
-                rows = conn.execute(
-                    "SELECT platform, metrics_json, topic, date FROM performance "
-                    "ORDER BY date DESC LIMIT 200"
+            with self._db_lock:
+                # REPLACE re-inserts with a fresh id, so MAX(id) changes on every write
+                latest = self.conn.execute("SELECT MAX(id) FROM performance").fetchone()[0]
+                if self._insights_cache and self._insights_cache[0] == latest:
+                    return self._insights_cache[1]
+
+                total = self.conn.execute(
+                    recent + "SELECT COUNT(*) FROM recent"
+                ).fetchone()[0]
+                avg_rows = self.conn.execute(
+                    recent + "SELECT platform, AVG(views) FROM recent GROUP BY platform"
+                ).fetchall()
+                best_topics = self.conn.execute(
+                    recent + "SELECT topic, AVG(views) FROM recent "
+                    "WHERE topic IS NOT NULL AND topic != '' "
+                    "GROUP BY topic ORDER BY 2 DESC LIMIT 5"
                 ).fetchall()
         except Exception as exc:
             logger.error(f"Analytics query failed: {exc}")
             return {}
 
-        if not rows:
+        if not total:
             return {"status": "no data yet"}
 
-        platform_metrics: dict[str, list] = {}
-        topic_scores: dict[str, list]    = {}
-
-        for platform, metrics_json, topic, date in rows:
-            try:
-                m = json.loads(metrics_json)
-            except Exception:
-                continue
-
-            platform_metrics.setdefault(platform, []).append(m)
-            if topic:
-                views = m.get("views", m.get("reach", 0))
-                topic_scores.setdefault(topic, []).append(views)
-
-        # Average views per platform
-        avg_views = {}
-        for plat, metrics_list in platform_metrics.items():
-            vals = [m.get("views", m.get("reach", 0)) for m in metrics_list]
-            avg_views[plat] = sum(vals) / len(vals) if vals else 0
-
-        # Best topics
-        best_topics = sorted(
-            {t: sum(v) / len(v) for t, v in topic_scores.items()}.items(),
-            key=lambda x: x[1],
-            reverse=True,
-        )[:5]
+        avg_views = dict(avg_rows)
 
         insights = {
             "avg_views_per_platform": avg_views,
             "best_topics": [{"topic": t, "avg_views": round(v, 1)} for t, v in best_topics],
-            "total_posts_analysed": len(rows),
+            "total_posts_analysed": total,
             "generated_at": datetime.now().isoformat(),
         }
+        self._insights_cache = (latest, insights)
         logger.info(f"Performance insights generated: {insights}")
         return insights
 
@@ -307,11 +495,16 @@ class AnalyticsAgent:
 
         # JSON
         json_path = get_output_path("reports", f"report_{datetime.now().strftime('%Y_%W')}.json")
-        json_path.write_text(json.dumps(insights, indent=2))
+        if orjson is not None:
+            json_path.write_bytes(orjson.dumps(insights, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(insights, f, indent=2)
 
         # HTML
         html_path = json_path.with_suffix(".html")
-        html_path.write_text(self._render_html_report(insights))
+        with open(html_path, "w", encoding="utf-8") as f:
+            self._write_html_report(f, insights)
 
         logger.info(f"Report saved: {html_path.name}")
         return html_path
@@ -334,10 +527,10 @@ class AnalyticsAgent:
 
         best_topics = insights.get("best_topics", [])
         for item in best_topics[:3]:
-            topic = item.get("topic", "")
-            # Map topic to a video style
-            for style in config.CONTENT_STYLE["video_styles"]:
-                if any(word in topic.lower() for word in style.lower().split()):
+            topic_tokens = frozenset(item.get("topic", "").lower().split())
+            # Map topic to the first video style sharing a word with it
+            for style, style_tokens in self._style_tokens:
+                if topic_tokens & style_tokens:
                     strategy["recommended_styles"].append(style)
                     break
 
@@ -350,42 +543,16 @@ class AnalyticsAgent:
     # ── HTML rendering ────────────────────────────────────────────────────────
 
     @staticmethod
-    def _render_html_report(insights: dict) -> str:
-        """Render insights dict as a simple HTML report."""
+    def _write_html_report(fp, insights: dict) -> None:
+        """Write insights dict to *fp* as a simple HTML report, row by row."""
         avg = insights.get("avg_views_per_platform", {})
         best = insights.get("best_topics", [])
 
-        platform_rows = "".join(
-            f"<tr><td>{p}</td><td>{v:,.0f}</td></tr>" for p, v in avg.items()
-        )
-        topic_rows = "".join(
-            f"<tr><td>{t['topic'][:80]}</td><td>{t['avg_views']:,.0f}</td></tr>"
-            for t in best
-        )
-
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="utf-8">
-<title>Tourism Agent – Weekly Analytics Report</title>
-<style>
-  body {{ font-family: Arial, sans-serif; max-width: 900px; margin: 40px auto; color: #333; }}
-  h1   {{ color: #1a73e8; }}
-  table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-  th, td {{ border: 1px solid #ddd; padding: 10px; text-align: left; }}
-  th {{ background: #f2f2f2; }}
-  .stat {{ background: #e8f5e9; padding: 20px; border-radius: 8px; margin: 10px; display: inline-block; }}
-</style>
-</head>
-<body>
-<h1>🌍 Tourism Agent – Weekly Report</h1>
-<p>Generated: {insights.get('generated_at', 'N/A')} &nbsp;|&nbsp;
-   Posts analysed: {insights.get('total_posts_analysed', 0)}</p>
-
-<h2>Average Views per Platform</h2>
-<table><tr><th>Platform</th><th>Avg Views</th></tr>{platform_rows}</table>
-
-<h2>Top Performing Topics</h2>
-<table><tr><th>Topic</th><th>Avg Views</th></tr>{topic_rows}</table>
-</body>
-</html>"""
+        fp.write(_HTML_HEAD.format(
+            generated_at=insights.get("generated_at", "N/A"),
+            total_posts=insights.get("total_posts_analysed", 0),
+        ))
+        fp.writelines(map(_ROW_FMT, avg.keys(), avg.values()))
+        fp.write(_HTML_MIDDLE)
+        fp.writelines(_ROW_FMT(t["topic"][:80], t["avg_views"]) for t in best)
+        fp.write(_HTML_TAIL)
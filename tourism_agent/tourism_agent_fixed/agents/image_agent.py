@@ -6,24 +6,127 @@ the video pipeline (resize, text overlay, thumbnail).
 """
 
 import io
+import os
 import time
 import asyncio
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
 
-import requests
-from PIL import Image, ImageDraw, ImageFilter, ImageFont, ImageEnhance
+import aiohttp
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
 from tqdm import tqdm
 
 import config
 from utils.logger import logger
-from utils.file_manager import get_output_path, timestamped_filename, deduplicate_files
+from utils.file_manager import (
+    DIRS, HashingWriter, get_output_path, timestamped_filename, unique_timestamp,
+    deduplicate_files,
+)
+from utils.http_client import JsonCache, create_session
 
 # Target resolution (width × height)
 W, H = config.VIDEO_CONFIG["resolution"]   # 1080 × 1920
 
 
+def _saturation_matrix(factor: float) -> tuple[float, ...]:
+    """
+    Build an RGB→RGB colour matrix equivalent to ImageEnhance.Color(factor).
+
+    Each channel becomes ``luma + factor * (channel - luma)`` with ITU-R 601
+    luma weights, so the boost runs as a single Image.convert() pass.
+    """
+    luma = (0.299, 0.587, 0.114)
+    matrix: list[float] = []
+    for channel in range(3):
+        matrix += [(1 - factor) * w + (factor if k == channel else 0.0)
+                   for k, w in enumerate(luma)]
+        matrix.append(0.0)
+    return tuple(matrix)
+
+
+_SATURATION_BOOST = _saturation_matrix(1.15)
+
+
+# ── Resize worker ────────────────────────────────────────────────────────────
+
+def _resize_image(
+    image_path: Path, raw: Optional[bytes] = None, stamp: Optional[str] = None,
+) -> Optional[Path]:
+    """
+    Resize/crop an image to the video resolution (portrait, 9:16).
+    Uses smart crop: keeps centre of image.
+
+    Module-level (not a method) so it can run in a ProcessPoolExecutor.
+
+    Args:
+        image_path: Downloaded image file.
+        raw:        Its bytes, if still in memory (skips re-reading the file).
+        stamp:      Run stamp for the output name; pool callers pass one
+                    from the parent, since unique_timestamp() is per process.
+
+    Returns:
+        Path of the resized JPEG, or None on failure.
+    """
+    try:
+        # Decode straight from the downloaded bytes when we still hold them
+        img = Image.open(io.BytesIO(raw) if raw is not None else image_path)
+        target_w, target_h = W, H
+
+        # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while still
+        # covering the target canvas (no-op for other formats)
+        img.draft("RGB", (target_w, target_h))
+        img = img.convert("RGB")
+
+        # Source region that maps onto the target canvas (centre crop),
+        # resampled straight to the output size in a single pass
+        scale = max(target_w / img.width, target_h / img.height)
+        crop_w = target_w / scale
+        crop_h = target_h / scale
+        left = (img.width - crop_w) / 2
+        top  = (img.height - crop_h) / 2
+        img  = img.resize(
+            (target_w, target_h),
+            Image.LANCZOS,
+            box=(left, top, left + crop_w, top + crop_h),
+            reducing_gap=3.0,
+        )
+
+        # Mild saturation boost for vibrancy
+        img = img.convert("RGB", _SATURATION_BOOST)
+
+        stamp = stamp or unique_timestamp("resized")
+        out_path = get_output_path("images", f"resized_{stamp}_{image_path.name}")
+        img.save(out_path, quality=90)
+        return out_path
+
+    except Exception as exc:
+        logger.warning(f"Resize failed for {image_path.name}: {exc}")
+        return None
+
+
+def _resize_batch(
+    batch: list[Path], raws: list[Optional[bytes]], stamp: str,
+) -> list[Path]:
+    """
+    _resize_image() over *batch* on a process pool, one worker per core.
+
+    Returns:
+        Resized image Paths, in *batch* order, skipping failures.
+    """
+    resized: list[Path] = []
+    if not batch:
+        return resized
+    workers = min(os.cpu_count() or 1, len(batch))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rp in tqdm(pool.map(_resize_image, batch, raws, [stamp] * len(batch)),
+                       total=len(batch), desc="Resizing images"):
+            if rp:
+                resized.append(rp)
+    return resized
+
+
 class ImageCollectorAgent:
     """Downloads and prepares images for the video creation pipeline."""
 
@@ -32,13 +135,19 @@ class ImageCollectorAgent:
     PIXABAY_BASE   = "https://pixabay.com/api"
     WIKIMEDIA_BASE = "https://commons.wikimedia.org/w/api.php"
 
+    SEARCH_CACHE_TTL = 3600.0  # seconds a search response is reused without asking
+
     def __init__(self) -> None:
         self.unsplash_key = config.UNSPLASH_ACCESS_KEY
         self.pexels_key   = config.PEXELS_API_KEY
         self.pixabay_key  = config.PIXABAY_API_KEY
-        self.session      = requests.Session()
-        self.session.headers.update({"User-Agent": "TourismAgent/1.0"})
+        self.session      = create_session()
+        self._search_cache = JsonCache(DIRS["cache"], ttl=self.SEARCH_CACHE_TTL)
+        self._font_path = self._resolve_font_path()
         self._font_cache: dict[int, ImageFont.FreeTypeFont] = {}
+        self._text_size_cache: dict[tuple[str, int], tuple[int, int]] = {}
+        # Glyph coverage masks, rasterised once per (text, size)
+        self._text_mask_cache: dict[tuple[str, int], tuple[Image.Image, tuple[int, int]]] = {}
         logger.info("ImageCollectorAgent ready")
 
     # ── Source-specific search/download ──────────────────────────────────────
@@ -54,32 +163,36 @@ class ImageCollectorAgent:
         Returns:
             List of local file paths.
         """
+        return self._download_all(self._find_unsplash(query, count))
+
+    def _find_unsplash(self, query: str, count: int) -> list[tuple[str, str]]:
+        """Return (url, filename) pairs for Unsplash search results."""
+        return self._find(self._unsplash_search(query, count), self._unsplash_results, "Unsplash")
+
+    def _unsplash_search(self, query: str, count: int) -> Optional[dict]:
+        """Build the Unsplash search request (None when the key is missing)."""
         if not self.unsplash_key:
             logger.warning("Unsplash key missing; skipping")
-            return []
-
-        paths: list[Path] = []
-        try:
-            resp = self.session.get(
-                f"{self.UNSPLASH_BASE}/search/photos",
-                params={
-                    "query": query,
-                    "per_page": count,
-                    "orientation": "portrait",
-                    "client_id": self.unsplash_key,
-                },
-                timeout=15,
-            )
-            resp.raise_for_status()
-            for item in resp.json().get("results", []):
-                url = item["urls"].get("full") or item["urls"].get("regular")
-                if url:
-                    path = self._download_image(url, f"unsplash_{item['id']}.jpg")
-                    if path:
-                        paths.append(path)
-        except Exception as exc:
-            logger.warning(f"Unsplash error: {exc}")
-        return paths
+            return None
+        return {
+            "url": f"{self.UNSPLASH_BASE}/search/photos",
+            "params": {
+                "query": query,
+                "per_page": count,
+                "orientation": "portrait",
+                "client_id": self.unsplash_key,
+            },
+        }
+
+    @staticmethod
+    def _unsplash_results(data: dict) -> list[tuple[str, str]]:
+        """Extract (url, filename) pairs from an Unsplash search response."""
+        found: list[tuple[str, str]] = []
+        for item in data.get("results", []):
+            url = item["urls"].get("full") or item["urls"].get("regular")
+            if url:
+                found.append((url, f"unsplash_{item['id']}.jpg"))
+        return found
 
     def search_pexels(self, query: str, count: int = 4) -> list[Path]:
         """
@@ -92,28 +205,32 @@ class ImageCollectorAgent:
         Returns:
             List of local file paths.
         """
+        return self._download_all(self._find_pexels(query, count))
+
+    def _find_pexels(self, query: str, count: int) -> list[tuple[str, str]]:
+        """Return (url, filename) pairs for Pexels search results."""
+        return self._find(self._pexels_search(query, count), self._pexels_results, "Pexels")
+
+    def _pexels_search(self, query: str, count: int) -> Optional[dict]:
+        """Build the Pexels search request (None when the key is missing)."""
         if not self.pexels_key:
             logger.warning("Pexels key missing; skipping")
-            return []
-
-        paths: list[Path] = []
-        try:
-            resp = self.session.get(
-                f"{self.PEXELS_BASE}/search",
-                params={"query": query, "per_page": count, "orientation": "portrait"},
-                headers={"Authorization": self.pexels_key},
-                timeout=15,
-            )
-            resp.raise_for_status()
-            for item in resp.json().get("photos", []):
-                url = item["src"].get("original") or item["src"].get("large2x")
-                if url:
-                    path = self._download_image(url, f"pexels_{item['id']}.jpg")
-                    if path:
-                        paths.append(path)
-        except Exception as exc:
-            logger.warning(f"Pexels error: {exc}")
-        return paths
+            return None
+        return {
+            "url": f"{self.PEXELS_BASE}/search",
+            "params": {"query": query, "per_page": count, "orientation": "portrait"},
+            "headers": {"Authorization": self.pexels_key},
+        }
+
+    @staticmethod
+    def _pexels_results(data: dict) -> list[tuple[str, str]]:
+        """Extract (url, filename) pairs from a Pexels search response."""
+        found: list[tuple[str, str]] = []
+        for item in data.get("photos", []):
+            url = item["src"].get("original") or item["src"].get("large2x")
+            if url:
+                found.append((url, f"pexels_{item['id']}.jpg"))
+        return found
 
     def search_pixabay(self, query: str, count: int = 3) -> list[Path]:
         """
@@ -126,35 +243,39 @@ class ImageCollectorAgent:
         Returns:
             List of local file paths.
         """
+        return self._download_all(self._find_pixabay(query, count))
+
+    def _find_pixabay(self, query: str, count: int) -> list[tuple[str, str]]:
+        """Return (url, filename) pairs for Pixabay search results."""
+        return self._find(self._pixabay_search(query, count), self._pixabay_results, "Pixabay")
+
+    def _pixabay_search(self, query: str, count: int) -> Optional[dict]:
+        """Build the Pixabay search request (None when the key is missing)."""
         if not self.pixabay_key:
             logger.warning("Pixabay key missing; skipping")
-            return []
-
-        paths: list[Path] = []
-        try:
-            resp = self.session.get(
-                self.PIXABAY_BASE,
-                params={
-                    "key": self.pixabay_key,
-                    "q": query,
-                    "image_type": "photo",
-                    "category": "travel",
-                    "orientation": "vertical",
-                    "per_page": count,
-                    "safesearch": "true",
-                },
-                timeout=15,
-            )
-            resp.raise_for_status()
-            for item in resp.json().get("hits", []):
-                url = item.get("largeImageURL") or item.get("webformatURL")
-                if url:
-                    path = self._download_image(url, f"pixabay_{item['id']}.jpg")
-                    if path:
-                        paths.append(path)
-        except Exception as exc:
-            logger.warning(f"Pixabay error: {exc}")
-        return paths
+            return None
+        return {
+            "url": self.PIXABAY_BASE,
+            "params": {
+                "key": self.pixabay_key,
+                "q": query,
+                "image_type": "photo",
+                "category": "travel",
+                "orientation": "vertical",
+                "per_page": count,
+                "safesearch": "true",
+            },
+        }
+
+    @staticmethod
+    def _pixabay_results(data: dict) -> list[tuple[str, str]]:
+        """Extract (url, filename) pairs from a Pixabay search response."""
+        found: list[tuple[str, str]] = []
+        for item in data.get("hits", []):
+            url = item.get("largeImageURL") or item.get("webformatURL")
+            if url:
+                found.append((url, f"pixabay_{item['id']}.jpg"))
+        return found
 
     def search_wikimedia(self, query: str, count: int = 3) -> list[Path]:
         """
@@ -167,35 +288,104 @@ class ImageCollectorAgent:
         Returns:
             List of local file paths.
         """
-        paths: list[Path] = []
+        return self._download_all(self._find_wikimedia(query, count))
+
+    def _find_wikimedia(self, query: str, count: int) -> list[tuple[str, str]]:
+        """Return (url, filename) pairs for Wikimedia Commons search results."""
+        return self._find(self._wikimedia_search(query, count), self._wikimedia_results, "Wikimedia")
+
+    def _wikimedia_search(self, query: str, count: int) -> Optional[dict]:
+        """Build the Wikimedia Commons search request (no key needed)."""
+        return {
+            "url": self.WIKIMEDIA_BASE,
+            "params": {
+                "action": "query",
+                "generator": "search",
+                "gsrsearch": f"File:{query} travel",
+                "gsrnamespace": 6,
+                "gsrlimit": count,
+                "prop": "imageinfo",
+                "iiprop": "url|size",
+                "format": "json",
+            },
+        }
+
+    @staticmethod
+    def _wikimedia_results(data: dict) -> list[tuple[str, str]]:
+        """Extract (url, filename) pairs from a Wikimedia Commons response."""
+        found: list[tuple[str, str]] = []
+        pages = data.get("query", {}).get("pages", {})
+        for page in pages.values():
+            for info in page.get("imageinfo", []):
+                url = info.get("url", "")
+                if url and any(url.lower().endswith(ext) for ext in [".jpg", ".jpeg", ".png"]):
+                    found.append((url, f"wiki_{page.get('pageid', 'x')}.jpg"))
+        return found
+
+    def _find(
+        self,
+        request: Optional[dict],
+        parse: Callable[[dict], list[tuple[str, str]]],
+        source: str,
+    ) -> list[tuple[str, str]]:
+        """
+        Run one search *request* on the shared session and *parse* the JSON.
+        Responses are cached on disk and revalidated via ETag/Last-Modified.
+        """
+        if request is None:
+            return []
+        key = self._search_cache.key(request["url"], request["params"])
+        entry = self._search_cache.get(key)
+        if self._search_cache.is_fresh(entry):
+            return parse(entry["data"])
         try:
             resp = self.session.get(
-                self.WIKIMEDIA_BASE,
-                params={
-                    "action": "query",
-                    "generator": "search",
-                    "gsrsearch": f"File:{query} travel",
-                    "gsrnamespace": 6,
-                    "gsrlimit": count,
-                    "prop": "imageinfo",
-                    "iiprop": "url|size",
-                    "format": "json",
-                },
+                request["url"],
+                params=request["params"],
+                headers={**request.get("headers", {}), **self._search_cache.validators(entry)},
                 timeout=15,
             )
+            if resp.status_code == 304 and entry:
+                self._search_cache.touch(key, entry)
+                return parse(entry["data"])
             resp.raise_for_status()
-            pages = resp.json().get("query", {}).get("pages", {})
-            for page in pages.values():
-                for info in page.get("imageinfo", []):
-                    url = info.get("url", "")
-                    if url and any(url.lower().endswith(ext) for ext in [".jpg", ".jpeg", ".png"]):
-                        fname = f"wiki_{page.get('pageid', 'x')}.jpg"
-                        path = self._download_image(url, fname)
-                        if path:
-                            paths.append(path)
+            data = resp.json()
+            self._search_cache.put(key, data, resp.headers)
+            return parse(data)
         except Exception as exc:
-            logger.warning(f"Wikimedia error: {exc}")
-        return paths
+            logger.warning(f"{source} error: {exc}")
+            return []
+
+    async def _afind(
+        self,
+        client: aiohttp.ClientSession,
+        request: Optional[dict],
+        parse: Callable[[dict], list[tuple[str, str]]],
+        source: str,
+    ) -> list[tuple[str, str]]:
+        """Async counterpart of _find()."""
+        if request is None:
+            return []
+        key = self._search_cache.key(request["url"], request["params"])
+        entry = self._search_cache.get(key)
+        if self._search_cache.is_fresh(entry):
+            return parse(entry["data"])
+        try:
+            async with client.get(
+                request["url"],
+                params=request["params"],
+                headers={**request.get("headers", {}), **self._search_cache.validators(entry)},
+            ) as resp:
+                if resp.status == 304 and entry:
+                    self._search_cache.touch(key, entry)
+                    return parse(entry["data"])
+                resp.raise_for_status()
+                data = await resp.json(content_type=None)
+            self._search_cache.put(key, data, resp.headers)
+            return parse(data)
+        except Exception as exc:
+            logger.warning(f"{source} error: {exc}")
+            return []
 
     # ── Orchestrated collection ───────────────────────────────────────────────
 
@@ -217,21 +407,36 @@ class ImageCollectorAgent:
         """
         logger.info(f"Collecting {total_needed} images for queries: {search_queries}")
 
-        loop = asyncio.get_event_loop()
-        all_paths: list[Path] = []
-
-        with ThreadPoolExecutor(max_workers=4) as pool:
-            futures = []
-            for query in search_queries:
-                futures.append(loop.run_in_executor(pool, self.search_unsplash, query, 4))
-                futures.append(loop.run_in_executor(pool, self.search_pexels,   query, 3))
-                futures.append(loop.run_in_executor(pool, self.search_pixabay,  query, 2))
-                futures.append(loop.run_in_executor(pool, self.search_wikimedia, query, 2))
+        targets: list[tuple[str, str]] = []
+        seen: set[str] = set()   # per call, so concurrent collections don't interfere
+        # Bytes of freshly downloaded images, handed to the resize step so it
+        # can decode from memory instead of reading the file back
+        raw_images: dict[Path, bytes] = {}
+        stamp = unique_timestamp("images")   # names this run's resized outputs
+
+        # Resolve image URLs from every source first, all searches in flight
+        # at once on one aiohttp session …
+        searches = []
+        for query in search_queries:
+            searches += [
+                (self._unsplash_search(query, 4),  self._unsplash_results,  "Unsplash"),
+                (self._pexels_search(query, 3),    self._pexels_results,    "Pexels"),
+                (self._pixabay_search(query, 2),   self._pixabay_results,   "Pixabay"),
+                (self._wikimedia_search(query, 2), self._wikimedia_results, "Wikimedia"),
+            ]
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=15),
+            headers=dict(self.session.headers),
+        ) as client:
+            results = await asyncio.gather(
+                *(self._afind(client, *search) for search in searches)
+            )
+        for result in results:
+            targets.extend(result)
 
-            results = await asyncio.gather(*futures, return_exceptions=True)
-            for result in results:
-                if isinstance(result, list):
-                    all_paths.extend(result)
+        # … then fetch them all at once over one pooled connection set
+        all_paths = await self._download_many(targets, seen, raw_images)
 
         # Deduplicate
         all_paths = deduplicate_files(all_paths)
@@ -239,20 +444,25 @@ class ImageCollectorAgent:
         # If we still don't have enough, fall back to location-name search
         if len(all_paths) < total_needed:
             location_name = config.LOCATION["name"]
-            extra = self.search_unsplash(location_name, total_needed - len(all_paths) + 3)
+            extra = await self._download_many(
+                self._find_unsplash(location_name, total_needed - len(all_paths) + 3),
+                seen,
+                raw_images,
+            )
             all_paths.extend(extra)
             all_paths = deduplicate_files(all_paths)
 
-        # Resize to video resolution
-        resized: list[Path] = []
-        for p in tqdm(all_paths[:total_needed], desc="Resizing images"):
-            rp = self._resize_to_video_format(p)
-            if rp:
-                resized.append(rp)
+        # Resize to video resolution; each image is independent and CPU-bound
+        # (Lanczos + JPEG encode), so spread them over worker processes
+        batch = all_paths[:total_needed]
+        raws = [raw_images.get(p) for p in batch]
+        raw_images.clear()  # Drop bytes of images we didn't need
+        # Waiting on the pool would block the event loop, so do it in a thread
+        resized = await asyncio.to_thread(_resize_batch, batch, raws, stamp)
 
         # Pad with placeholders if still short
         while len(resized) < total_needed:
-            resized.append(resized[-1] if resized else self._create_placeholder(len(resized)))
+            resized.append(resized[-1] if resized else self._create_placeholder(len(resized), stamp))
 
         logger.info(f"✅ {len(resized[:total_needed])} images ready")
         return resized[:total_needed]
@@ -264,6 +474,7 @@ class ImageCollectorAgent:
         image_path: Path,
         text: str,
         position: str = "bottom",
+        stamp: Optional[str] = None,
     ) -> Path:
         """
         Add a semi-transparent gradient + white text overlay onto an image.
@@ -272,19 +483,17 @@ class ImageCollectorAgent:
             image_path: Path to source image.
             text:       Text to overlay.
             position:   'bottom', 'top', or 'center'.
+            stamp:      Run stamp for the output name (default: a fresh one).
 
         Returns:
             Path to the modified image.
         """
         try:
             img = Image.open(image_path).convert("RGBA")
-            draw = ImageDraw.Draw(img)
-            font = self._get_font(config.VIDEO_CONFIG["font_size"])
+            font_size = config.VIDEO_CONFIG["font_size"]
 
             img_w, img_h = img.size
-            text_bbox = draw.textbbox((0, 0), text, font=font)
-            text_w = text_bbox[2] - text_bbox[0]
-            text_h = text_bbox[3] - text_bbox[1]
+            text_w, text_h = self._text_size(text, font_size)
 
             # Gradient overlay height
             grad_h = int(img_h * 0.3)
@@ -303,22 +512,24 @@ class ImageCollectorAgent:
                 text_x = (img_w - text_w) // 2
                 text_y = (img_h - text_h) // 2
 
-            # Draw gradient
-            gradient = Image.new("RGBA", (img_w, grad_h))
-            for y in range(grad_h):
-                alpha = int(180 * (y / grad_h)) if position == "bottom" else int(180 * (1 - y / grad_h))
-                for x in range(img_w):
-                    gradient.putpixel((x, y), (0, 0, 0, alpha))
+            # Draw gradient: black, with a vertical alpha ramp broadcast across the width
+            ramp = np.arange(grad_h) / grad_h
+            if position != "bottom":
+                ramp = 1 - ramp
+            grad_arr = np.zeros((grad_h, img_w, 4), dtype=np.uint8)
+            grad_arr[..., 3] = (180 * ramp).astype(np.uint8)[:, None]
+            gradient = Image.fromarray(grad_arr, "RGBA")
             img.paste(gradient, (0, grad_y), gradient)
 
-            # Shadow
+            # Shadow (same glyph mask, pasted offset in black)
             if config.VIDEO_CONFIG.get("text_shadow"):
-                draw.text((text_x + 2, text_y + 2), text, font=font, fill=(0, 0, 0, 200))
-            draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255, 255))
+                self._paste_text(img, (text_x + 2, text_y + 2), text, font_size, (0, 0, 0, 200))
+            self._paste_text(img, (text_x, text_y), text, font_size, (255, 255, 255, 255))
 
             # Save as RGB
             out_img = img.convert("RGB")
-            out_path = get_output_path("images", f"overlay_{image_path.name}")
+            stamp = stamp or unique_timestamp("overlay")
+            out_path = get_output_path("images", f"overlay_{stamp}_{image_path.name}")
             out_img.save(out_path, quality=92)
             return out_path
 
@@ -326,6 +537,44 @@ class ImageCollectorAgent:
             logger.warning(f"Text overlay failed for {image_path.name}: {exc}")
             return image_path
 
+    def add_text_overlays(
+        self,
+        image_paths: list[Path],
+        texts: list[str],
+        position: str = "bottom",
+    ) -> list[Path]:
+        """
+        add_text_overlay() for many images at once. Each overlay is
+        independent CPU-bound PIL work, so they are spread over worker
+        processes when more than one core is available.
+
+        Args:
+            image_paths: Source images.
+            texts:       One caption per image (extra entries are ignored).
+            position:    'bottom', 'top', or 'center'.
+
+        Returns:
+            Overlaid image Paths, in input order.
+        """
+        pairs = list(zip(image_paths, texts))
+        # One stamp per image, issued here: workers can't see each other's
+        # unique_timestamp() state, and padded lists repeat the same source
+        run = unique_timestamp("overlay")
+        stamps = [f"{run}_{i:02d}" for i in range(len(pairs))]
+        workers = min(os.cpu_count() or 1, len(pairs))
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(
+                        _overlay_worker, *zip(*pairs), [position] * len(pairs), stamps
+                    ))
+            except Exception as exc:
+                logger.warning(f"Parallel overlays failed ({exc}); running them in-process")
+        return [
+            self.add_text_overlay(img, text, position, stamp)
+            for (img, text), stamp in zip(pairs, stamps)
+        ]
+
     def create_thumbnail(
         self,
         best_image: Path,
@@ -349,34 +598,28 @@ class ImageCollectorAgent:
             draw = ImageDraw.Draw(img)
             img_w, img_h = img.size
 
-            # Dark vignette border
-            for margin in range(40, 0, -1):
-                alpha_val = int(200 * (1 - margin / 40))
-                draw.rectangle([margin, margin, img_w - margin, img_h - margin],
-                                outline=(0, 0, 0), width=1)
+            # Dark vignette border: alpha fades from 200 at the edge to 0 at 40 px in
+            yy, xx = np.indices((img_h, img_w))
+            edge = np.minimum.reduce([xx, yy, img_w - 1 - xx, img_h - 1 - yy])
+            vignette = np.clip(200 * (1 - edge / 40.0), 0, 200).astype(np.uint8)
+            img.paste((0, 0, 0), (0, 0, img_w, img_h), Image.fromarray(vignette, "L"))
 
             # Title text (large, centered, with shadow)
-            font_large = self._get_font(72)
-            font_small = self._get_font(36)
-
-            # Title
-            tb = draw.textbbox((0, 0), title_text, font=font_large)
-            tw = tb[2] - tb[0]
+            tw, _ = self._text_size(title_text, 72)
             tx = (img_w - tw) // 2
             ty = img_h // 2 - 60
-            draw.text((tx + 3, ty + 3), title_text, font=font_large, fill=(0, 0, 0))
-            draw.text((tx, ty), title_text, font=font_large, fill=(255, 235, 59))
+            self._paste_text(img, (tx + 3, ty + 3), title_text, 72, (0, 0, 0))
+            self._paste_text(img, (tx, ty), title_text, 72, (255, 235, 59))
 
             # Location badge
             badge_text = f"📍 {location_name}"
-            bb = draw.textbbox((0, 0), badge_text, font=font_small)
-            bw = bb[2] - bb[0]
+            bw, _ = self._text_size(badge_text, 36)
             bx = (img_w - bw) // 2
             by = ty + 90
             draw.rectangle([bx - 10, by - 5, bx + bw + 10, by + 40], fill=(220, 20, 60))
-            draw.text((bx, by), badge_text, font=font_small, fill=(255, 255, 255))
+            self._paste_text(img, (bx, by), badge_text, 36, (255, 255, 255))
 
-            out_path = get_output_path("images", "thumbnail.jpg")
+            out_path = get_output_path("images", timestamped_filename("thumbnail", "jpg"))
             img.save(out_path, quality=95)
             logger.info(f"Thumbnail created: {out_path.name}")
             return out_path
@@ -393,49 +636,94 @@ class ImageCollectorAgent:
         if dest.exists():
             return dest  # Already downloaded
         try:
-            resp = self.session.get(url, timeout=20, stream=True)
+            resp = self.session.get(url, timeout=20)
             resp.raise_for_status()
-            with open(dest, "wb") as f:
-                for chunk in resp.iter_content(8192):
-                    f.write(chunk)
-            logger.debug(f"Downloaded: {filename}")
+            with HashingWriter(dest) as f:   # hashed now, not re-read by dedup
+                f.write(resp.content)
+            logger.debug("Downloaded: {}", filename)
             return dest
         except Exception as exc:
             logger.warning(f"Download failed for {filename}: {exc}")
             return None
 
-    def _resize_to_video_format(self, image_path: Path) -> Optional[Path]:
-        """
-        Resize/crop an image to the video resolution (portrait, 9:16).
-        Uses smart crop: keeps centre of image.
-        """
-        try:
-            img = Image.open(image_path).convert("RGB")
-            target_w, target_h = W, H
-
-            # Compute scale to fill the target canvas
-            scale = max(target_w / img.width, target_h / img.height)
-            new_w = int(img.width * scale)
-            new_h = int(img.height * scale)
-            img = img.resize((new_w, new_h), Image.LANCZOS)
-
-            # Centre crop
-            left = (new_w - target_w) // 2
-            top  = (new_h - target_h) // 2
-            img  = img.crop((left, top, left + target_w, top + target_h))
+    def _download_all(self, targets: list[tuple[str, str]]) -> list[Path]:
+        """Download (url, filename) pairs one by one with the shared session."""
+        paths: list[Path] = []
+        for url, filename in targets:
+            path = self._download_image(url, filename)
+            if path:
+                paths.append(path)
+        return paths
 
-            # Mild saturation boost for vibrancy
-            img = ImageEnhance.Color(img).enhance(1.15)
+    async def _download_many(
+        self,
+        targets: list[tuple[str, str]],
+        seen: set[str],
+        raw_images: Optional[dict[Path, bytes]] = None,
+    ) -> list[Path]:
+        """
+        Download (url, filename) pairs concurrently over one aiohttp session.
+        URLs already in *seen* (fetched earlier in the same collection) are
+        skipped; the new ones are added to it. The bytes of each new file
+        are kept in *raw_images*, if given.
 
-            out_path = get_output_path("images", f"resized_{image_path.name}")
-            img.save(out_path, quality=90)
-            return out_path
+        Returns:
+            Paths of the successful downloads, in *targets* order.
+        """
+        # The same photo can surface for several queries (and again in the
+        # fallback search); fetch each URL only once
+        fresh: dict[str, str] = {}
+        for url, filename in targets:
+            if url not in seen and url not in fresh:
+                fresh[url] = filename
+        seen.update(fresh)
+        targets = list(fresh.items())
+        if not targets:
+            return []
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=8)
+        # No overall deadline: with 8 connections per host a queued download
+        # can wait a while for a free socket; bound the network phases instead
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=20)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers=dict(self.session.headers),
+        ) as client:
+            paths = await asyncio.gather(
+                *(self._adownload(client, url, fname, raw_images) for url, fname in targets)
+            )
+        return [p for p in paths if p]
 
+    async def _adownload(
+        self,
+        client: aiohttp.ClientSession,
+        url: str,
+        filename: str,
+        raw_images: Optional[dict[Path, bytes]] = None,
+    ) -> Optional[Path]:
+        """Async counterpart of _download_image()."""
+        dest = get_output_path("images", filename)
+        if dest.exists():
+            return dest  # Already downloaded
+        try:
+            async with client.get(url) as resp:
+                resp.raise_for_status()
+                data = await resp.read()
+            with HashingWriter(dest) as f:   # lands atomically, never half-written
+                f.write(data)
+            if raw_images is not None:
+                raw_images[dest] = data
+            logger.debug("Downloaded: {}", filename)
+            return dest
         except Exception as exc:
-            logger.warning(f"Resize failed for {image_path.name}: {exc}")
+            logger.warning(f"Download failed for {filename}: {exc}")
             return None
 
-    def _create_placeholder(self, index: int) -> Path:
+    def _resize_to_video_format(self, image_path: Path) -> Optional[Path]:
+        """Resize/crop a single downloaded image to the video resolution."""
+        return _resize_image(image_path)
+
+    def _create_placeholder(self, index: int, stamp: Optional[str] = None) -> Path:
         """Create a solid-colour placeholder image when we run out of downloads."""
         colours = [
             (52, 152, 219), (46, 204, 113), (155, 89, 182),
@@ -443,34 +731,94 @@ class ImageCollectorAgent:
         ]
         colour = colours[index % len(colours)]
         img = Image.new("RGB", (W, H), colour)
-        draw = ImageDraw.Draw(img)
-        font = self._get_font(60)
         text = config.LOCATION["name"]
-        tb = draw.textbbox((0, 0), text, font=font)
-        tw = tb[2] - tb[0]
-        draw.text(((W - tw) // 2, H // 2 - 30), text, font=font, fill=(255, 255, 255))
-        out_path = get_output_path("images", f"placeholder_{index:02d}.jpg")
+        tw, _ = self._text_size(text, 60)
+        self._paste_text(img, ((W - tw) // 2, H // 2 - 30), text, 60, (255, 255, 255))
+        stamp = stamp or unique_timestamp("placeholder")
+        out_path = get_output_path("images", f"placeholder_{stamp}_{index:02d}.jpg")
         img.save(out_path)
         return out_path
 
+    @staticmethod
+    def _resolve_font_path() -> Optional[str]:
+        """Find a usable TrueType font once; None means Pillow's built-in font."""
+        try:
+            ImageFont.truetype("Arial.ttf", 12)
+            return "Arial.ttf"
+        except IOError:
+            # Linux common paths
+            for path in [
+                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+                "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
+                "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+            ]:
+                if Path(path).exists():
+                    return path
+        return None
+
     def _get_font(self, size: int) -> ImageFont.FreeTypeFont:
         """Load (and cache) a TrueType font at *size*."""
         if size not in self._font_cache:
             try:
-                self._font_cache[size] = ImageFont.truetype("Arial.ttf", size)
+                if self._font_path is None:
+                    raise IOError("No TrueType font found")
+                self._font_cache[size] = ImageFont.truetype(self._font_path, size)
             except IOError:
-                try:
-                    # Linux common paths
-                    for path in [
-                        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                        "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
-                        "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
-                    ]:
-                        if Path(path).exists():
-                            self._font_cache[size] = ImageFont.truetype(path, size)
-                            break
-                    else:
-                        raise IOError("No TrueType font found")
-                except IOError:
-                    self._font_cache[size] = ImageFont.load_default()
+                self._font_cache[size] = ImageFont.load_default()
         return self._font_cache[size]
+
+    def _text_size(self, text: str, size: int) -> tuple[int, int]:
+        """Measure (and cache) the rendered width/height of *text* at *size*."""
+        key = (text, size)
+        if key not in self._text_size_cache:
+            left, top, right, bottom = self._get_font(size).getbbox(text)
+            self._text_size_cache[key] = (right - left, bottom - top)
+        return self._text_size_cache[key]
+
+    def _text_mask(self, text: str, size: int) -> tuple[Image.Image, tuple[int, int]]:
+        """
+        Rasterise (and cache) *text* at *size* once as an 'L' coverage mask
+        cropped to its glyph box.
+
+        Returns:
+            (mask, (left, top) offset of the glyph box from the draw origin).
+        """
+        key = (text, size)
+        if key not in self._text_mask_cache:
+            font = self._get_font(size)
+            left, top, right, bottom = font.getbbox(text)
+            mask = Image.new("L", (max(right - left, 1), max(bottom - top, 1)))
+            ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+            self._text_mask_cache[key] = (mask, (left, top))
+        return self._text_mask_cache[key]
+
+    def _paste_text(
+        self,
+        img: Image.Image,
+        xy: tuple[int, int],
+        text: str,
+        size: int,
+        fill: tuple[int, ...],
+    ) -> None:
+        """Draw *text* onto *img* at *xy* by pasting *fill* through its cached mask."""
+        mask, (left, top) = self._text_mask(text, size)
+        x, y = xy[0] + left, xy[1] + top
+        img.paste(fill, (x, y, x + mask.width, y + mask.height), mask)
+
+
+# Per-process agent for overlay workers; fonts and glyph masks are cached
+# on it, so each worker loads them only once
+_worker_agent: Optional[ImageCollectorAgent] = None
+
+
+def _overlay_worker(
+    image_path: Path, text: str, position: str, stamp: Optional[str] = None,
+) -> Path:
+    """
+    Run add_text_overlay() inside a ProcessPoolExecutor worker.
+    Module-level (not a method) so it can be pickled.
+    """
+    global _worker_agent
+    if _worker_agent is None:
+        _worker_agent = ImageCollectorAgent()
+    return _worker_agent.add_text_overlay(image_path, text, position, stamp)
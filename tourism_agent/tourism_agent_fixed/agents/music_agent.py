@@ -7,15 +7,52 @@ Falls back to a numpy-generated ambient drone if all downloads fail.
 
 import time
 import math
+import asyncio
+import subprocess
 from pathlib import Path
 from typing import Optional
 
-import requests
 import numpy as np
 
+# Optional JIT for the generated ambient fallback (pure NumPy otherwise)
+try:
+    import numba
+except ImportError:
+    numba = None
+
 import config
 from utils.logger import logger
 from utils.file_manager import get_output_path, timestamped_filename
+from utils.http_client import create_session
+
+
+# ── Ambient synthesis kernel ─────────────────────────────────────────────────
+
+if numba is not None:
+    # Serial on purpose: a parallel kernel starts Numba's worker-thread pool,
+    # which is not fork-safe and hangs the image ProcessPoolExecutors
+    @numba.njit(fastmath=True, cache=True)
+    def _synth(t, freqs, phases, env_rate):
+        """Additive chord × breathing envelope, fused per sample."""
+        out = np.empty(t.size, dtype=np.float32)
+        for i in range(t.size):
+            s = 0.0
+            for k in range(freqs.size):
+                s += 0.15 * math.sin(2 * math.pi * freqs[k] * t[i] + phases[k])
+            env = 0.5 + 0.5 * math.sin(2 * math.pi * env_rate * t[i])
+            out[i] = s * env * 0.6
+        return out
+
+    # Compile (or load from cache) at import so the first track isn't delayed
+    _synth(np.zeros(1, np.float32), np.zeros(1, np.float32), np.zeros(1, np.float32), 0.05)
+else:
+    def _synth(t, freqs, phases, env_rate):
+        """Additive chord × breathing envelope, as one (samples × freqs) broadcast."""
+        wave = (0.15 * np.sin(2 * np.pi * np.outer(t, freqs) + phases)).sum(
+            axis=1, dtype=np.float32
+        )
+        envelope = 0.5 + 0.5 * np.sin(np.float32(2 * np.pi * env_rate) * t)
+        return wave * envelope * np.float32(0.6)
 
 
 class MusicAgent:
@@ -24,8 +61,7 @@ class MusicAgent:
     PIXABAY_MUSIC_URL = "https://pixabay.com/api/videos/music/"  # same key as images
 
     def __init__(self) -> None:
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "TourismAgent/1.0"})
+        self.session = create_session()
         logger.info("MusicAgent ready")
 
     # ── Music sourcing ────────────────────────────────────────────────────────
@@ -47,10 +83,13 @@ class MusicAgent:
         """
         if not config.PIXABAY_API_KEY:
             logger.warning("Pixabay API key missing; using generated music")
-            return self._generate_ambient_music(duration=65)
+            return await asyncio.to_thread(self._generate_ambient_music, 65)
 
+        # The blocking HTTP and synthesis calls run on worker threads so
+        # image collection and TTS keep going on the event loop meanwhile
         try:
-            resp = self.session.get(
+            resp = await asyncio.to_thread(
+                self.session.get,
                 self.PIXABAY_MUSIC_URL,
                 params={
                     "key":      config.PIXABAY_API_KEY,
@@ -73,13 +112,13 @@ class MusicAgent:
                 raise ValueError("No audio URL in response")
 
             fname = f"music_{track['id']}.mp3"
-            out_path = self.download_free_music(audio_url, fname)
+            out_path = await asyncio.to_thread(self.download_free_music, audio_url, fname)
             logger.info(f"Pixabay music downloaded: {out_path.name}")
             return out_path
 
         except Exception as exc:
             logger.warning(f"Pixabay music search failed: {exc}")
-            return self._generate_ambient_music(duration=65)
+            return await asyncio.to_thread(self._generate_ambient_music, 65)
 
     def download_free_music(self, url: str, filename: str) -> Path:
         """
@@ -129,41 +168,64 @@ class MusicAgent:
         Returns:
             Path to the mixed audio file.
         """
-        try:
-            from pydub import AudioSegment
-
-            voice = AudioSegment.from_file(str(voice_path))
-            music = AudioSegment.from_file(str(music_path))
-
-            # Sync music length to voice
-            music = self._sync_to_duration(music, len(voice))
-
-            # Reduce music volume
-            reduction_db = 20 * math.log10(max(music_volume, 1e-9))
-            music = music + reduction_db  # pydub uses dB
+        fname = timestamped_filename("mixed_audio", "mp3")
+        out_path = get_output_path("audio", fname)
 
-            # Fade in / out
-            music = music.fade_in(2000).fade_out(3000)
-
-            # Mix
-            mixed = voice.overlay(music)
-
-            fname = timestamped_filename("mixed_audio", "mp3")
-            out_path = get_output_path("audio", fname)
-            mixed.export(str(out_path), format="mp3", bitrate="192k")
+        try:
+            # One ffmpeg graph: loop/trim the music to the voice, set its level,
+            # fade it in/out and sum both tracks – no PCM round-trip via Python
+            voice_ms = int(self._probe_duration(voice_path) * 1000)
+            graph = self.build_filter_complex(voice_ms, music_volume)
+            subprocess.run(
+                [
+                    "ffmpeg", "-y", "-v", "error",
+                    "-i", str(voice_path),
+                    "-stream_loop", "-1", "-i", str(music_path),
+                    "-filter_complex", graph,
+                    "-b:a", "192k", str(out_path),
+                ],
+                check=True,
+                capture_output=True,
+            )
             logger.info(f"Audio mixed: {out_path.name}")
             return out_path
 
-        except ImportError:
-            logger.warning("pydub not installed; returning voice without music")
+        except FileNotFoundError:
+            logger.warning("ffmpeg not installed; returning voice without music")
             return voice_path
         except Exception as exc:
             logger.warning(f"Audio mix failed: {exc}")
             return voice_path
 
+    @staticmethod
+    def build_filter_complex(voice_ms: int, music_volume: float) -> str:
+        """
+        Build the ffmpeg filter graph used by mix_audio().
+
+        Input 0 is the voice; input 1 is the music, opened with
+        ``-stream_loop -1`` so it is trimmed here to the voice length.
+
+        Args:
+            voice_ms:     Voice duration in milliseconds.
+            music_volume: Relative volume for music (0.0–1.0).
+
+        Returns:
+            filter_complex string.
+        """
+        duration = voice_ms / 1000
+        fade_out_at = max(duration - 3.0, 0.0)
+        return (
+            f"[1:a]atrim=0:{duration:.3f},asetpts=PTS-STARTPTS,"
+            f"volume={music_volume},"
+            f"afade=t=in:st=0:d=2,afade=t=out:st={fade_out_at:.3f}:d=3[bg];"
+            "[0:a][bg]amix=inputs=2:duration=first:dropout_transition=0:normalize=0"
+        )
+
     def sync_music_to_video(self, music_path: Path, video_duration: float) -> Path:
         """
         Trim or loop the music so it exactly matches the video length.
+        The stream is copied, not re-encoded. mix_audio() already loops and
+        trims the music itself, so the pipeline no longer calls this.
 
         Args:
             music_path:     Input music file.
@@ -172,14 +234,18 @@ class MusicAgent:
         Returns:
             Path to the synced music file.
         """
-        target_ms = int(video_duration * 1000)
+        out_path = music_path.with_stem(music_path.stem + "_synced")
 
         try:
-            from pydub import AudioSegment
-            music = AudioSegment.from_file(str(music_path))
-            synced = self._sync_to_duration(music, target_ms)
-            out_path = music_path.with_stem(music_path.stem + "_synced")
-            synced.export(str(out_path), format="mp3", bitrate="192k")
+            subprocess.run(
+                [
+                    "ffmpeg", "-y", "-v", "error",
+                    "-stream_loop", "-1", "-i", str(music_path),
+                    "-t", f"{video_duration:.3f}", "-c", "copy", str(out_path),
+                ],
+                check=True,
+                capture_output=True,
+            )
             return out_path
         except Exception as exc:
             logger.warning(f"Music sync failed: {exc}")
@@ -188,15 +254,19 @@ class MusicAgent:
     # ── Internal helpers ─────────────────────────────────────────────────────
 
     @staticmethod
-    def _sync_to_duration(audio_segment, target_ms: int):
-        """Loop or trim a pydub AudioSegment to exactly *target_ms* milliseconds."""
-        current = len(audio_segment)
-        if current >= target_ms:
-            return audio_segment[:target_ms]
-        # Loop
-        loops_needed = math.ceil(target_ms / current)
-        looped = audio_segment * loops_needed
-        return looped[:target_ms]
+    def _probe_duration(path: Path) -> float:
+        """Return the duration of an audio file in seconds (via ffprobe)."""
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "csv=p=0", str(path),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return float(result.stdout.strip())
 
     def _generate_ambient_music(self, duration: float = 65.0) -> Path:
         """
@@ -210,37 +280,46 @@ class MusicAgent:
             Path to the generated WAV file (converted to MP3 if pydub available).
         """
         try:
-            from scipy.io.wavfile import write as wav_write
-            from scipy.signal import butter, lfilter
+            from wave import open as wav_open
+            from scipy.signal import butter, sosfilt, sosfilt_zi
 
+            # Everything stays float32: half the memory traffic of float64 on
+            # ~2.9 M samples, and SciPy's sosfilt preserves the dtype
             sample_rate = 44100
-            t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False)
+            t = np.linspace(0, duration, int(sample_rate * duration),
+                            endpoint=False, dtype=np.float32)
 
             # Ambient chord: root + fifth + octave at 174 Hz (healing frequency)
-            freqs = [174.0, 261.0, 348.0, 440.0]
-            wave = sum(
-                0.15 * np.sin(2 * np.pi * f * t + np.random.uniform(0, 0.1))
-                for f in freqs
-            )
-
-            # Slow amplitude envelope (breathing effect)
-            envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 0.05 * t)
-            wave = (wave * envelope * 0.6).astype(np.float32)
-
-            # Low-pass filter for warmth
-            b, a = butter(4, 2000 / (sample_rate / 2), btype="low")
-            wave = lfilter(b, a, wave).astype(np.float32)
+            # with a slow amplitude envelope (breathing effect)
+            freqs  = np.array([174.0, 261.0, 348.0, 440.0], dtype=np.float32)
+            phases = np.random.uniform(0, 0.1, freqs.size).astype(np.float32)
+            wave = _synth(t, freqs, phases, 0.05)
+
+            # Low-pass filter for warmth (second-order sections are faster
+            # and more stable than the transfer-function form), started in
+            # steady state so there is no click on the first sample
+            sos = butter(4, 2000 / (sample_rate / 2), btype="low", output="sos")
+            sos = sos.astype(np.float32)
+            zi = (sosfilt_zi(sos) * wave[0]).astype(np.float32)
+            wave, _ = sosfilt(sos, wave, zi=zi)
 
             # Normalise
             peak = np.max(np.abs(wave))
             if peak > 0:
-                wave = wave / peak * 0.7
+                wave *= 0.7 / peak
 
-            wave_int = (wave * 32767).astype(np.int16)
-            stereo = np.column_stack([wave_int, wave_int])
+            wave_int = (wave * 32767).astype("<i2")
 
-            wav_path = get_output_path("audio", "ambient_generated.wav")
-            wav_write(str(wav_path), sample_rate, stereo)
+            # Stereo is the mono channel twice; interleave one second at a time
+            # rather than materialising a full (N, 2) copy of the track
+            wav_path = get_output_path("audio", timestamped_filename("ambient_generated", "wav"))
+            with wav_open(str(wav_path), "wb") as wav_file:
+                wav_file.setnchannels(2)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(sample_rate)
+                for start in range(0, wave_int.size, sample_rate):
+                    block = wave_int[start:start + sample_rate]
+                    wav_file.writeframesraw(np.repeat(block[:, None], 2, axis=1).tobytes())
 
             # Convert to MP3 if pydub available
             try:
@@ -259,6 +338,5 @@ class MusicAgent:
             logger.error(f"Music generation failed: {exc}")
             # Return an empty file so the pipeline doesn't crash
             silent_path = get_output_path("audio", "silent.mp3")
-            if not silent_path.exists():
-                silent_path.write_bytes(b"")
+            silent_path.touch()
             return silent_path
@@ -6,32 +6,112 @@ Supports immediate and scheduled publishing with retry logic.
 
 import json
 import time
+import random
 import asyncio
+import functools
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
-import requests
+import aiohttp
+
+# orjson is an optional, faster JSON codec; fall back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# POSIX advisory locks keep concurrent schedulers from interleaving queue
+# writes; unavailable on Windows, where the queue is single-writer
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 import config
 from utils.logger import logger
 from utils.file_manager import get_output_path
+from utils.http_client import USER_AGENT
+
+
+# Append-only log of scheduled posts, one JSON object per line; a later line
+# for the same entry ID supersedes earlier ones
+QUEUE_FILE = config.LOGS_DIR / "publish_queue.jsonl"
+LEGACY_QUEUE_FILE = QUEUE_FILE.with_suffix(".json")
+QUEUE_COMPACT_BYTES = 10 * 1024 * 1024   # rewrite the log on startup above this
+
+
+def _dumpb(obj) -> bytes:
+    """Serialise *obj* to compact JSON bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+def _loadb(data: bytes):
+    """Parse JSON *data*, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
-# Queue file for scheduled posts
-QUEUE_FILE = Path(__file__).parent.parent / "logs" / "publish_queue.json"
+def _queue_line(entry_id: str, entry: dict) -> bytes:
+    """One JSONL record of the publish queue."""
+    return _dumpb({"id": entry_id, **entry}) + b"\n"
+
+
+@functools.cache
+def _youtube_imports():
+    """
+    Import the Google client pieces once, on the first YouTube call, so the
+    module still loads without google-api-python-client installed.
+
+    Returns:
+        (build, Credentials, MediaFileUpload, RefreshError)
+    """
+    from googleapiclient.discovery import build
+    from googleapiclient.http import MediaFileUpload
+    from google.oauth2.credentials import Credentials
+    from google.auth.exceptions import RefreshError
+    return build, Credentials, MediaFileUpload, RefreshError
+
+
+@contextmanager
+def _queue_lock():
+    """Hold an exclusive lock on the queue's sidecar .lock file."""
+    QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with QUEUE_FILE.with_suffix(".lock").open("wb") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
 
 
 class PublisherAgent:
     """Handles multi-platform social media publishing with retry logic."""
 
     MAX_RETRIES = 3
-    RETRY_DELAY = 5  # seconds between retries
+    RETRY_DELAY = 5  # seconds before the first retry, doubling after
+
+    # Instagram processing poll: exponential backoff up to this many seconds,
+    # slowing to the cap once Graph reports the app above this usage percent
+    IG_POLL_MAX_DELAY = 15.0
+    IG_USAGE_THROTTLE = 80
+
+    # Threads for blocking client-library calls (YouTube upload + verify)
+    EXECUTOR_WORKERS = 4
+
+    # Large uploads: no overall deadline, but give up on a stalled socket
+    UPLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_read=300)
 
     def __init__(self) -> None:
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "TourismAgent/1.0"})
+        # Created on first use so it binds to the running event loop
+        self._asession: Optional[aiohttp.ClientSession] = None
+        self._youtube = None     # Authenticated client, built on first upload
+        self._executor: Optional[ThreadPoolExecutor] = None   # Blocking API calls
         self._scheduler = None   # Set externally via set_scheduler()
+        self._compact_queue()
         logger.info("PublisherAgent ready")
 
     def set_scheduler(self, scheduler) -> None:
@@ -40,7 +120,7 @@ class PublisherAgent:
 
     # ── Platform publishers ───────────────────────────────────────────────────
 
-    def publish_to_youtube(
+    async def publish_to_youtube(
         self,
         video_path: Path,
         title: str,
@@ -61,83 +141,22 @@ class PublisherAgent:
         Returns:
             YouTube video URL string, or None on failure.
         """
-        if not all([config.YOUTUBE_CLIENT_ID, config.YOUTUBE_CLIENT_SECRET,
-                    config.YOUTUBE_REFRESH_TOKEN]):
+        if not self._youtube_configured():
             logger.warning("YouTube credentials incomplete; skipping YouTube upload")
             return None
 
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                from googleapiclient.discovery import build
-                from google.oauth2.credentials import Credentials
-                from googleapiclient.http import MediaFileUpload
-
-                creds = Credentials(
-                    token=None,
-                    refresh_token=config.YOUTUBE_REFRESH_TOKEN,
-                    token_uri="https://oauth2.googleapis.com/token",
-                    client_id=config.YOUTUBE_CLIENT_ID,
-                    client_secret=config.YOUTUBE_CLIENT_SECRET,
-                )
-                youtube = build("youtube", "v3", credentials=creds, cache_discovery=False)
-
-                # Clean tags (remove '#')
-                clean_tags = [t.lstrip("#") for t in tags]
-
-                body = {
-                    "snippet": {
-                        "title": title[:100],
-                        "description": description,
-                        "tags": clean_tags[:15],
-                        "categoryId": "19",   # Travel & Events
-                        "defaultLanguage": config.LOCATION["language"],
-                    },
-                    "status": {
-                        "privacyStatus": "public",
-                        "selfDeclaredMadeForKids": False,
-                    },
-                }
-
-                media = MediaFileUpload(
-                    str(video_path),
-                    mimetype="video/mp4",
-                    resumable=True,
-                    chunksize=1024 * 1024 * 5,  # 5 MB chunks
-                )
-
-                request = youtube.videos().insert(
-                    part=",".join(body.keys()),
-                    body=body,
-                    media_body=media,
-                )
-
-                response = None
-                while response is None:
-                    _, response = request.next_chunk()
-
-                video_id = response["id"]
-                url = f"https://www.youtube.com/watch?v={video_id}"
-
-                # Upload thumbnail if provided
-                if thumbnail_path and thumbnail_path.exists():
-                    youtube.thumbnails().set(
-                        videoId=video_id,
-                        media_body=MediaFileUpload(str(thumbnail_path), mimetype="image/jpeg"),
-                    ).execute()
-                    logger.info("Thumbnail uploaded to YouTube")
-
-                logger.info(f"✅ YouTube upload complete: {url}")
-                return url
-
-            except Exception as exc:
-                logger.warning(f"YouTube attempt {attempt}/{self.MAX_RETRIES} failed: {exc}")
-                if attempt < self.MAX_RETRIES:
-                    time.sleep(self.RETRY_DELAY * attempt)
-
-        logger.error("YouTube upload failed after all retries")
-        return None
+        # The client library is blocking, so each attempt runs in a worker
+        # thread; the backoff between attempts does not hold that thread
+        loop = asyncio.get_event_loop()
+        return await self._with_retry(
+            lambda: loop.run_in_executor(
+                self._get_executor(), self._upload_to_youtube,
+                video_path, title, description, tags, thumbnail_path,
+            ),
+            "YouTube",
+        )
 
-    def publish_to_instagram(
+    async def publish_to_instagram(
         self,
         video_path: Path,
         caption: str,
@@ -160,52 +179,46 @@ class PublisherAgent:
 
         base_url = f"https://graph.facebook.com/v18.0/{config.INSTAGRAM_PAGE_ID}"
         params = {"access_token": config.INSTAGRAM_ACCESS_TOKEN}
-
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                # Step 1: Create container
-                container_data: dict = {
-                    "media_type": "REELS",
-                    "video_url": self._upload_video_to_cdn(video_path),
-                    "caption": caption[:2200],
-                }
-                if thumbnail_path and thumbnail_path.exists():
-                    container_data["thumb_offset"] = "0"
-
-                resp = self.session.post(
-                    f"{base_url}/media",
-                    params=params,
-                    json=container_data,
-                    timeout=60,
-                )
+        session = self._get_session()
+
+        async def attempt() -> str:
+            # Step 1: Create container
+            container_data: dict = {
+                "media_type": "REELS",
+                "video_url": self._upload_video_to_cdn(video_path),
+                "caption": caption[:2200],
+            }
+            if thumbnail_path and thumbnail_path.exists():
+                container_data["thumb_offset"] = "0"
+
+            async with session.post(
+                f"{base_url}/media",
+                params=params,
+                json=container_data,
+                timeout=aiohttp.ClientTimeout(total=60),
+            ) as resp:
                 resp.raise_for_status()
-                container_id = resp.json()["id"]
-
-                # Step 2: Wait for video processing
-                self._wait_for_ig_processing(container_id, params)
-
-                # Step 3: Publish
-                pub_resp = self.session.post(
-                    f"{base_url}/media_publish",
-                    params=params,
-                    json={"creation_id": container_id},
-                    timeout=30,
-                )
+                container_id = (await resp.json())["id"]
+
+            # Step 2: Wait for video processing
+            await self._wait_for_ig_processing(container_id, params)
+
+            # Step 3: Publish
+            async with session.post(
+                f"{base_url}/media_publish",
+                params=params,
+                json={"creation_id": container_id},
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as pub_resp:
                 pub_resp.raise_for_status()
-                post_id = pub_resp.json()["id"]
-                url = f"https://www.instagram.com/p/{post_id}/"
-                logger.info(f"✅ Instagram published: {url}")
-                return url
+                post_id = (await pub_resp.json())["id"]
+            url = f"https://www.instagram.com/p/{post_id}/"
+            logger.info(f"✅ Instagram published: {url}")
+            return url
 
-            except Exception as exc:
-                logger.warning(f"Instagram attempt {attempt}/{self.MAX_RETRIES} failed: {exc}")
-                if attempt < self.MAX_RETRIES:
-                    time.sleep(self.RETRY_DELAY * attempt)
-
-        logger.error("Instagram publishing failed after all retries")
-        return None
+        return await self._with_retry(attempt, "Instagram")
 
-    def publish_to_facebook(
+    async def publish_to_facebook(
         self,
         video_path: Path,
         description: str,
@@ -225,34 +238,26 @@ class PublisherAgent:
             logger.warning("Facebook credentials missing; skipping")
             return None
 
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                url = f"https://graph-video.facebook.com/v18.0/{config.FACEBOOK_PAGE_ID}/videos"
-                with open(video_path, "rb") as vf:
-                    resp = self.session.post(
-                        url,
-                        data={
-                            "description": description[:5000],
-                            "access_token": config.FACEBOOK_ACCESS_TOKEN,
-                        },
-                        files={"source": vf},
-                        timeout=300,
-                    )
-                resp.raise_for_status()
-                post_id = resp.json().get("id", "")
-                fb_url = f"https://www.facebook.com/video/{post_id}"
-                logger.info(f"✅ Facebook published: {fb_url}")
-                return fb_url
-
-            except Exception as exc:
-                logger.warning(f"Facebook attempt {attempt}/{self.MAX_RETRIES} failed: {exc}")
-                if attempt < self.MAX_RETRIES:
-                    time.sleep(self.RETRY_DELAY * attempt)
-
-        logger.error("Facebook publishing failed after all retries")
-        return None
-
-    def publish_to_telegram(
+        session = self._get_session()
+        url = f"https://graph-video.facebook.com/v18.0/{config.FACEBOOK_PAGE_ID}/videos"
+
+        async def attempt() -> str:
+            with open(video_path, "rb") as vf:
+                form = aiohttp.FormData()
+                form.add_field("description", description[:5000])
+                form.add_field("access_token", config.FACEBOOK_ACCESS_TOKEN)
+                form.add_field("source", vf, filename=video_path.name,
+                               content_type="video/mp4")
+                async with session.post(url, data=form, timeout=self.UPLOAD_TIMEOUT) as resp:
+                    resp.raise_for_status()
+                    post_id = (await resp.json()).get("id", "")
+            fb_url = f"https://www.facebook.com/video/{post_id}"
+            logger.info(f"✅ Facebook published: {fb_url}")
+            return fb_url
+
+        return await self._with_retry(attempt, "Facebook")
+
+    async def publish_to_telegram(
         self,
         video_path: Path,
         caption: str,
@@ -276,41 +281,34 @@ class PublisherAgent:
             logger.warning("Telegram credentials missing; skipping")
             return None
 
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                url = f"https://api.telegram.org/bot{token}/sendVideo"
-                with open(video_path, "rb") as vf:
-                    resp = self.session.post(
-                        url,
-                        data={
-                            "chat_id": channel,
-                            "caption": caption[:1024],
-                            "parse_mode": "Markdown",
-                            "supports_streaming": True,
-                        },
-                        files={"video": vf},
-                        timeout=300,
-                    )
-                resp.raise_for_status()
-                msg_id = resp.json()["result"]["message_id"]
-
-                # Pin the message
-                self.session.post(
-                    f"https://api.telegram.org/bot{token}/pinChatMessage",
-                    data={"chat_id": channel, "message_id": msg_id},
-                    timeout=10,
-                )
+        session = self._get_session()
+
+        async def attempt() -> int:
+            url = f"https://api.telegram.org/bot{token}/sendVideo"
+            with open(video_path, "rb") as vf:
+                form = aiohttp.FormData()
+                form.add_field("chat_id", str(channel))
+                form.add_field("caption", caption[:1024])
+                form.add_field("parse_mode", "Markdown")
+                form.add_field("supports_streaming", "true")
+                form.add_field("video", vf, filename=video_path.name,
+                               content_type="video/mp4")
+                async with session.post(url, data=form, timeout=self.UPLOAD_TIMEOUT) as resp:
+                    resp.raise_for_status()
+                    msg_id = (await resp.json())["result"]["message_id"]
+
+            # Pin the message
+            async with session.post(
+                f"https://api.telegram.org/bot{token}/pinChatMessage",
+                data={"chat_id": str(channel), "message_id": str(msg_id)},
+                timeout=aiohttp.ClientTimeout(total=10),
+            ):
+                pass
 
-                logger.info(f"✅ Telegram published: message_id={msg_id}")
-                return msg_id
+            logger.info(f"✅ Telegram published: message_id={msg_id}")
+            return msg_id
 
-            except Exception as exc:
-                logger.warning(f"Telegram attempt {attempt}/{self.MAX_RETRIES} failed: {exc}")
-                if attempt < self.MAX_RETRIES:
-                    time.sleep(self.RETRY_DELAY * attempt)
-
-        logger.error("Telegram publishing failed after all retries")
-        return None
+        return await self._with_retry(attempt, "Telegram")
 
     # ── Orchestrated publishing ───────────────────────────────────────────────
 
@@ -319,6 +317,7 @@ class PublisherAgent:
         video_path: Path,
         content_data: dict,
         schedule_time: Optional[datetime] = None,
+        platforms: Optional[list[str]] = None,
     ) -> dict[str, str | int | None]:
         """
         Publish to all configured platforms simultaneously (or schedule them).
@@ -327,52 +326,59 @@ class PublisherAgent:
             video_path:    Path to the final video.
             content_data:  Dict with 'title', 'captions', 'thumbnail', 'tags'.
             schedule_time: If set, queue posts for this datetime instead.
+            platforms:     Platforms to publish to (default: SCHEDULE["platforms"]).
 
         Returns:
             Dict of platform → URL/message_id/None.
         """
+        platforms = platforms or config.SCHEDULE["platforms"]
         if schedule_time:
-            return self._schedule_all(video_path, content_data, schedule_time)
+            return self._schedule_all(video_path, content_data, schedule_time, platforms)
 
         results: dict = {}
-        platforms = config.SCHEDULE["platforms"]
         captions = content_data.get("captions", {})
         thumbnail = content_data.get("thumbnail")
         title = content_data.get("title", config.LOCATION["name"])
         tags = content_data.get("tags", config.LOCATION["hashtags"])
 
-        # Run all platform uploads concurrently
-        loop = asyncio.get_event_loop()
+        # Run all platform uploads concurrently on the event loop; retries
+        # back off with asyncio.sleep, so one platform's failures never
+        # hold up the others
         tasks = {}
 
         if "youtube" in platforms:
-            tasks["youtube"] = loop.run_in_executor(
-                None, self.publish_to_youtube,
+            tasks["youtube"] = self.publish_to_youtube(
                 video_path, title, captions.get("youtube", ""),
                 tags, thumbnail,
             )
         if "instagram" in platforms:
-            tasks["instagram"] = loop.run_in_executor(
-                None, self.publish_to_instagram,
+            tasks["instagram"] = self.publish_to_instagram(
                 video_path, captions.get("instagram", ""), thumbnail,
             )
         if "facebook" in platforms:
-            tasks["facebook"] = loop.run_in_executor(
-                None, self.publish_to_facebook,
+            tasks["facebook"] = self.publish_to_facebook(
                 video_path, captions.get("facebook", ""), thumbnail,
             )
         if "telegram" in platforms:
-            tasks["telegram"] = loop.run_in_executor(
-                None, self.publish_to_telegram,
+            tasks["telegram"] = self.publish_to_telegram(
                 video_path, captions.get("telegram", ""),
             )
 
-        for platform, task in tasks.items():
-            try:
-                results[platform] = await task
-            except Exception as exc:
-                logger.error(f"{platform} publish error: {exc}")
+        # All uploads start together, so a per-task wait_for is an overall
+        # deadline that still keeps the results of platforms that finished
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(t, config.PUBLISH_TIMEOUT) for t in tasks.values()),
+            return_exceptions=True,
+        )
+        for platform, outcome in zip(tasks, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.error(f"{platform} publish timed out after {config.PUBLISH_TIMEOUT:.0f}s")
                 results[platform] = None
+            elif isinstance(outcome, Exception):
+                logger.error(f"{platform} publish error: {outcome}")
+                results[platform] = None
+            else:
+                results[platform] = outcome
 
         logger.info(f"Publishing results: {results}")
         return results
@@ -384,7 +390,7 @@ class PublisherAgent:
         publish_time: datetime,
     ) -> str:
         """
-        Persist a post to the JSON queue for deferred publishing.
+        Append a post to the JSONL queue for deferred publishing.
 
         Args:
             platform:     Platform name.
@@ -394,19 +400,17 @@ class PublisherAgent:
         Returns:
             Queue entry ID.
         """
-        queue = self._load_queue()
         entry_id = f"{platform}_{publish_time.strftime('%Y%m%d_%H%M%S')}"
-        queue[entry_id] = {
+        self._append_queue(entry_id, {
             "platform": platform,
             "content": content,
             "publish_time": publish_time.isoformat(),
             "status": "pending",
-        }
-        self._save_queue(queue)
+        })
         logger.info(f"Post scheduled: {entry_id} at {publish_time}")
         return entry_id
 
-    def verify_upload(self, platform: str, post_id: str) -> bool:
+    async def verify_upload(self, platform: str, post_id: str) -> bool:
         """
         Confirm an upload is live on the given platform.
 
@@ -417,26 +421,207 @@ class PublisherAgent:
         Returns:
             True if the post is publicly accessible.
         """
+        timeout = aiohttp.ClientTimeout(total=10)
         try:
-            if platform == "youtube":
+            if platform == "youtube" and self._youtube_configured():
+                # The watch page answers 200 even for private or deleted
+                # videos; the Data API reports the real status
+                video_id = str(post_id).rsplit("v=", 1)[-1]
+                loop = asyncio.get_event_loop()
+                resp = await loop.run_in_executor(
+                    self._get_executor(),
+                    lambda: self._get_youtube().videos().list(
+                        id=video_id, part="status",
+                    ).execute(),
+                )
+                items = resp.get("items", [])
+                return bool(items) and items[0]["status"].get("privacyStatus") == "public"
+
+            elif platform == "youtube":
                 url = f"https://www.youtube.com/watch?v={post_id}"
-                resp = self.session.head(url, timeout=10)
-                return resp.status_code == 200
+                async with self._get_session().head(url, timeout=timeout) as resp:
+                    return resp.status == 200
 
             elif platform == "telegram":
                 return bool(post_id)   # Message IDs are immediately valid
 
             else:
                 # Generic check: try to fetch the URL
-                resp = self.session.head(str(post_id), timeout=10)
-                return resp.status_code in (200, 301, 302)
+                async with self._get_session().head(str(post_id), timeout=timeout) as resp:
+                    return resp.status in (200, 301, 302)
 
         except Exception as exc:
             logger.warning(f"Verification failed for {platform}/{post_id}: {exc}")
             return False
 
+    async def aclose(self) -> None:
+        """Close the shared HTTP session and worker pool (call once the pipeline is done)."""
+        if self._asession is not None and not self._asession.closed:
+            await self._asession.close()
+        self._asession = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+
     # ── Internal helpers ─────────────────────────────────────────────────────
 
+    async def _with_retry(self, attempt_fn, name: str):
+        """
+        Await ``attempt_fn()`` up to MAX_RETRIES times, backing off
+        exponentially from RETRY_DELAY (plus up to 10 % jitter) between
+        failures.
+
+        Args:
+            attempt_fn: Zero-argument callable returning an awaitable.
+            name:       Platform name for log messages.
+
+        Returns:
+            The first successful result, or None once all attempts fail.
+        """
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            try:
+                return await attempt_fn()
+            except Exception as exc:
+                logger.warning(f"{name} attempt {attempt}/{self.MAX_RETRIES} failed: {exc}")
+                if attempt < self.MAX_RETRIES:
+                    delay = self.RETRY_DELAY * 2 ** (attempt - 1)
+                    await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+
+        logger.error(f"{name} publishing failed after all retries")
+        return None
+
+    def _upload_to_youtube(
+        self,
+        video_path: Path,
+        title: str,
+        description: str,
+        tags: list[str],
+        thumbnail_path: Optional[Path],
+    ) -> str:
+        """One blocking YouTube upload attempt; returns the video URL."""
+        _, _, MediaFileUpload, RefreshError = _youtube_imports()
+
+        youtube = self._get_youtube()
+
+        # Clean tags (remove '#')
+        clean_tags = [t.lstrip("#") for t in tags]
+
+        body = {
+            "snippet": {
+                "title": title[:100],
+                "description": description,
+                "tags": clean_tags[:15],
+                "categoryId": "19",   # Travel & Events
+                "defaultLanguage": config.LOCATION["language"],
+            },
+            "status": {
+                "privacyStatus": "public",
+                "selfDeclaredMadeForKids": False,
+            },
+        }
+
+        media = MediaFileUpload(
+            str(video_path),
+            mimetype="video/mp4",
+            resumable=True,
+            chunksize=self._youtube_chunk_size(video_path),
+        )
+
+        request = youtube.videos().insert(
+            part=",".join(body.keys()),
+            body=body,
+            media_body=media,
+        )
+
+        try:
+            response = None
+            while response is None:
+                _, response = request.next_chunk()
+        except RefreshError:
+            # Token refresh failed: drop the cached client so the next
+            # attempt re-authenticates from scratch
+            self._youtube = None
+            raise
+
+        video_id = response["id"]
+        url = f"https://www.youtube.com/watch?v={video_id}"
+
+        # Upload thumbnail if provided
+        if thumbnail_path and thumbnail_path.exists():
+            youtube.thumbnails().set(
+                videoId=video_id,
+                media_body=MediaFileUpload(str(thumbnail_path), mimetype="image/jpeg"),
+            ).execute()
+            logger.info("Thumbnail uploaded to YouTube")
+
+        logger.info(f"✅ YouTube upload complete: {url}")
+        return url
+
+    @staticmethod
+    def _youtube_configured() -> bool:
+        """True when all YouTube OAuth settings are present."""
+        return all([config.YOUTUBE_CLIENT_ID, config.YOUTUBE_CLIENT_SECRET,
+                    config.YOUTUBE_REFRESH_TOKEN])
+
+    def _get_youtube(self):
+        """
+        Build the authenticated YouTube client once and reuse it, so the
+        refreshed token and the open HTTPS connection survive across chunks,
+        the thumbnail call, retries and later runs.
+        """
+        if self._youtube is None:
+            build, Credentials, _, _ = _youtube_imports()
+
+            creds = Credentials(
+                token=None,
+                refresh_token=config.YOUTUBE_REFRESH_TOKEN,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=config.YOUTUBE_CLIENT_ID,
+                client_secret=config.YOUTUBE_CLIENT_SECRET,
+            )
+            self._youtube = build(
+                "youtube", "v3",
+                credentials=creds,
+                cache_discovery=False,
+                static_discovery=True,
+            )
+        return self._youtube
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Return the publisher's own worker pool for the blocking Google client,
+        so uploads don't compete with unrelated work in the loop's default
+        executor.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.EXECUTOR_WORKERS, thread_name_prefix="publish",
+            )
+        return self._executor
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._asession is None or self._asession.closed:
+            self._asession = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64, limit_per_host=8, keepalive_timeout=75,
+                ),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._asession
+
+    @staticmethod
+    def _youtube_chunk_size(video_path: Path) -> int:
+        """
+        Resumable-upload chunk size for *video_path*: config.YOUTUBE_CHUNK_SIZE
+        (×4 above 1 GB), rounded down to the 256 KB multiple Google requires.
+        """
+        step = 256 * 1024
+        size = config.YOUTUBE_CHUNK_SIZE
+        if video_path.stat().st_size > 1024 ** 3:
+            size *= 4
+        return max(step, size // step * step)
+
     def _upload_video_to_cdn(self, video_path: Path) -> str:
         """
         Instagram requires a publicly accessible video URL.
@@ -450,41 +635,115 @@ class PublisherAgent:
         )
         return ""  # Replace with actual CDN URL
 
-    def _wait_for_ig_processing(self, container_id: str, params: dict, timeout: int = 120) -> None:
-        """Poll Instagram until the video container is fully processed."""
+    async def _wait_for_ig_processing(
+        self, container_id: str, params: dict, timeout: int = 120
+    ) -> None:
+        """
+        Poll Instagram until the video container is fully processed.
+
+        Polls back off exponentially (1 s, 2 s, 4 s … capped at
+        IG_POLL_MAX_DELAY) with a little jitter, and wait the full cap after
+        an HTTP 429 or when Graph reports the app is above
+        IG_USAGE_THROTTLE percent of its rate limit.
+        """
+        session = self._get_session()
         deadline = time.time() + timeout
+        delay = 1.0
         while time.time() < deadline:
-            resp = self.session.get(
+            async with session.get(
                 f"https://graph.facebook.com/v18.0/{container_id}",
                 params={**params, "fields": "status_code"},
-                timeout=10,
-            )
-            status = resp.json().get("status_code", "")
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                usage = self._app_usage(resp.headers)
+                throttled = resp.status == 429 or usage > self.IG_USAGE_THROTTLE
+                if resp.status == 429:
+                    status = ""
+                else:
+                    status = (await resp.json()).get("status_code", "")
             if status == "FINISHED":
                 return
             if status == "ERROR":
                 raise RuntimeError("Instagram video processing failed")
-            time.sleep(5)
+            wait = self.IG_POLL_MAX_DELAY if throttled else delay
+            pause = min(wait + random.uniform(0, wait * 0.1), deadline - time.time())
+            if pause > 0:
+                await asyncio.sleep(pause)
+            delay = min(delay * 2, self.IG_POLL_MAX_DELAY)
         raise TimeoutError("Instagram processing timeout")
 
+    @staticmethod
+    def _app_usage(headers) -> float:
+        """Highest percentage in Graph's X-App-Usage header (0 if absent)."""
+        try:
+            usage = json.loads(headers.get("X-App-Usage", "{}"))
+            return float(max(usage.values(), default=0))
+        except (ValueError, TypeError, AttributeError):
+            return 0.0
+
     def _schedule_all(
-        self, video_path: Path, content_data: dict, schedule_time: datetime
+        self, video_path: Path, content_data: dict, schedule_time: datetime,
+        platforms: list[str],
     ) -> dict:
-        """Queue posts for all platforms at *schedule_time*."""
+        """Queue posts for *platforms* at *schedule_time*."""
         results = {}
-        for platform in config.SCHEDULE["platforms"]:
+        for platform in platforms:
             entry_id = self.schedule_post(platform, content_data, schedule_time)
             results[platform] = f"scheduled:{entry_id}"
         return results
 
     def _load_queue(self) -> dict:
-        if QUEUE_FILE.exists():
-            try:
-                return json.loads(QUEUE_FILE.read_text())
-            except Exception:
-                pass
-        return {}
-
-    def _save_queue(self, queue: dict) -> None:
-        QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        QUEUE_FILE.write_text(json.dumps(queue, indent=2))
+        """Replay the queue log into {entry_id: entry}, latest line winning."""
+        queue: dict = {}
+        if not QUEUE_FILE.exists():
+            return queue
+        with QUEUE_FILE.open("rb") as f:
+            for line in f:
+                try:
+                    entry = _loadb(line)
+                    queue[entry.pop("id")] = entry
+                except Exception:
+                    continue   # skip a torn or corrupt line
+        return queue
+
+    def _append_queue(self, entry_id: str, entry: dict) -> None:
+        """Append one queue entry without rewriting the rest of the file."""
+        self._append_queue_lines(_queue_line(entry_id, entry))
+
+    @staticmethod
+    def _append_queue_lines(data: bytes) -> None:
+        with _queue_lock(), QUEUE_FILE.open("a+b") as f:
+            # A crash mid-append can leave a line without its newline; start
+            # on a fresh line so the new record isn't glued onto it
+            if f.seek(0, 2) > 0:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+
+    def _compact_queue(self) -> None:
+        """
+        Import a legacy publish_queue.json, and rewrite the log with one line
+        per entry once it grows past QUEUE_COMPACT_BYTES.
+        """
+        try:
+            if LEGACY_QUEUE_FILE.exists():
+                legacy = _loadb(LEGACY_QUEUE_FILE.read_bytes())
+                self._append_queue_lines(b"".join(
+                    _queue_line(entry_id, entry) for entry_id, entry in legacy.items()
+                ))
+                LEGACY_QUEUE_FILE.unlink()
+
+            if QUEUE_FILE.exists() and QUEUE_FILE.stat().st_size > QUEUE_COMPACT_BYTES:
+                with _queue_lock():
+                    queue = self._load_queue()
+                    # Write a sibling file and swap it in: os.replace is atomic,
+                    # so a crash leaves either the old log or the new one
+                    tmp = QUEUE_FILE.with_suffix(".tmp")
+                    tmp.write_bytes(b"".join(
+                        _queue_line(entry_id, entry) for entry_id, entry in queue.items()
+                    ))
+                    tmp.replace(QUEUE_FILE)
+                logger.info(f"Publish queue compacted to {len(queue)} entries")
+        except Exception as exc:
+            logger.warning(f"Publish queue maintenance failed: {exc}")
@@ -4,24 +4,149 @@ Uses Google Gemini 1.5 Flash (free: 1 M tokens/day) to generate
 viral travel video scripts and platform-specific captions.
 """
 
+import re
 import json
+import time
+import asyncio
 import random
+import functools
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
 from google import genai
+
+# orjson is an optional, faster JSON codec; fall back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import config
 from utils.logger import logger
 from utils.file_manager import get_output_path, timestamped_filename
 
 
+# A ```/```json fenced block anywhere in the reply; the body is captured up
+# to the last fence, so fences inside the JSON strings and prose around the
+# block are both left out
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*)```", re.DOTALL)
+
+# Script prompt, filled in by ScriptWriterAgent._build_prompt()
+_PROMPT_TEMPLATE = """You are a viral travel content creator specialising in short-form video.
+Write a script for a 60-second vertical video (TikTok / Reels style).
+
+Location : {name}, {country}
+Topic    : {topic}
+Style    : {style}
+Tone     : Exciting, inspiring, conversational
+Audience : Travel lovers aged 18-45
+Attractions to mention: {attractions}
+
+Return ONLY a valid JSON object (no markdown, no preamble) with EXACTLY these keys:
+{{
+  "hook": "First 3 seconds – shocking fact or question to stop the scroll",
+  "intro": "Seconds 3-10 – brief intro",
+  "main_content": ["point 1", "point 2", "point 3", "point 4", "point 5"],
+  "transition_texts": ["text for image 1", "text for image 2", "text for image 3",
+                       "text for image 4", "text for image 5", "text for image 6",
+                       "text for image 7", "text for image 8", "text for image 9",
+                       "text for image 10", "text for image 11", "text for image 12"],
+  "voiceover_script": "Full 60-second narration text",
+  "outro": "Last 5 seconds with call to action",
+  "title": "YouTube/social media title (60 chars max)",
+  "description": "Full platform description (approx 200 words)",
+  "thumbnail_text": "Bold 4-word text for thumbnail",
+  "search_queries": ["query1", "query2", "query3"]
+}}"""
+
+
+@functools.lru_cache(maxsize=8)
+def _attractions_str(attractions: tuple[str, ...]) -> str:
+    """Comma-joined attraction list (the same few locations recur every run)."""
+    return ", ".join(attractions)
+
+
+@functools.lru_cache(maxsize=8)
+def _hashtag_blocks(hashtags: tuple[str, ...]) -> dict[str, str]:
+    """Per-platform hashtag strings, joined once per hashtag set."""
+    return {
+        "instagram": " ".join(hashtags[:30]),
+        "youtube":   ", ".join(hashtags[:15]),
+        "facebook":  " ".join(hashtags[:5]),
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _platform_caption(
+    base_caption: str,
+    platform: str,
+    location_name: str,
+    hashtags: tuple[str, ...],
+    cta: str,
+) -> str:
+    """Pure caption builder behind adapt_caption_for_platform(), memoised."""
+    tag_blocks = _hashtag_blocks(hashtags)
+
+    if platform == "instagram":
+        # Emojis, 30 hashtags, line breaks
+        tag_block = tag_blocks["instagram"]
+        caption = (
+            f"✈️ {base_caption}\n\n"
+            f"📍 {location_name}\n\n"
+            f"💾 {cta}\n\n"
+            f".\n.\n.\n"
+            f"{tag_block}"
+        )
+
+    elif platform == "youtube":
+        # SEO description with chapters placeholder
+        tag_block = tag_blocks["youtube"]
+        caption = (
+            f"{base_caption}\n\n"
+            f"📍 Location: {location_name}\n\n"
+            f"⏱️ CHAPTERS:\n"
+            f"0:00 Introduction\n"
+            f"0:10 Main highlights\n"
+            f"0:50 Final thoughts\n\n"
+            f"🔔 Subscribe for more travel content!\n\n"
+            f"Tags: {tag_block}"
+        )
+
+    elif platform == "facebook":
+        tag_block = tag_blocks["facebook"]
+        caption = (
+            f"{base_caption}\n\n"
+            f"Have you ever visited {location_name}? Let us know in the comments! 💬\n\n"
+            f"{tag_block}"
+        )
+
+    elif platform == "telegram":
+        # Clean text, key highlights
+        caption = (
+            f"🌍 *{location_name}* – Must-See Destination!\n\n"
+            f"{base_caption}\n\n"
+            f"📌 Save this post for your travel bucket list!"
+        )
+
+    else:
+        caption = base_caption
+
+    return caption
+
+
 class ScriptWriterAgent:
     """Generates viral travel video scripts powered by Gemini 1.5 Flash."""
 
     # Gemini model name (free tier)
     MODEL_NAME = "gemini-2.0-flash"
 
+    # Free-tier request quota; calls beyond it wait for the window to roll
+    REQUESTS_PER_MINUTE = 15
+
     def __init__(self) -> None:
+        self._request_times: deque[float] = deque()   # monotonic send times
+        self._rate_lock = asyncio.Lock()
         if not config.GEMINI_API_KEY:
             logger.warning("GEMINI_API_KEY not set; script generation will fail")
         else:
@@ -51,19 +176,16 @@ class ScriptWriterAgent:
         logger.info(f"Generating script for topic: '{trend_topic}' style: '{style}'")
 
         try:
-            response = self.client.models.generate_content(
-                model=self.MODEL_NAME,
-                contents=prompt
-            )
-            raw = response.text.strip()
-            # Strip markdown code fences if present
-            if raw.startswith("```"):
-                raw = raw.split("```")[1]
-                if raw.startswith("json"):
-                    raw = raw[4:]
-            raw = raw.strip()
-
-            script = json.loads(raw)
+            response = await self._generate(prompt)
+            raw = response.text
+            # Strip markdown code fences and any chatter around the object
+            match = _FENCE_RE.search(raw)
+            raw = match.group(1) if match else raw
+            start, end = raw.find("{"), raw.rfind("}")
+            if 0 <= start < end:
+                raw = raw[start:end + 1]
+
+            script = orjson.loads(raw) if orjson is not None else json.loads(raw)
             logger.info(f"✅ Script generated: '{script.get('title', 'Untitled')}'")
             return script
 
@@ -74,6 +196,29 @@ class ScriptWriterAgent:
             logger.error(f"Gemini API error: {exc}")
             return self._fallback_script(trend_topic, location, style)
 
+    async def generate_scripts_batch(
+        self,
+        items: list[tuple[str, dict, str]],
+        max_concurrency: int = 10,
+    ) -> list:
+        """
+        Generate several scripts concurrently.
+
+        Args:
+            items:           (trend_topic, location, style) tuples.
+            max_concurrency: Max Gemini requests in flight at once.
+
+        Returns:
+            One script dict (or exception) per item, in input order.
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def one(topic: str, location: dict, style: str) -> dict:
+            async with sem:
+                return await self.generate_video_script(topic, location, style)
+
+        return await asyncio.gather(*(one(*item) for item in items), return_exceptions=True)
+
     def generate_thumbnail_title(self, script: dict) -> str:
         """
         Extract a clickable, SEO-friendly thumbnail title from the script.
@@ -101,57 +246,13 @@ class ScriptWriterAgent:
         Returns:
             Platform-optimised caption string.
         """
-        location_name = config.LOCATION["name"]
-        hashtags = config.LOCATION["hashtags"]
-        cta = config.CONTENT_STYLE["call_to_action"]
-
-        platform = platform.lower()
-
-        if platform == "instagram":
-            # Emojis, 30 hashtags, line breaks
-            tag_block = " ".join(hashtags[:30])
-            caption = (
-                f"✈️ {base_caption}\n\n"
-                f"📍 {location_name}\n\n"
-                f"💾 {cta}\n\n"
-                f".\n.\n.\n"
-                f"{tag_block}"
-            )
-
-        elif platform == "youtube":
-            # SEO description with chapters placeholder
-            tag_block = ", ".join(hashtags[:15])
-            caption = (
-                f"{base_caption}\n\n"
-                f"📍 Location: {location_name}\n\n"
-                f"⏱️ CHAPTERS:\n"
-                f"0:00 Introduction\n"
-                f"0:10 Main highlights\n"
-                f"0:50 Final thoughts\n\n"
-                f"🔔 Subscribe for more travel content!\n\n"
-                f"Tags: {tag_block}"
-            )
-
-        elif platform == "facebook":
-            tag_block = " ".join(hashtags[:5])
-            caption = (
-                f"{base_caption}\n\n"
-                f"Have you ever visited {location_name}? Let us know in the comments! 💬\n\n"
-                f"{tag_block}"
-            )
-
-        elif platform == "telegram":
-            # Clean text, key highlights
-            caption = (
-                f"🌍 *{location_name}* – Must-See Destination!\n\n"
-                f"{base_caption}\n\n"
-                f"📌 Save this post for your travel bucket list!"
-            )
-
-        else:
-            caption = base_caption
-
-        return caption
+        return _platform_caption(
+            base_caption,
+            platform.lower(),
+            config.LOCATION["name"],
+            tuple(config.LOCATION["hashtags"]),
+            config.CONTENT_STYLE["call_to_action"],
+        )
 
     def save_script(self, script_data: dict, filename: str | None = None) -> dict:
         """
@@ -181,34 +282,35 @@ class ScriptWriterAgent:
 
     # ── Internal helpers ─────────────────────────────────────────────────────
 
-    def _build_prompt(self, topic: str, location: dict, style: str) -> str:
-        attractions = ", ".join(location.get("local_attractions", []))
-        return f"""You are a viral travel content creator specialising in short-form video.
-Write a script for a 60-second vertical video (TikTok / Reels style).
-
-Location : {location['name']}, {location['country']}
-Topic    : {topic}
-Style    : {style}
-Tone     : Exciting, inspiring, conversational
-Audience : Travel lovers aged 18-45
-Attractions to mention: {attractions}
+    async def _generate(self, prompt: str):
+        """Call Gemini without blocking the event loop."""
+        await self._throttle()
+        aio = getattr(self.client, "aio", None)
+        if aio is not None:
+            return await aio.models.generate_content(model=self.MODEL_NAME, contents=prompt)
+        # Older SDKs have no async surface; run the blocking call in a thread
+        return await asyncio.to_thread(
+            self.client.models.generate_content, model=self.MODEL_NAME, contents=prompt,
+        )
+
+    async def _throttle(self) -> None:
+        """Wait until a request fits in the REQUESTS_PER_MINUTE sliding window."""
+        async with self._rate_lock:
+            now = time.monotonic()
+            while self._request_times and now - self._request_times[0] >= 60:
+                self._request_times.popleft()
+            if len(self._request_times) >= self.REQUESTS_PER_MINUTE:
+                await asyncio.sleep(60 - (now - self._request_times.popleft()))
+            self._request_times.append(time.monotonic())
 
-Return ONLY a valid JSON object (no markdown, no preamble) with EXACTLY these keys:
-{{
-  "hook": "First 3 seconds – shocking fact or question to stop the scroll",
-  "intro": "Seconds 3-10 – brief intro",
-  "main_content": ["point 1", "point 2", "point 3", "point 4", "point 5"],
-  "transition_texts": ["text for image 1", "text for image 2", "text for image 3",
-                       "text for image 4", "text for image 5", "text for image 6",
-                       "text for image 7", "text for image 8", "text for image 9",
-                       "text for image 10", "text for image 11", "text for image 12"],
-  "voiceover_script": "Full 60-second narration text",
-  "outro": "Last 5 seconds with call to action",
-  "title": "YouTube/social media title (60 chars max)",
-  "description": "Full platform description (approx 200 words)",
-  "thumbnail_text": "Bold 4-word text for thumbnail",
-  "search_queries": ["query1", "query2", "query3"]
-}}"""
+    def _build_prompt(self, topic: str, location: dict, style: str) -> str:
+        return _PROMPT_TEMPLATE.format_map({
+            "name":        location["name"],
+            "country":     location["country"],
+            "topic":       topic,
+            "style":       style,
+            "attractions": _attractions_str(tuple(location.get("local_attractions", []))),
+        })
 
     def _fallback_script(self, topic: str, location: dict, style: str) -> dict:
         """Return a basic script when Gemini is unavailable."""
@@ -4,70 +4,108 @@ Discovers trending travel topics using Google Trends, Reddit, YouTube,
 DuckDuckGo and NewsAPI, then ranks them for video production.
 """
 
+import re
+import json
 import time
+import heapq
 import asyncio
 from collections import Counter
-from typing import Any
+from operator import itemgetter
+from typing import Any, Awaitable, Callable, Optional
 
 import aiohttp
-import praw
-from pytrends.request import TrendReq
-from duckduckgo_search import DDGS
-from newsapi import NewsApiClient
-from googleapiclient.discovery import build
+
+# orjson is an optional, faster JSON codec; fall back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson else json.loads
 
 import config
 from utils.logger import logger
+from utils.file_manager import DIRS
+from utils.http_client import USER_AGENT, JsonCache
+from utils.throttle import TokenBucket, get_bucket
+
+# Keyword tokens: runs of 5+ letters count towards trend frequency; runs of
+# 4+ letters/digits become hashtags. Punctuation anywhere splits a token.
+_WORD_RE = re.compile(r"[^\W\d_]{5,}")
+_TAG_RE  = re.compile(r"[^\W_]{4,}")
 
 
 class TrendDiscoveryAgent:
     """Discovers trending travel content ideas for a target location."""
 
+    GOOGLE_TRENDS_URL  = "https://trends.google.com/trends"
+    REDDIT_TOKEN_URL   = "https://www.reddit.com/api/v1/access_token"
+    REDDIT_API_URL     = "https://oauth.reddit.com"
+    YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+    NEWS_API_URL       = "https://newsapi.org/v2/everything"
+
+    # Seconds each source's results are reused as-is, and the extra window
+    # in which an older result is still served while a refresh runs
+    CACHE_TTL = {
+        "google":     6 * 3600,
+        "reddit":     30 * 60,
+        "youtube":    2 * 3600,
+        "news":       15 * 60,
+        "duckduckgo": 3600,
+    }
+    CACHE_STALE = 600
+
+    # Client-side request budgets per API: (burst size, seconds to refill)
+    RATE_LIMITS = {
+        "google_trends": (5, 60),
+        "reddit":        (30, 60),
+        "ddg":           (10, 10),
+    }
+
     def __init__(self) -> None:
         self.location = config.LOCATION
-        self.pytrends = TrendReq(hl="en-US", tz=360, timeout=(10, 25), retries=2)
-        self._reddit: praw.Reddit | None = None
-        self._youtube = None
-        self._news: NewsApiClient | None = None
+        # Created on first use so it binds to the running event loop
+        self._asession: Optional[aiohttp.ClientSession] = None
+        self._reddit_token: Optional[tuple[str, float]] = None   # (token, expires_at)
+        self._trends_cookie = False   # Google Trends wants its NID cookie first
+        self._cache = JsonCache(DIRS["cache"])
+        self._refreshing: dict[str, asyncio.Task] = {}   # background refreshes by key
         self._init_clients()
 
     # ── Client initialisation ────────────────────────────────────────────────
 
     def _init_clients(self) -> None:
-        """Initialise optional third-party clients (swallow errors gracefully)."""
-        # Reddit
+        """Report which optional sources are configured."""
         if config.REDDIT_CLIENT_ID and config.REDDIT_CLIENT_SECRET:
-            try:
-                self._reddit = praw.Reddit(
-                    client_id=config.REDDIT_CLIENT_ID,
-                    client_secret=config.REDDIT_CLIENT_SECRET,
-                    user_agent=config.REDDIT_USER_AGENT,
-                )
-                logger.info("Reddit client initialised")
-            except Exception as exc:
-                logger.warning(f"Reddit init failed: {exc}")
-
-        # YouTube
+            logger.info("Reddit credentials found")
         if config.YOUTUBE_CLIENT_ID:
-            try:
-                # YouTube Data API uses API key, not OAuth for search
-                # We use a service-account-style key here
-                self._youtube = build(
-                    "youtube", "v3",
-                    developerKey=config.YOUTUBE_CLIENT_ID,
-                    cache_discovery=False,
-                )
-                logger.info("YouTube client initialised")
-            except Exception as exc:
-                logger.warning(f"YouTube init failed: {exc}")
-
-        # NewsAPI
+            # YouTube Data API search uses an API key, not OAuth
+            logger.info("YouTube API key found")
         if config.NEWS_API_KEY:
-            try:
-                self._news = NewsApiClient(api_key=config.NEWS_API_KEY)
-                logger.info("NewsAPI client initialised")
-            except Exception as exc:
-                logger.warning(f"NewsAPI init failed: {exc}")
+            logger.info("NewsAPI key found")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared aiohttp session, creating it on first use.
+        limit_per_host keeps at most 5 requests in flight per API.
+        """
+        if self._asession is None or self._asession.closed:
+            self._asession = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20, limit_per_host=5, ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(total=20),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._asession
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session (call once the pipeline is done)."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self._asession is not None and not self._asession.closed:
+            await self._asession.close()
+        self._asession = None
 
     # ── Public API ───────────────────────────────────────────────────────────
 
@@ -80,14 +118,15 @@ class TrendDiscoveryAgent:
         """
         logger.info(f"🔍 Discovering trends for {self.location['name']} …")
 
-        # Run blocking calls in thread pool to keep async
-        loop = asyncio.get_event_loop()
+        # Google Trends, Reddit, YouTube and NewsAPI are native coroutines on
+        # one shared session; DuckDuckGo searches run in worker threads
+        keywords, name = self.location["keywords"], self.location["name"]
         tasks = [
-            loop.run_in_executor(None, self.get_google_trends, self.location["keywords"]),
-            loop.run_in_executor(None, self.get_reddit_trends),
-            loop.run_in_executor(None, self.get_youtube_trends, self.location["name"]),
-            loop.run_in_executor(None, self.get_news_trends, self.location["name"]),
-            loop.run_in_executor(None, self.get_duckduckgo_trends, self.location["name"]),
+            self._cached("google", keywords, lambda: self.get_google_trends(keywords)),
+            self._cached("reddit", name, self.get_reddit_trends),
+            self._cached("youtube", name, lambda: self.get_youtube_trends(name)),
+            self._cached("news", name, lambda: self.get_news_trends(name)),
+            self._cached("duckduckgo", name, lambda: self.get_duckduckgo_trends(name)),
         ]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -107,14 +146,61 @@ class TrendDiscoveryAgent:
         logger.info(f"✅ Trend discovery complete. Top topic: {all_trends['ranked'][0]['topic'] if all_trends['ranked'] else 'N/A'}")
         return all_trends
 
+    async def _cached(
+        self,
+        source: str,
+        args: Any,
+        fetch: Callable[[], Awaitable[list[dict]]],
+    ) -> list[dict]:
+        """
+        Serve *source* results for *args* from the on-disk cache.
+
+        Fresh entries (younger than CACHE_TTL[source]) are returned directly.
+        Entries up to CACHE_STALE seconds older are returned too, while a
+        background task refreshes them; anything older is fetched now.
+        Empty results (the sources' error value) are never cached, and
+        concurrent misses for the same key share a single fetch.
+        """
+        if isinstance(args, str):
+            args = args.strip().casefold()   # "Paris " and "paris" are one query
+        key = self._cache.key(source, {"args": args})
+        entry = self._cache.get(key)
+        age = time.time() - entry["fetched"] if entry else float("inf")
+        ttl = self.CACHE_TTL[source]
+
+        if age < ttl:
+            return entry["data"]
+        task = self._refreshing.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, fetch))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        if age < ttl + self.CACHE_STALE:
+            return entry["data"]
+        # Shielded so one cancelled caller doesn't abort the shared fetch
+        return await asyncio.shield(task)
+
+    async def _refresh(
+        self, key: str, fetch: Callable[[], Awaitable[list[dict]]]
+    ) -> list[dict]:
+        """Fetch fresh results and store them under *key* if non-empty."""
+        data = await fetch()
+        if data:
+            self._cache.put(key, data)
+        return data
+
     def get_best_topic(self, trends: dict) -> str:
         """Return the single best trending topic string."""
         ranked = trends.get("ranked", [])
         return ranked[0]["topic"] if ranked else self.location["keywords"][0]
 
+    def _bucket(self, realm: str) -> TokenBucket:
+        """Shared token bucket throttling requests to *realm*."""
+        return get_bucket(realm, *self.RATE_LIMITS[realm])
+
     # ── Google Trends ─────────────────────────────────────────────────────────
 
-    def get_google_trends(
+    async def get_google_trends(
         self,
         keywords: list[str],
         timeframe: str = "now 7-d",
@@ -122,9 +208,12 @@ class TrendDiscoveryAgent:
         """
         Fetch Google Trends interest + rising queries for location keywords.
 
+        Talks to the Trends JSON endpoints directly (the ones pytrends
+        wraps), without building pandas DataFrames for a handful of values.
+
         Args:
-            keywords:  Keywords to analyse (uses first 5; pytrends limit).
-            timeframe: pytrends timeframe string.
+            keywords:  Keywords to analyse (uses first 5; Google Trends limit).
+            timeframe: Google Trends timeframe string.
 
         Returns:
             List of dicts with keys 'topic' and 'score'.
@@ -132,38 +221,90 @@ class TrendDiscoveryAgent:
         results: list[dict] = []
         try:
             kw_list = keywords[:5]
-            self.pytrends.build_payload(kw_list, timeframe=timeframe, geo="")
-            time.sleep(1)  # Respect rate limit
-
-            # Interest over time
-            iot = self.pytrends.interest_over_time()
-            if not iot.empty:
-                for kw in kw_list:
-                    if kw in iot.columns:
-                        score = int(iot[kw].mean())
-                        results.append({"topic": kw, "score": score, "source": "google_trends"})
-
-            time.sleep(1)
-            # Related queries – rising
-            related = self.pytrends.related_queries()
+            widgets = (await self._trends_api("explore", {
+                "hl": "en-US",
+                "tz": 360,
+                "req": json.dumps({
+                    "comparisonItem": [
+                        {"keyword": kw, "time": timeframe, "geo": ""} for kw in kw_list
+                    ],
+                    "category": 0,
+                    "property": "",
+                }),
+            }, method="POST"))["widgets"]
+
+            # Interest over time: mean of each keyword's series
+            timeseries = next(w for w in widgets if w["id"] == "TIMESERIES")
+            rows = (await self._trends_widget("multiline", timeseries))["default"]["timelineData"]
+            if rows:
+                for i, kw in enumerate(kw_list):
+                    score = int(sum(row["value"][i] for row in rows) / len(rows))
+                    results.append({"topic": kw, "score": score, "source": "google_trends"})
+
+            # Related queries – rising (one widget per keyword)
+            related_widgets = [w for w in widgets if "RELATED_QUERIES" in w["id"]]
+            related = await asyncio.gather(
+                *(self._trends_widget("relatedsearches", w) for w in related_widgets)
+            )
+            rising: dict[str, list[dict]] = {}
+            for widget, data in zip(related_widgets, related):
+                try:
+                    kw = widget["request"]["restriction"][
+                        "complexKeywordsRestriction"]["keyword"][0]["value"]
+                except KeyError:
+                    kw = ""
+                ranked = data["default"]["rankedList"]
+                rising[kw] = ranked[1]["rankedKeyword"] if len(ranked) > 1 else []
             for kw in kw_list:
-                rising = related.get(kw, {}).get("rising")
-                if rising is not None and not rising.empty:
-                    for _, row in rising.head(3).iterrows():
-                        results.append({
-                            "topic": row["query"],
-                            "score": int(row.get("value", 50)),
-                            "source": "google_rising",
-                        })
+                for row in rising.get(kw, [])[:3]:
+                    results.append({
+                        "topic": row["query"],
+                        "score": int(row.get("value", 50)),
+                        "source": "google_rising",
+                    })
             logger.info(f"Google Trends: {len(results)} topics found")
         except Exception as exc:
             logger.warning(f"Google Trends error: {exc}")
 
         return results
 
+    async def _trends_widget(self, endpoint: str, widget: dict) -> dict:
+        """Fetch the data behind an explore *widget* from widgetdata/*endpoint*."""
+        return await self._trends_api(f"widgetdata/{endpoint}", {
+            "req": json.dumps(widget["request"]),
+            "token": widget["token"],
+            "tz": 360,
+        })
+
+    async def _trends_api(self, path: str, params: dict, method: str = "GET") -> dict:
+        """
+        Call a Google Trends API endpoint and decode its JSON body.
+        Every HTTP request, including the one-time cookie fetch, takes a
+        token from the google_trends bucket first.
+        """
+        session = self._get_session()
+        headers = {"Accept-Language": "en-US"}
+        bucket = self._bucket("google_trends")
+        if not self._trends_cookie:
+            await bucket.acquire_async()
+            async with session.get(
+                f"{self.GOOGLE_TRENDS_URL}/explore/", params={"geo": "US"}, headers=headers,
+            ) as resp:
+                await resp.read()   # only the NID cookie in the session's jar matters
+            self._trends_cookie = True
+        await bucket.acquire_async()
+        async with session.request(
+            method, f"{self.GOOGLE_TRENDS_URL}/api/{path}", params=params, headers=headers,
+        ) as resp:
+            resp.raise_for_status()
+            text = await resp.text()
+        # Bodies start with an anti-XSSI prefix such as ")]}'," before the JSON
+        body = text[text.index("{"):]
+        return _loads(body)
+
     # ── Reddit ────────────────────────────────────────────────────────────────
 
-    def get_reddit_trends(
+    async def get_reddit_trends(
         self,
         subreddits: list[str] | None = None,
     ) -> list[dict]:
@@ -176,35 +317,78 @@ class TrendDiscoveryAgent:
         Returns:
             List of topic dicts.
         """
-        if not self._reddit:
+        if not (config.REDDIT_CLIENT_ID and config.REDDIT_CLIENT_SECRET):
             logger.warning("Reddit client not available; skipping")
             return []
 
         subreddits = subreddits or ["travel", "solotravel", "backpacking", "tourism"]
+        try:
+            token = await self._get_reddit_token()
+        except Exception as exc:
+            logger.warning(f"Reddit auth failed: {exc}")
+            return []
+
+        posts = await asyncio.gather(
+            *(self._reddit_hot(token, sub_name) for sub_name in subreddits)
+        )
+
         results: list[dict] = []
         location_name = self.location["name"].lower()
-
-        for sub_name in subreddits:
-            try:
-                sub = self._reddit.subreddit(sub_name)
-                for post in sub.hot(limit=10):
-                    title_lower = post.title.lower()
-                    if location_name in title_lower or self.location["country"].lower() in title_lower:
-                        results.append({
-                            "topic": post.title,
-                            "score": post.score,
-                            "source": f"reddit/{sub_name}",
-                        })
-                time.sleep(0.5)
-            except Exception as exc:
-                logger.warning(f"Reddit r/{sub_name} error: {exc}")
+        country = self.location["country"].lower()
+        for sub_name, sub_posts in zip(subreddits, posts):
+            for post in sub_posts:
+                title_lower = post["title"].lower()
+                if location_name in title_lower or country in title_lower:
+                    results.append({
+                        "topic": post["title"],
+                        "score": post["score"],
+                        "source": f"reddit/{sub_name}",
+                    })
 
         logger.info(f"Reddit: {len(results)} relevant posts found")
         return results
 
+    async def _reddit_hot(self, token: str, sub_name: str) -> list[dict]:
+        """Title and score of the 10 hot posts of r/*sub_name* (empty on error)."""
+        try:
+            await self._bucket("reddit").acquire_async()
+            async with self._get_session().get(
+                f"{self.REDDIT_API_URL}/r/{sub_name}/hot",
+                params={"limit": 10},
+                headers={
+                    "Authorization": f"bearer {token}",
+                    "User-Agent": config.REDDIT_USER_AGENT,
+                },
+            ) as resp:
+                resp.raise_for_status()
+                data = await resp.json(loads=_loads)
+            return [
+                {"title": child["data"]["title"], "score": child["data"]["score"]}
+                for child in data["data"]["children"]
+            ]
+        except Exception as exc:
+            logger.warning(f"Reddit r/{sub_name} error: {exc}")
+            return []
+
+    async def _get_reddit_token(self) -> str:
+        """Application-only OAuth token, cached until shortly before expiry."""
+        if self._reddit_token and time.time() < self._reddit_token[1]:
+            return self._reddit_token[0]
+        await self._bucket("reddit").acquire_async()
+        async with self._get_session().post(
+            self.REDDIT_TOKEN_URL,
+            data={"grant_type": "client_credentials"},
+            auth=aiohttp.BasicAuth(config.REDDIT_CLIENT_ID, config.REDDIT_CLIENT_SECRET),
+            headers={"User-Agent": config.REDDIT_USER_AGENT},
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json(loads=_loads)
+        self._reddit_token = (data["access_token"], time.time() + data.get("expires_in", 3600) - 60)
+        return self._reddit_token[0]
+
     # ── YouTube ───────────────────────────────────────────────────────────────
 
-    def get_youtube_trends(self, location_keyword: str) -> list[dict]:
+    async def get_youtube_trends(self, location_keyword: str) -> list[dict]:
         """
         Search YouTube for recent travel videos about the location.
 
@@ -214,25 +398,29 @@ class TrendDiscoveryAgent:
         Returns:
             List of topic dicts derived from top video titles.
         """
-        if not self._youtube:
+        if not config.YOUTUBE_CLIENT_ID:
             logger.warning("YouTube client not available; using DuckDuckGo fallback")
-            return self._youtube_via_ddg(location_keyword)
+            return await self._youtube_via_ddg(location_keyword)
 
         results: list[dict] = []
         try:
-            response = (
-                self._youtube.search()
-                .list(
-                    q=f"{location_keyword} travel guide",
-                    part="snippet",
-                    type="video",
-                    order="viewCount",
-                    publishedAfter="2024-01-01T00:00:00Z",
-                    maxResults=10,
-                    videoDuration="medium",
-                )
-                .execute()
-            )
+            async with self._get_session().get(
+                self.YOUTUBE_SEARCH_URL,
+                params={
+                    "key": config.YOUTUBE_CLIENT_ID,
+                    "q": f"{location_keyword} travel guide",
+                    "part": "snippet",
+                    # Partial response: only the fields read below
+                    "fields": "items(id/videoId,snippet/title)",
+                    "type": "video",
+                    "order": "viewCount",
+                    "publishedAfter": "2024-01-01T00:00:00Z",
+                    "maxResults": 10,
+                    "videoDuration": "medium",
+                },
+            ) as resp:
+                resp.raise_for_status()
+                response = await resp.json(loads=_loads)
             for item in response.get("items", []):
                 title = item["snippet"]["title"]
                 results.append({
@@ -244,24 +432,26 @@ class TrendDiscoveryAgent:
             logger.info(f"YouTube: {len(results)} videos found")
         except Exception as exc:
             logger.warning(f"YouTube API error: {exc}")
-            results = self._youtube_via_ddg(location_keyword)
+            results = await self._youtube_via_ddg(location_keyword)
 
         return results
 
-    def _youtube_via_ddg(self, query: str) -> list[dict]:
+    async def _youtube_via_ddg(self, query: str) -> list[dict]:
         """Fallback: scrape YouTube search results via DuckDuckGo."""
         results: list[dict] = []
         try:
-            with DDGS() as ddgs:
-                for r in ddgs.text(f"site:youtube.com {query} travel", max_results=5):
-                    results.append({"topic": r["title"], "score": 60, "source": "ddg_yt"})
+            hits = await asyncio.to_thread(
+                self._ddg_text, f"site:youtube.com {query} travel", 5,
+            )
+            for r in hits:
+                results.append({"topic": r["title"], "score": 60, "source": "ddg_yt"})
         except Exception as exc:
             logger.warning(f"DuckDuckGo YouTube fallback error: {exc}")
         return results
 
     # ── News ──────────────────────────────────────────────────────────────────
 
-    def get_news_trends(self, location_keyword: str) -> list[dict]:
+    async def get_news_trends(self, location_keyword: str) -> list[dict]:
         """
         Fetch recent travel news about the location from NewsAPI.
 
@@ -271,18 +461,24 @@ class TrendDiscoveryAgent:
         Returns:
             List of topic dicts.
         """
-        if not self._news:
+        if not config.NEWS_API_KEY:
             logger.warning("NewsAPI client not available; skipping")
             return []
 
         results: list[dict] = []
         try:
-            articles = self._news.get_everything(
-                q=f"{location_keyword} travel tourism",
-                language="en",
-                sort_by="publishedAt",
-                page_size=20,
-            )
+            async with self._get_session().get(
+                self.NEWS_API_URL,
+                params={
+                    "q": f"{location_keyword} travel tourism",
+                    "language": "en",
+                    "sortBy": "publishedAt",
+                    "pageSize": 20,
+                },
+                headers={"X-Api-Key": config.NEWS_API_KEY},
+            ) as resp:
+                resp.raise_for_status()
+                articles = await resp.json(loads=_loads)
             for article in articles.get("articles", []):
                 results.append({
                     "topic": article["title"],
@@ -297,7 +493,7 @@ class TrendDiscoveryAgent:
 
     # ── DuckDuckGo ────────────────────────────────────────────────────────────
 
-    def get_duckduckgo_trends(self, location_keyword: str) -> list[dict]:
+    async def get_duckduckgo_trends(self, location_keyword: str) -> list[dict]:
         """
         Search DuckDuckGo for trending travel content about the location.
 
@@ -313,21 +509,32 @@ class TrendDiscoveryAgent:
             f"best things to do {location_keyword}",
             f"{location_keyword} hidden gems",
         ]
-        try:
-            with DDGS() as ddgs:
-                for q in queries:
-                    for r in ddgs.text(q, max_results=5):
-                        results.append({
-                            "topic": r["title"],
-                            "score": 55,
-                            "source": "duckduckgo",
-                        })
-                    time.sleep(0.3)
-            logger.info(f"DuckDuckGo: {len(results)} results found")
-        except Exception as exc:
-            logger.warning(f"DuckDuckGo error: {exc}")
+        # duckduckgo_search is synchronous; run the queries side by side in
+        # worker threads rather than one after another
+        hits = await asyncio.gather(
+            *(asyncio.to_thread(self._ddg_text, q, 5) for q in queries),
+            return_exceptions=True,
+        )
+        for q, batch in zip(queries, hits):
+            if isinstance(batch, Exception):
+                logger.warning(f"DuckDuckGo error for '{q}': {batch}")
+                continue
+            for r in batch:
+                results.append({
+                    "topic": r["title"],
+                    "score": 55,
+                    "source": "duckduckgo",
+                })
+        logger.info(f"DuckDuckGo: {len(results)} results found")
         return results
 
+    def _ddg_text(self, query: str, max_results: int) -> list[dict]:
+        """One blocking DuckDuckGo text search."""
+        from duckduckgo_search import DDGS   # deferred: only this source needs it
+        self._bucket("ddg").acquire()
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+
     # ── Analysis & Ranking ────────────────────────────────────────────────────
 
     def analyze_and_rank_trends(self, all_trends: dict) -> list[dict]:
@@ -351,43 +558,33 @@ class TrendDiscoveryAgent:
             logger.warning("No trends found; using default location keywords")
             return [{"topic": kw, "score": 50} for kw in self.location["keywords"][:3]]
 
-        # Count keyword frequency across titles
-        word_counter: Counter = Counter()
+        # One pass: accumulate raw scores per topic, count keyword frequency
+        # across titles, and keep the first item seen for each topic
+        words: list[str] = []
         topic_scores: dict[str, int] = {}
+        firsts: dict[str, dict] = {}
         for item in flat:
             topic = item.get("topic", "")
-            score = item.get("score", 50)
-            # Accumulate raw scores
-            key = topic.lower()[:80]
-            topic_scores[key] = topic_scores.get(key, 0) + score
-            for word in topic.lower().split():
-                if len(word) > 4:
-                    word_counter[word] += 1
-
-        # Add frequency bonus
-        ranked_items = []
-        for item in flat:
-            key = item.get("topic", "").lower()[:80]
-            base_score = topic_scores.get(key, 50)
-            # Bonus: how many of the topic's words are trending
-            freq_bonus = sum(word_counter.get(w, 0) for w in key.split() if len(w) > 4)
-            final_score = base_score + freq_bonus
-            ranked_items.append({
+            lowered = topic.lower()
+            key = lowered[:80]
+            topic_scores[key] = topic_scores.get(key, 0) + item.get("score", 50)
+            words += _WORD_RE.findall(lowered)
+            firsts.setdefault(key, item)
+        word_counter = Counter(words)   # one C-level counting pass
+
+        # Add frequency bonus: how many of the topic's words are trending.
+        # Every item sharing a key scores the same, so rank one per key
+        ranked_items = [
+            {
                 "topic": item.get("topic", ""),
-                "score": final_score,
+                "score": topic_scores[key] + sum(
+                    map(word_counter.__getitem__, _WORD_RE.findall(key))
+                ),
                 "source": item.get("source", "unknown"),
-            })
-
-        # Deduplicate and sort
-        seen_topics: set[str] = set()
-        unique_ranked: list[dict] = []
-        for item in sorted(ranked_items, key=lambda x: x["score"], reverse=True):
-            key = item["topic"].lower()[:80]
-            if key not in seen_topics:
-                seen_topics.add(key)
-                unique_ranked.append(item)
-            if len(unique_ranked) >= 3:
-                break
+            }
+            for key, item in firsts.items()
+        ]
+        unique_ranked = heapq.nlargest(3, ranked_items, key=itemgetter("score"))
 
         logger.info(f"Top trend: '{unique_ranked[0]['topic']}' (score {unique_ranked[0]['score']})")
         return unique_ranked
@@ -409,11 +606,7 @@ class TrendDiscoveryAgent:
         # Generate extra tags from top trend keywords
         trend_tags: list[str] = []
         for item in trends[:3]:
-            words = item["topic"].split()
-            for word in words:
-                clean = word.strip(".,!?\"'").replace(" ", "")
-                if len(clean) > 3:
-                    trend_tags.append(f"#{clean.capitalize()}")
+            trend_tags.extend(f"#{w.capitalize()}" for w in _TAG_RE.findall(item["topic"]))
 
         all_tags = list(dict.fromkeys(base_tags + trend_tags))  # deduplicate
 
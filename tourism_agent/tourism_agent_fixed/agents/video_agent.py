@@ -5,12 +5,17 @@ Applies Ken Burns effect, crossfade transitions, animated text overlays,
 colour grading, intro/outro animations, and watermark.
 """
 
+import bisect
 import random
+import tempfile
+import functools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
-from PIL import Image, ImageEnhance
+from PIL import Image
 from tqdm import tqdm
 
 # moviepy imports (graceful fallback so the rest of the code can be imported)
@@ -18,8 +23,9 @@ try:
     from moviepy.editor import (
         ImageClip, ColorClip, CompositeVideoClip,
         concatenate_videoclips, AudioFileClip,
-        TextClip, VideoFileClip, VideoClip,
+        TextClip, VideoClip,
     )
+    from moviepy.config import get_setting
     try:
         from moviepy.video.fx.fadein  import fadein
         from moviepy.video.fx.fadeout import fadeout
@@ -40,6 +46,177 @@ N_IMG  = config.VIDEO_CONFIG["images_per_video"]   # 12
 PER_IMG = TOTAL / N_IMG                             # 5 s per image
 
 
+# ── Colour grading ───────────────────────────────────────────────────────────
+
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+_LEVELS = np.arange(256, dtype=np.float32)
+_WARMTH = (1.03, 1.0, 0.97)   # warm tint: boost R slightly, reduce B slightly
+
+
+def _grade_frame(frame: np.ndarray) -> np.ndarray:
+    """
+    Saturation ×1.2, contrast ×1.05 and a warm tint in one pass per channel.
+
+    Saturation is blended against luma in float32, one channel at a time;
+    contrast (around the frame's mean luma, as ImageEnhance does) and tint
+    are folded into a 256-entry lookup table per channel.
+    """
+    luma = frame.astype(np.float32) @ _LUMA
+    mean = float(luma.mean())
+    contrast = np.clip((_LEVELS - mean) * 1.05 + mean, 0, 255)
+    luma *= -0.2
+
+    out = np.empty_like(frame)
+    chan = np.empty(luma.shape, dtype=np.float32)
+    for c, warmth in enumerate(_WARMTH):
+        lut = np.clip(contrast * warmth, 0, 255).astype(np.uint8)
+        # 1.2·c − 0.2·luma  ==  luma + (c − luma)·1.2
+        np.multiply(frame[..., c], np.float32(1.2), out=chan)
+        chan += luma
+        np.clip(chan, 0, 255, out=chan)
+        out[..., c] = np.take(lut, chan.astype(np.uint8))
+    return out
+
+
+# ── Ken Burns ────────────────────────────────────────────────────────────────
+
+KB_MAX_SCALE = 1.1   # largest zoom applied by the Ken Burns effect
+
+
+def _ken_burns_path() -> tuple[float, float, float, float]:
+    """
+    Random (scale_start, scale_end, pan_x, pan_y) for one photo: zoom in
+    or out between 1.0 and KB_MAX_SCALE with a slight drift.
+    """
+    zoom_in = random.choice([True, False])
+    scale_start = 1.0 if zoom_in else KB_MAX_SCALE
+    scale_end   = KB_MAX_SCALE if zoom_in else 1.0
+    return scale_start, scale_end, random.uniform(-0.03, 0.03), random.uniform(-0.03, 0.03)
+
+
+def _load_ken_burns_base(image_path: Path) -> Image.Image:
+    """Decode a photo and resample it once to the size at full zoom."""
+    with Image.open(image_path) as src:
+        return src.convert("RGB").resize(
+            (int(W * KB_MAX_SCALE), int(H * KB_MAX_SCALE)), Image.LANCZOS
+        )
+
+
+def _grade_filter() -> str:
+    """
+    The same grade as an ffmpeg filter chain: the saturation blend as a
+    colour matrix, contrast and tint as per-channel curves. ffmpeg has no
+    per-frame mean, so contrast pivots on mid-grey rather than mean luma.
+    """
+    names = "rgb"
+    mix = ":".join(
+        f"{o}{i}={(1.2 if o == i else 0.0) - 0.2 * float(_LUMA[j]):.4f}"
+        for o in names for j, i in enumerate(names)
+    )
+    curves = ":".join(
+        f"{c}='clip(clip((val-128)*1.05+128,0,255)*{warmth},0,255)'"
+        for c, warmth in zip(names, _WARMTH)
+    )
+    return f"format=rgb24,colorchannelmixer={mix},lutrgb={curves}"
+
+
+# ── Text rendering ───────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=256)
+def _render_text(text: str, **style) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """Rasterise *text* with ImageMagick once per distinct (text, style)."""
+    clip = TextClip(text, **style)
+    return clip.img, (clip.mask.img if clip.mask is not None else None)
+
+
+def _text_clip(text: str, **style):
+    """
+    Drop-in for TextClip(text, **style) backed by the render cache.
+
+    The hook, captions, CTA, follow line and watermark repeat from video
+    to video, and each TextClip is an ImageMagick subprocess.
+    """
+    img, mask = _render_text(text, **style)
+    clip = ImageClip(img)
+    return clip.set_mask(ImageClip(mask, ismask=True)) if mask is not None else clip
+
+
+# ── Encoding ─────────────────────────────────────────────────────────────────
+
+# (codec, ffmpeg input options, filter suffix uploading frames to the GPU)
+_HW_ENCODERS = (
+    ("h264_nvenc", (), ""),
+    ("h264_vaapi", ("-vaapi_device", "/dev/dri/renderD128"), ",format=nv12,hwupload"),
+)
+
+
+@functools.cache
+def _pick_encoder(ffmpeg: str) -> tuple[str, tuple[str, ...], str]:
+    """
+    Choose the H.264 encoder per config.VIDEO_ENCODER.
+
+    An encoder listed by ffmpeg may still lack a usable GPU/driver, so each
+    candidate must encode a short test pattern before it is chosen.
+    """
+    wanted = config.VIDEO_ENCODER
+    for codec, hw_args, upload in _HW_ENCODERS:
+        if wanted not in ("auto", codec):
+            continue
+        probe = [
+            ffmpeg, "-loglevel", "error", *hw_args,
+            "-f", "lavfi", "-i", "color=size=256x256:duration=0.2",
+            "-vf", f"null{upload}", "-c:v", codec, "-f", "null", "-",
+        ]
+        try:
+            ok = subprocess.run(probe, capture_output=True, timeout=20).returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            ok = False
+        if ok:
+            logger.info(f"Hardware video encoder: {codec}")
+            return codec, hw_args, upload
+        if wanted == codec:
+            logger.warning(f"{codec} unavailable; falling back to libx264")
+    return "libx264", (), ""
+
+
+def _fan_out(
+    src: str,
+    size: tuple[int, int],
+    outputs: list[tuple[Path, str, str, float]],
+    codec: str,
+    upload: str,
+    audio: Optional[tuple[str, str]] = None,
+) -> tuple[list[str], list[str]]:
+    """
+    Filter-graph lines and output options encoding stream *src* to every
+    (path, bitrate, x264 preset, scale) output, with *audio* given as
+    (stream specifier, audio codec) when there is a soundtrack.
+    """
+    w, h = size
+    graph = [f"[{src}]split={len(outputs)}" + "".join(f"[v{i}]" for i in range(len(outputs)))]
+    args: list[str] = []
+    for i, (path, bitrate, preset, scale) in enumerate(outputs):
+        resize = f"scale={int(w * scale) // 2 * 2}:{int(h * scale) // 2 * 2}"
+        graph.append(f"[v{i}]{resize if scale != 1 else 'null'}{upload}[o{i}]")
+        args += ["-map", f"[o{i}]"]
+        if audio is not None:
+            args += ["-map", audio[0], "-c:a", audio[1]]
+        args += ["-c:v", codec, *_preset_args(codec, preset), "-b:v", bitrate]
+        if not upload:
+            args += ["-pix_fmt", "yuv420p"]
+        args.append(str(path))
+    return graph, args
+
+
+def _preset_args(codec: str, preset: str) -> list[str]:
+    """Encoder speed options; *preset* is the libx264 preset name."""
+    if codec == "libx264":
+        return ["-preset", preset]
+    if codec == "h264_nvenc":
+        return ["-preset", "p1" if preset == "ultrafast" else "p4"]
+    return []
+
+
 class VideoCreatorAgent:
     """Creates fully produced travel videos from a list of images."""
 
@@ -66,7 +243,7 @@ class VideoCreatorAgent:
             transitions: Currently only 'fade' is supported.
 
         Returns:
-            moviepy CompositeVideoClip or None if moviepy unavailable.
+            moviepy VideoClip or None if moviepy unavailable.
         """
         if not MOVIEPY_AVAILABLE:
             logger.error("moviepy unavailable; cannot create slideshow")
@@ -78,20 +255,38 @@ class VideoCreatorAgent:
         clips = []
         td = config.VIDEO_CONFIG["transition_duration"]
 
-        for i, (img_path, dur) in enumerate(
-            tqdm(zip(images, durations), total=len(images), desc="Building slideshow")
-        ):
-            clip = self._make_ken_burns_clip(img_path, dur)
-            clip = self._apply_colour_grade(clip)
+        # Decode and LANCZOS-resample every photo up front, in parallel;
+        # Pillow releases the GIL for both, so threads use all cores
+        with ThreadPoolExecutor() as pool:
+            bases = pool.map(_load_ken_burns_base, images)
+            for base, dur in tqdm(
+                zip(bases, durations), total=len(images), desc="Building slideshow"
+            ):
+                clip = self._make_ken_burns_clip(base, dur)
+                clips.append(self._apply_colour_grade(clip))
+
+        # Clip i starts td seconds before clip i-1 ends and fades in over it.
+        # Blending the two overlapping frames here avoids moviepy's generic
+        # compositor, which evaluates and masks every layer per frame
+        starts = [0.0]
+        for dur in durations[:len(clips) - 1]:
+            starts.append(starts[-1] + dur - td)
+        # concatenate_videoclips(padding=-td) also cut td off the last clip;
+        # keep that length so audio and overlay timings are unchanged
+        total = starts[-1] + durations[len(clips) - 1] - td
 
-            # Crossfade: all clips except the first fade in
-            if i > 0:
-                clip = clip.crossfadein(td)
-
-            clips.append(clip)
-
-        # Concatenate with crossfade overlap
-        video = concatenate_videoclips(clips, method="compose", padding=-td)
+        def make_frame(t):
+            """Return the slideshow frame at *t*, crossfading at each seam."""
+            i = max(0, bisect.bisect_right(starts, t) - 1)
+            u = min(t - starts[i], durations[i])
+            frame = clips[i].get_frame(u)
+            if i == 0 or u >= td:
+                return frame
+            alpha = u / td
+            prev = clips[i - 1].get_frame(t - starts[i - 1])
+            return (frame * alpha + prev * (1 - alpha)).astype(np.uint8)
+
+        video = VideoClip(make_frame, duration=total).set_fps(FPS)
         logger.info(f"Slideshow built: {video.duration:.1f}s, {len(clips)} clips")
         return video
 
@@ -116,8 +311,8 @@ class VideoCreatorAgent:
         # Hook overlay – first 3 seconds, large and centred
         if hook_text:
             hook_clip = (
-                TextClip(hook_text, fontsize=56, color="white", font="DejaVu-Sans-Bold",
-                         method="caption", size=(W - 80, None), align="center")
+                _text_clip(hook_text, fontsize=56, color="white", font="DejaVu-Sans-Bold",
+                           method="caption", size=(W - 80, None), align="center")
                 .set_start(0)
                 .set_duration(3)
                 .set_position("center")
@@ -130,9 +325,9 @@ class VideoCreatorAgent:
         for i, text in enumerate(texts[:N_IMG]):
             start = i * PER_IMG
             txt_clip = (
-                TextClip(text, fontsize=44, color="white", font="DejaVu-Sans",
-                         method="caption", size=(W - 80, None), align="center",
-                         stroke_color="black", stroke_width=2)
+                _text_clip(text, fontsize=44, color="white", font="DejaVu-Sans",
+                           method="caption", size=(W - 80, None), align="center",
+                           stroke_color="black", stroke_width=2)
                 .set_start(start + 0.3)
                 .set_duration(PER_IMG - 0.6)
                 .set_position(("center", H - 220))
@@ -141,32 +336,24 @@ class VideoCreatorAgent:
             )
             overlays.append(txt_clip)
 
-        # Progress bar (thin white line at very bottom)
-        def make_progress_bar(t):
-            """Dynamically draw progress bar frame."""
-            progress = t / video_clip.duration
-            bar_w = int(W * progress)
-            frame = np.zeros((8, W, 4), dtype=np.uint8)
-            frame[:, :bar_w, :] = [255, 255, 255, 180]
-            return frame
+        # Progress bar (thin white line at very bottom): one layer whose mask
+        # grows with t, rather than a separate ColorClip for every second
+        duration = video_clip.duration
+        bar_rgb = np.full((6, W, 3), 255, dtype=np.uint8)
+
+        def bar_mask(t):
+            """70% opaque up to the current progress, transparent after it."""
+            mask = np.zeros((6, W))
+            mask[:, :max(1, int(W * t / duration))] = 0.7
+            return mask
 
         bar_clip = (
-            VideoFileClip.__new__(VideoFileClip)  # placeholder
+            VideoClip(lambda t: bar_rgb, duration=duration)
+            .set_mask(VideoClip(bar_mask, ismask=True, duration=duration))
+            .set_position((0, H - 10))
         )
-        # Use a colour clip as a simpler progress bar
-        bar_clips = []
-        for second in range(int(video_clip.duration)):
-            bar_w = max(1, int(W * second / video_clip.duration))
-            bar = (
-                ColorClip(size=(bar_w, 6), color=[255, 255, 255])
-                .set_opacity(0.7)
-                .set_start(second)
-                .set_duration(1)
-                .set_position((0, H - 10))
-            )
-            bar_clips.append(bar)
 
-        all_overlays = [video_clip] + overlays + bar_clips
+        all_overlays = [video_clip] + overlays + [bar_clip]
         return CompositeVideoClip(all_overlays, size=(W, H))
 
     def add_intro_animation(self, video_clip, location_name: str):
@@ -186,8 +373,8 @@ class VideoCreatorAgent:
 
         bg = ColorClip(size=(W, H), color=[0, 0, 0]).set_duration(2)
         title = (
-            TextClip(location_name.upper(), fontsize=80, color="#FFD700",
-                     font="DejaVu-Sans-Bold", method="label")
+            _text_clip(location_name.upper(), fontsize=80, color="#FFD700",
+                       font="DejaVu-Sans-Bold", method="label")
             .set_position("center")
             .set_duration(2)
             .crossfadein(0.5)
@@ -213,15 +400,15 @@ class VideoCreatorAgent:
 
         bg = ColorClip(size=(W, H), color=[10, 10, 10]).set_duration(3)
         cta = (
-            TextClip(call_to_action, fontsize=52, color="white",
-                     font="DejaVu-Sans-Bold", method="caption", size=(W - 100, None))
+            _text_clip(call_to_action, fontsize=52, color="white",
+                       font="DejaVu-Sans-Bold", method="caption", size=(W - 100, None))
             .set_position("center")
             .set_duration(3)
             .crossfadein(0.4)
         )
         follow = (
-            TextClip("👆 Follow for more travel content!", fontsize=36, color="#FFD700",
-                     font="DejaVu-Sans", method="caption", size=(W - 100, None))
+            _text_clip("👆 Follow for more travel content!", fontsize=36, color="#FFD700",
+                       font="DejaVu-Sans", method="caption", size=(W - 100, None))
             .set_position(("center", H // 2 + 80))
             .set_duration(3)
             .crossfadein(0.6)
@@ -246,8 +433,8 @@ class VideoCreatorAgent:
             return video_clip
 
         watermark = (
-            TextClip(f"© {channel_name}", fontsize=28, color="white",
-                     font="DejaVu-Sans", method="label")
+            _text_clip(f"© {channel_name}", fontsize=28, color="white",
+                       font="DejaVu-Sans", method="label")
             .set_opacity(0.5)
             .set_duration(video_clip.duration)
             .set_position((W - 200, 20))
@@ -284,69 +471,259 @@ class VideoCreatorAgent:
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # (bitrate, libx264 preset, scale) per quality; "high" also writes a
+        # half-size preview from the same rendered frames
         settings = {
-            "high": dict(codec="libx264", audio_codec="aac",
-                         fps=FPS, bitrate="4000k", preset="medium"),
-            "preview": dict(codec="libx264", audio_codec="aac",
-                            fps=FPS, bitrate="1000k", preset="ultrafast"),
+            "high":    ("4000k", "medium", 1.0),
+            "preview": ("1000k", "ultrafast", 1.0),
         }
-        params = settings.get(quality, settings["high"])
+        outputs = [(output_path, *settings.get(quality, settings["high"]))]
+        if quality == "high":
+            preview_path = output_path.with_name(output_path.stem + "_preview.mp4")
+            outputs.append((preview_path, "1000k", "ultrafast", 0.5))
 
         logger.info(f"Exporting video ({quality}) → {output_path.name}")
-        final_clip.write_videofile(
-            str(output_path),
-            **params,
-            logger=None,          # suppress moviepy's own progress output
-            threads=4,
-        )
-
-        # Also export a low-res preview
+        self._encode(final_clip, outputs)
         if quality == "high":
-            preview_path = output_path.with_name(output_path.stem + "_preview.mp4")
-            final_clip.write_videofile(str(preview_path), **settings["preview"],
-                                       logger=None, threads=2)
             logger.info(f"Preview exported → {preview_path.name}")
 
         logger.info(f"✅ Video exported: {output_path}")
         return output_path
 
+    def render_video_ffmpeg(
+        self,
+        images: list[Path],
+        text_data: dict,
+        location_name: str,
+        call_to_action: str,
+        channel_name: str,
+        audio_path: Optional[Path] = None,
+        output_path: str | Path | None = None,
+        quality: str = "high",
+    ) -> Path:
+        """
+        Render the whole video in one ffmpeg filter graph, without moviepy
+        frames: the slideshow, text overlays, progress bar, intro, outro and
+        watermark of the moviepy path, with the same timings.
+
+        Ken Burns uses zoompan (whole-pixel steps, so slow pans are less
+        smooth); text is still rasterised by TextClip and overlaid as PNGs.
+
+        Args:
+            images:         Image Paths, one per slideshow segment.
+            text_data:      Script dict containing 'hook', 'transition_texts'.
+            location_name:  Intro title.
+            call_to_action: Outro CTA text.
+            channel_name:   Watermark text.
+            audio_path:     Soundtrack to mux in, if any.
+            output_path:    Destination path (auto-generated if None).
+            quality:        'high' (also writes a preview) or 'preview'.
+
+        Returns:
+            Path to the exported video file.
+        """
+        if not MOVIEPY_AVAILABLE:
+            # Text is still rasterised through moviepy's TextClip
+            return self.export_video(None)
+
+        if output_path is None:
+            output_path = get_output_path("videos", timestamped_filename("video", "mp4"))
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        ffmpeg = get_setting("FFMPEG_BINARY")
+        codec, hw_args, upload = _pick_encoder(ffmpeg)
+        td = config.VIDEO_CONFIG["transition_duration"]
+        bw, bh = int(W * KB_MAX_SCALE), int(H * KB_MAX_SCALE)
+        grade = _grade_filter()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs: list[str] = []
+            graph: list[str] = []
+
+            def add_input(*args) -> int:
+                inputs.extend(args)
+                return inputs.count("-i") - 1
+
+            def text_layer(base, text, start, duration, y, fade_in, fade_out=0.0, **style):
+                """Overlay a faded text PNG on label *base*; return the new label."""
+                img, mask = _render_text(text, **style)
+                rgba = np.dstack([img, (mask if mask is not None else np.ones(img.shape[:2])) * 255])
+                png = Path(tmp) / f"text{len(graph)}.png"
+                Image.fromarray(rgba.astype(np.uint8), "RGBA").save(png)
+                idx = add_input("-loop", "1", "-framerate", str(FPS),
+                                "-t", f"{duration:.3f}", "-i", str(png))
+                fades = f"fade=in:st=0:d={fade_in}:alpha=1"
+                if fade_out:
+                    fades += f",fade=out:st={duration - fade_out:.3f}:d={fade_out}:alpha=1"
+                out = f"l{len(graph)}"
+                graph.append(f"[{idx}:v]format=rgba,{fades},setpts=PTS+{start:.3f}/TB[t{out}]")
+                graph.append(f"[{base}][t{out}]overlay=x=(W-w)/2:y={y}:eof_action=pass[{out}]")
+                return out
+
+            # Slideshow: Ken Burns + grade per photo, crossfaded together.
+            # Progress through a photo is on/frames (zoompan's output frame)
+            frames = round(PER_IMG * FPS)
+
+            def pan(drift: float, size: str) -> str:
+                """Window offset along one axis, as in _make_ken_burns_clip."""
+                slack = f"({size}-{size}/zoom)"
+                return f"clip({slack}*(0.5+{drift:.5f}*on/{frames}),0,{slack})"
+
+            length = 0.0
+            for i, img_path in enumerate(images):
+                scale_start, scale_end, pan_x, pan_y = _ken_burns_path()
+                idx = add_input("-i", str(img_path))
+                graph.append(
+                    f"[{idx}:v]scale={bw}:{bh}:flags=lanczos,setsar=1,"
+                    f"zoompan=z='{scale_start}+{scale_end - scale_start:.2f}*on/{frames}'"
+                    f":x='{pan(pan_x, 'iw')}':y='{pan(pan_y, 'ih')}'"
+                    f":d={frames}:s={W}x{H}:fps={FPS},{grade}[k{i}]"
+                )
+                if i == 0:
+                    label, length = "k0", PER_IMG
+                else:
+                    graph.append(
+                        f"[{label}][k{i}]xfade=transition=fade:duration={td}"
+                        f":offset={length - td:.3f}[x{i}]"
+                    )
+                    label, length = f"x{i}", length + PER_IMG - td
+            # As in create_image_slideshow, the last clip also loses td
+            total = length - td
+            graph.append(f"[{label}]trim=duration={total:.3f},setpts=PTS-STARTPTS[s0]")
+
+            # Hook, per-image captions and progress bar over the slideshow
+            body = "s0"
+            hook_text = text_data.get("hook", "")
+            if hook_text:
+                body = text_layer(body, hook_text, 0, 3, "(H-h)/2", 0.3, 0.3,
+                                  fontsize=56, color="white", font="DejaVu-Sans-Bold",
+                                  method="caption", size=(W - 80, None), align="center")
+            for i, text in enumerate(text_data.get("transition_texts", [])[:N_IMG]):
+                body = text_layer(body, text, i * PER_IMG + 0.3, PER_IMG - 0.6, H - 220,
+                                  0.3, 0.3, fontsize=44, color="white", font="DejaVu-Sans",
+                                  method="caption", size=(W - 80, None), align="center",
+                                  stroke_color="black", stroke_width=2)
+            graph.append(f"color=c=white@0.7:s={W}x6:r={FPS}:d={total:.3f},format=rgba[bar]")
+            graph.append(
+                f"[{body}][bar]overlay=x='-w+max(1,W*t/{total:.3f})':y={H - 10}"
+                f":eof_action=pass,setsar=1,format=yuv420p[main]"
+            )
+
+            # Intro and outro cards
+            graph.append(f"color=c=black:s={W}x{H}:r={FPS}:d=2[ibg]")
+            intro = text_layer("ibg", location_name.upper(), 0, 2, "(H-h)/2", 0.5,
+                               fontsize=80, color="#FFD700", font="DejaVu-Sans-Bold",
+                               method="label")
+            graph.append(f"color=c=0x0A0A0A:s={W}x{H}:r={FPS}:d=3[obg]")
+            outro = text_layer("obg", call_to_action, 0, 3, "(H-h)/2", 0.4,
+                               fontsize=52, color="white", font="DejaVu-Sans-Bold",
+                               method="caption", size=(W - 100, None))
+            outro = text_layer(outro, "👆 Follow for more travel content!", 0, 3,
+                               H // 2 + 80, 0.6, fontsize=36, color="#FFD700",
+                               font="DejaVu-Sans", method="caption", size=(W - 100, None))
+            graph.append(f"[{intro}]setsar=1,format=yuv420p[intro]")
+            graph.append(f"[{outro}]setsar=1,format=yuv420p[outro]")
+            graph.append("[intro][main][outro]concat=n=3:v=1:a=0[body]")
+
+            # Watermark over everything
+            img, mask = _render_text(f"© {channel_name}", fontsize=28, color="white",
+                                     font="DejaVu-Sans", method="label")
+            rgba = np.dstack([img, (mask if mask is not None else np.ones(img.shape[:2])) * 127.5])
+            mark = Path(tmp) / "watermark.png"
+            Image.fromarray(rgba.astype(np.uint8), "RGBA").save(mark)
+            idx = add_input("-loop", "1", "-framerate", str(FPS),
+                            "-t", f"{total + 5:.3f}", "-i", str(mark))
+            graph.append(f"[body][{idx}:v]overlay=x={W - 200}:y=20:eof_action=pass,fps={FPS}[final]")
+
+            outputs = [(output_path, "4000k", "medium", 1.0)]
+            if quality == "high":
+                preview_path = output_path.with_name(output_path.stem + "_preview.mp4")
+                outputs.append((preview_path, "1000k", "ultrafast", 0.5))
+            elif quality == "preview":
+                outputs = [(output_path, "1000k", "ultrafast", 1.0)]
+            audio = None
+            if audio_path is not None:
+                audio = (f"{add_input('-i', str(audio_path))}:a", "aac")
+            fan, out_args = _fan_out("final", (W, H), outputs, codec, upload, audio)
+
+            logger.info(f"Rendering video with ffmpeg ({quality}) → {output_path.name}")
+            cmd = [ffmpeg, "-y", "-loglevel", "error", *hw_args, *inputs,
+                   "-filter_complex", ";".join(graph + fan), *out_args]
+            proc = subprocess.run(cmd, capture_output=True)
+            if proc.returncode != 0:
+                raise IOError(f"ffmpeg ({codec}) failed: {proc.stderr.decode(errors='replace').strip()}")
+
+        logger.info(f"✅ Video exported: {output_path}")
+        return output_path
+
     # ── Internal helpers ─────────────────────────────────────────────────────
 
-    def _make_ken_burns_clip(self, image_path: Path, duration: float):
+    def _encode(self, clip, outputs: list[tuple[Path, str, str, float]]) -> None:
+        """
+        Render *clip* once and encode every output from that single pass.
+
+        Frames are piped to one ffmpeg process as raw RGB; a split filter
+        fans them out to each (path, bitrate, x264 preset, scale) output,
+        so the Ken Burns / grading / compositing pipeline never runs twice.
+        """
+        ffmpeg = get_setting("FFMPEG_BINARY")
+        codec, hw_args, upload = _pick_encoder(ffmpeg)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cmd = [
+                ffmpeg, "-y", "-loglevel", "error", *hw_args,
+                "-f", "rawvideo", "-pix_fmt", "rgb24",
+                "-s", f"{clip.w}x{clip.h}", "-r", str(FPS), "-i", "-",
+            ]
+            audio = None
+            if clip.audio is not None:
+                audio_path = str(Path(tmp) / "audio.m4a")
+                clip.audio.write_audiofile(audio_path, fps=44100, codec="aac", logger=None)
+                cmd += ["-i", audio_path]
+                audio = ("1:a", "copy")
+            graph, out_args = _fan_out("0:v", (clip.w, clip.h), outputs, codec, upload, audio)
+            cmd += ["-filter_complex", ";".join(graph), *out_args]
+
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+            try:
+                for frame in clip.iter_frames(fps=FPS, dtype="uint8"):
+                    proc.stdin.write(frame.tobytes())
+            except BrokenPipeError:
+                pass   # ffmpeg exited early; its stderr says why
+            finally:
+                proc.stdin.close()
+                err = proc.stderr.read().decode(errors="replace")
+                proc.wait()
+            if proc.returncode != 0:
+                raise IOError(f"ffmpeg ({codec}) failed: {err.strip()}")
+
+    def _make_ken_burns_clip(self, base: Image.Image, duration: float):
         """
         Apply a slow zoom-in or zoom-out (Ken Burns) effect to an image clip.
 
         Randomly chooses zoom direction; scale goes from 1.0 to 1.1 or vice-versa.
+        *base* is the photo as returned by _load_ken_burns_base.
         """
-        zoom_in = random.choice([True, False])
-        scale_start = 1.0 if zoom_in else 1.1
-        scale_end   = 1.1 if zoom_in else 1.0
+        scale_start, scale_end, pan_x, pan_y = _ken_burns_path()
 
-        # Pan direction (slight random offset)
-        pan_x = random.uniform(-0.03, 0.03)
-        pan_y = random.uniform(-0.03, 0.03)
+        # Each frame is a single box-resample of the visible window
+        ratio = base.width / W   # base pixels per 1.0-scale frame pixel
 
         def make_frame(t):
             """Return a numpy frame for time *t* with Ken Burns applied."""
             progress = t / duration
             scale = scale_start + (scale_end - scale_start) * progress
 
-            img = Image.open(image_path).convert("RGB")
-            img = img.resize((W, H), Image.LANCZOS)
-
-            # Compute enlarged size
-            sw = int(W * scale)
-            sh = int(H * scale)
-            img = img.resize((sw, sh), Image.LANCZOS)
-
-            # Pan offset
-            ox = int((sw - W) * (0.5 + pan_x * progress))
-            oy = int((sh - H) * (0.5 + pan_y * progress))
-            ox = max(0, min(ox, sw - W))
-            oy = max(0, min(oy, sh - H))
-            img = img.crop((ox, oy, ox + W, oy + H))
+            # Visible window at this zoom, in 1.0-scale frame coordinates
+            vw, vh = W / scale, H / scale
+            ox = (W - vw) * (0.5 + pan_x * progress)
+            oy = (H - vh) * (0.5 + pan_y * progress)
+            ox = max(0.0, min(ox, W - vw))
+            oy = max(0.0, min(oy, H - vh))
 
-            return np.array(img)
+            box = (ox * ratio, oy * ratio, (ox + vw) * ratio, (oy + vh) * ratio)
+            return np.asarray(base.resize((W, H), Image.BILINEAR, box=box))
 
         clip = VideoClip(make_frame, duration=duration)
         return clip.set_fps(FPS)
@@ -357,14 +734,4 @@ class VideoCreatorAgent:
         - Slight saturation boost
         - Slight warmth (more red/yellow)
         """
-        def grade_frame(frame):
-            img = Image.fromarray(frame)
-            img = ImageEnhance.Color(img).enhance(1.2)        # saturation
-            img = ImageEnhance.Contrast(img).enhance(1.05)    # slight contrast
-            arr = np.array(img, dtype=np.float32)
-            # Warm tint: boost R slightly, reduce B slightly
-            arr[:, :, 0] = np.clip(arr[:, :, 0] * 1.03, 0, 255)
-            arr[:, :, 2] = np.clip(arr[:, :, 2] * 0.97, 0, 255)
-            return arr.astype(np.uint8)
-
-        return clip.fl_image(grade_frame)
+        return clip.fl_image(_grade_frame)
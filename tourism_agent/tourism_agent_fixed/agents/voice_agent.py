@@ -8,31 +8,112 @@ Priority order:
 """
 
 import os
+import re
+import json
 import time
+import asyncio
+import functools
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, ClassVar, Optional
 
+import numpy as np
 from gtts import gTTS
 
+# POSIX advisory locks serialise updates to the usage counter; unavailable
+# on Windows, where runs are expected to be one at a time
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 import config
 from utils.logger import logger
-from utils.file_manager import get_output_path, timestamped_filename
-
-# Track ElevenLabs usage in a local file to avoid exceeding the free limit
-_EL_USAGE_FILE = Path(__file__).parent.parent / "logs" / "elevenlabs_usage.txt"
+from utils.file_manager import DIRS, get_output_path, timestamped_filename
+from utils.tts_cache import AudioCache
+
+# Track ElevenLabs usage in a local file to avoid exceeding the free limit.
+# The counter is a little-endian uint64, updated under an advisory lock so
+# concurrent runs cannot lose or double-count characters
+_EL_USAGE_FILE = config.LOGS_DIR / "elevenlabs_usage.bin"
+_EL_USAGE_LEGACY = _EL_USAGE_FILE.with_suffix(".txt")   # older decimal-text counter
 _EL_FREE_LIMIT = 10_000   # characters per month
 
+# Streamed TTS chunks are coalesced into writes of this size, issued off
+# the event loop
+_EL_WRITE_BATCH = 256 * 1024
+
+# gTTS fetches one MP3 per sentence; this many are requested at once
+_GTTS_WORKERS = 4
+_SENTENCE_RE  = re.compile(r"(?<=[.!?])\s+")
+
+
+@functools.lru_cache(maxsize=8)
+def _lowpass_sos(sample_rate: int) -> np.ndarray:
+    """8 kHz 4th-order Butterworth low-pass as float32 second-order sections."""
+    from scipy.signal import butter
+    return butter(4, 8000, btype="low", fs=sample_rate, output="sos").astype(np.float32)
 
-def _read_el_usage() -> int:
-    try:
-        return int(_EL_USAGE_FILE.read_text().strip())
-    except Exception:
-        return 0
 
+# Last value read or written, keyed by the file's mtime so a change made by
+# another process is still picked up (one stat() instead of a full read)
+_el_usage_cache: tuple[int, int] | None = None   # (st_mtime_ns, chars)
 
-def _write_el_usage(chars: int) -> None:
+
+def _lock_usage(f, mode: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(f, mode)
+
+
+def _decode_usage(data: bytes) -> int:
+    return int.from_bytes(data.ljust(8, b"\0")[:8], "little")
+
+
+def _read_el_usage() -> int:
+    global _el_usage_cache
+    try:
+        mtime = _EL_USAGE_FILE.stat().st_mtime_ns
+    except OSError:
+        try:
+            return int(_EL_USAGE_LEGACY.read_text().strip())
+        except (OSError, ValueError):
+            return 0
+    if _el_usage_cache and _el_usage_cache[0] == mtime:
+        return _el_usage_cache[1]
+    with open(_EL_USAGE_FILE, "rb", buffering=0) as f:
+        _lock_usage(f, fcntl.LOCK_SH if fcntl else 0)
+        chars = _decode_usage(f.read(8))
+    _el_usage_cache = (mtime, chars)
+    return chars
+
+
+def _add_el_usage(delta: int) -> int:
+    """
+    Atomically add *delta* characters to the usage counter.
+
+    Returns:
+        The new total.
+    """
+    global _el_usage_cache
     _EL_USAGE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    _EL_USAGE_FILE.write_text(str(chars))
+    fd = os.open(_EL_USAGE_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    with open(fd, "r+b", buffering=0) as f:
+        _lock_usage(f, fcntl.LOCK_EX if fcntl else 0)
+        data = f.read(8)
+        if data:
+            chars = _decode_usage(data)
+        else:   # first write: carry over the old text counter, if any
+            try:
+                chars = int(_EL_USAGE_LEGACY.read_text().strip())
+            except (OSError, ValueError):
+                chars = 0
+        chars += delta
+        f.seek(0)
+        f.write(chars.to_bytes(8, "little"))
+        _el_usage_cache = (os.fstat(fd).st_mtime_ns, chars)
+    return chars
 
 
 class VoiceGeneratorAgent:
@@ -40,13 +121,20 @@ class VoiceGeneratorAgent:
 
     # ElevenLabs Rachel voice ID (natural, engaging female voice)
     EL_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"
+    EL_VOICE_SETTINGS = {"stability": 0.5, "similarity_boost": 0.8}
+
+    # One pyttsx3 engine per process: init() loads the speech driver and
+    # enumerates voices, and the engine is not safe to drive concurrently
+    _pyttsx3_engine: ClassVar[Any] = None
+    _pyttsx3_lock = threading.Lock()
 
     def __init__(self) -> None:
+        self._cache = AudioCache(DIRS["cache"] / "tts", config.TTS_CACHE_MAX_MB * 1024 * 1024)
         self._el_client = None
         if config.ELEVENLABS_API_KEY:
             try:
-                from elevenlabs.client import ElevenLabs
-                self._el_client = ElevenLabs(api_key=config.ELEVENLABS_API_KEY)
+                from elevenlabs.client import AsyncElevenLabs
+                self._el_client = AsyncElevenLabs(api_key=config.ELEVENLABS_API_KEY)
                 logger.info("ElevenLabs client ready")
             except Exception as exc:
                 logger.warning(f"ElevenLabs init failed: {exc}")
@@ -64,32 +152,43 @@ class VoiceGeneratorAgent:
             Path to the generated audio file.
         """
         # Try ElevenLabs
-        el_path = self.generate_elevenlabs_voice(script_text)
+        el_path = await self.generate_elevenlabs_voice(script_text)
         if el_path:
             return el_path
 
         # Fallback to gTTS
         logger.info("Falling back to gTTS for voiceover")
-        return self.generate_gtts_voice(script_text)
+        return await asyncio.to_thread(self.generate_gtts_voice, script_text)
 
-    def generate_elevenlabs_voice(
+    async def generate_elevenlabs_voice(
         self,
         script_text: str,
         voice_id: str | None = None,
     ) -> Optional[Path]:
         """
-        Generate voiceover using ElevenLabs API.
+        Generate voiceover using the ElevenLabs streaming endpoint, writing
+        audio chunks to disk as they arrive.
 
         Args:
             script_text: Narration text.
             voice_id:    ElevenLabs voice ID (defaults to Rachel).
 
         Returns:
-            Path to MP3, or None if limit exceeded / error.
+            Path to MP3, or None if limit exceeded / error / timeout.
         """
         if not self._el_client:
             return None
 
+        voice_id = voice_id or self.EL_VOICE_ID
+        fname = timestamped_filename("voiceover_el", "mp3")
+        out_path = get_output_path("audio", fname)
+        key = AudioCache.key(
+            script_text, "elevenlabs", voice_id, config.ELEVENLABS_MODEL,
+            sorted(self.EL_VOICE_SETTINGS.items()),
+        )
+        if self._cache.get(key, out_path):
+            return out_path   # no synthesis, no quota spent
+
         used = _read_el_usage()
         if used + len(script_text) > _EL_FREE_LIMIT:
             logger.warning(
@@ -98,31 +197,36 @@ class VoiceGeneratorAgent:
             )
             return None
 
-        voice_id = voice_id or self.EL_VOICE_ID
         try:
-            audio_gen = self._el_client.text_to_speech.convert(
-                voice_id=voice_id,
-                text=script_text,
-                model_id="eleven_monolingual_v1",
-                voice_settings={
-                    "stability": 0.5,
-                    "similarity_boost": 0.8,
-                },
-            )
-            fname = timestamped_filename("voiceover_el", "mp3")
-            out_path = get_output_path("audio", fname)
-            with open(out_path, "wb") as f:
-                for chunk in audio_gen:
-                    f.write(chunk)
+            async with asyncio.timeout(config.TTS_TIMEOUT):
+                audio_stream = self._el_client.text_to_speech.stream(
+                    voice_id=voice_id,
+                    text=script_text,
+                    model_id=config.ELEVENLABS_MODEL,
+                    voice_settings=self.EL_VOICE_SETTINGS,
+                )
+                buf = bytearray()
+                with open(out_path, "wb") as f:
+                    async for chunk in audio_stream:
+                        buf += chunk
+                        if len(buf) >= _EL_WRITE_BATCH:
+                            await asyncio.to_thread(f.write, buf)
+                            buf.clear()
+                    if buf:
+                        await asyncio.to_thread(f.write, buf)
 
             # Update usage counter
-            _write_el_usage(used + len(script_text))
+            _add_el_usage(len(script_text))
+            self._cache.put(key, out_path)
             logger.info(f"ElevenLabs voiceover saved: {out_path.name}")
             return out_path
 
+        except TimeoutError:
+            logger.warning(f"ElevenLabs TTS timed out after {config.TTS_TIMEOUT:.0f}s")
         except Exception as exc:
             logger.warning(f"ElevenLabs TTS error: {exc}")
-            return None
+        out_path.unlink(missing_ok=True)   # drop the partial file
+        return None
 
     def generate_gtts_voice(
         self,
@@ -143,25 +247,43 @@ class VoiceGeneratorAgent:
         """
         fname = timestamped_filename("voiceover_gtts", "mp3")
         out_path = get_output_path("audio", fname)
+        key = AudioCache.key(script_text, "gtts", language, slow)
+        if self._cache.get(key, out_path):
+            return out_path
+
+        def synth(sentence: str) -> bytes:
+            return b"".join(gTTS(text=sentence, lang=language, slow=slow).stream())
 
         try:
-            tts = gTTS(text=script_text, lang=language, slow=slow)
-            tts.save(str(out_path))
+            # Fetch sentences in parallel and append each one, in order, as
+            # soon as it lands; MP3 frames concatenate cleanly, which is also
+            # how gTTS joins its own per-chunk downloads
+            sentences = [s for s in _SENTENCE_RE.split(script_text.strip()) if s]
+            with ThreadPoolExecutor(max_workers=_GTTS_WORKERS) as pool, \
+                    open(out_path, "wb") as f:
+                for part in pool.map(synth, sentences or [script_text]):
+                    f.write(part)
+            self._cache.put(key, out_path)
             logger.info(f"gTTS voiceover saved: {out_path.name}")
             return out_path
         except Exception as exc:
             logger.error(f"gTTS error: {exc}")
+            out_path.unlink(missing_ok=True)
             return self._pyttsx3_fallback(script_text)
 
     def _pyttsx3_fallback(self, script_text: str) -> Path:
         """Emergency offline TTS using pyttsx3."""
-        out_path = get_output_path("audio", "voiceover_pyttsx3.mp3")
+        out_path = get_output_path("audio", timestamped_filename("voiceover_pyttsx3", "mp3"))
         try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            engine.setProperty("rate", 160)
-            engine.save_to_file(script_text, str(out_path))
-            engine.runAndWait()
+            with self._pyttsx3_lock:
+                engine = VoiceGeneratorAgent._pyttsx3_engine
+                if engine is None:
+                    import pyttsx3
+                    engine = pyttsx3.init()
+                    engine.setProperty("rate", 160)
+                    VoiceGeneratorAgent._pyttsx3_engine = engine
+                engine.save_to_file(script_text, str(out_path))
+                engine.runAndWait()
             logger.info(f"pyttsx3 voiceover saved: {out_path.name}")
         except Exception as exc:
             logger.error(f"pyttsx3 fallback also failed: {exc}")
@@ -175,42 +297,41 @@ class VoiceGeneratorAgent:
         self,
         audio_path: Path,
         target_duration: float,
+        preserve_pitch: bool = True,
     ) -> Path:
         """
-        Speed-up or slow-down the audio to fit within *target_duration* seconds.
-        Uses pydub for adjustment.
+        Speed-up the audio to fit within *target_duration* seconds, in a
+        single ffmpeg pass.
 
         Args:
             audio_path:       Input audio path.
             target_duration:  Desired duration in seconds.
+            preserve_pitch:   Time-stretch with atempo so the voice keeps its
+                              pitch; False resamples instead (faster, higher voice).
 
         Returns:
             Path to the adjusted audio file.
         """
         try:
-            from pydub import AudioSegment
-            audio = AudioSegment.from_file(str(audio_path))
-            current_duration = len(audio) / 1000.0  # ms → s
-
-            if abs(current_duration - target_duration) < 1.0:
-                return audio_path  # Already close enough
-
-            speed_factor = current_duration / target_duration
-            speed_factor = max(1, min(speed_factor, 1.5))  # Clamp to reasonable range
-
-            # pydub doesn't have native speed change; we use frame rate trick
-            adjusted = audio._spawn(
-                audio.raw_data,
-                overrides={"frame_rate": int(audio.frame_rate * speed_factor)},
-            ).set_frame_rate(audio.frame_rate)
+            current_duration, sample_rate, _ = self._probe_audio(audio_path)
+            af = self._speed_filter(current_duration, target_duration, sample_rate, preserve_pitch)
+            if af is None:
+                return audio_path
 
             out_path = audio_path.with_stem(audio_path.stem + "_adjusted")
-            adjusted.export(str(out_path), format="mp3")
-            logger.info(f"Audio adjusted {current_duration:.1f}s → {target_duration:.1f}s (×{speed_factor:.2f})")
+            subprocess.run(
+                [
+                    "ffmpeg", "-y", "-v", "error",
+                    "-i", str(audio_path),
+                    "-af", af, "-b:a", "192k", str(out_path),
+                ],
+                check=True,
+                capture_output=True,
+            )
             return out_path
 
-        except ImportError:
-            logger.warning("pydub not installed; audio speed not adjusted")
+        except FileNotFoundError:
+            logger.warning("ffmpeg not installed; audio speed not adjusted")
             return audio_path
         except Exception as exc:
             logger.warning(f"Audio speed adjustment failed: {exc}")
@@ -220,7 +341,10 @@ class VoiceGeneratorAgent:
         """
         Post-process the voiceover:
         - Normalise volume levels
-        - Apply subtle EQ/warmth (bass boost with pydub)
+        - Soften harsh highs with a low-pass filter, then lift by 2 dB
+
+        The samples are decoded once into a NumPy array, filtered with a
+        single scipy biquad cascade and streamed straight back to ffmpeg.
 
         Args:
             audio_path: Input audio file.
@@ -229,24 +353,133 @@ class VoiceGeneratorAgent:
             Path to processed audio file.
         """
         try:
-            from pydub import AudioSegment
-            from pydub.effects import normalize
+            _, sample_rate, channels = self._probe_audio(audio_path)
+            audio = self._decode_pcm(audio_path, channels)
+            return self._finish_voice(audio_path, audio, sample_rate, channels)
 
-            audio = AudioSegment.from_file(str(audio_path))
-            audio = normalize(audio)
+        except FileNotFoundError:
+            logger.warning("ffmpeg not installed; voice effects skipped")
+            return audio_path
+        except ImportError:
+            logger.warning("scipy not installed; voice effects skipped")
+            return audio_path
+        except Exception as exc:
+            logger.warning(f"Voice effects failed: {exc}")
+            return audio_path
 
-            # Slight low-frequency boost for warmth
-            audio = audio.low_pass_filter(8000)   # remove harsh highs
-            audio = audio + 2                      # +2 dB overall
+    def process_voiceover(
+        self,
+        audio_path: Path,
+        target_duration: float,
+        preserve_pitch: bool = True,
+    ) -> Path:
+        """
+        adjust_audio_speed() followed by add_voice_effects(), with one decode
+        and one encode instead of an intermediate MP3 between the two.
 
-            out_path = audio_path.with_stem(audio_path.stem + "_processed")
-            audio.export(str(out_path), format="mp3", bitrate="192k")
-            logger.info(f"Voice effects applied: {out_path.name}")
-            return out_path
+        Args:
+            audio_path:       Raw voiceover.
+            target_duration:  Desired duration in seconds.
+            preserve_pitch:   See adjust_audio_speed().
+
+        Returns:
+            Path to the processed audio file.
+        """
+        try:
+            current_duration, sample_rate, channels = self._probe_audio(audio_path)
+            af = self._speed_filter(current_duration, target_duration, sample_rate, preserve_pitch)
+            audio = self._decode_pcm(audio_path, channels, af)
+            return self._finish_voice(audio_path, audio, sample_rate, channels)
 
         except ImportError:
-            logger.warning("pydub not installed; voice effects skipped")
+            logger.warning("scipy not installed; voice effects skipped")
+            return self.adjust_audio_speed(audio_path, target_duration, preserve_pitch)
+        except FileNotFoundError:
+            logger.warning("ffmpeg not installed; voiceover left unprocessed")
             return audio_path
         except Exception as exc:
-            logger.warning(f"Voice effects failed: {exc}")
+            logger.warning(f"Voice processing failed: {exc}")
             return audio_path
+
+    # ── Internal helpers ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _speed_filter(
+        current_duration: float,
+        target_duration: float,
+        sample_rate: int,
+        preserve_pitch: bool,
+    ) -> Optional[str]:
+        """ffmpeg -af filter that fits the voice into *target_duration*, or None if not needed."""
+        if abs(current_duration - target_duration) < 1.0:
+            return None  # Already close enough
+
+        speed_factor = current_duration / target_duration
+        speed_factor = max(1, min(speed_factor, 1.5))  # Clamp to reasonable range
+        if speed_factor == 1:
+            return None  # Too short is left alone; skip a no-op re-encode
+
+        logger.info(f"Audio adjusted {current_duration:.1f}s → {target_duration:.1f}s (×{speed_factor:.2f})")
+        if preserve_pitch:
+            return f"atempo={speed_factor:.6f}"
+        # Same effect as replaying the samples at a higher rate
+        return f"asetrate={sample_rate * speed_factor:.0f},aresample={sample_rate}"
+
+    @staticmethod
+    def _decode_pcm(audio_path: Path, channels: int, af: Optional[str] = None) -> np.ndarray:
+        """Decode *audio_path* (through filter *af*, if given) to float32 frames × channels."""
+        cmd = ["ffmpeg", "-v", "error", "-i", str(audio_path)]
+        if af:
+            cmd += ["-af", af]
+        cmd += ["-f", "f32le", "-ac", str(channels), "-"]
+        pcm = subprocess.run(cmd, check=True, capture_output=True).stdout
+        return np.frombuffer(pcm, dtype=np.float32).reshape(-1, channels)
+
+    @staticmethod
+    def _finish_voice(audio_path: Path, audio: np.ndarray, sample_rate: int, channels: int) -> Path:
+        """Apply the voice effects to decoded *audio* and encode it next to *audio_path*."""
+        from scipy.signal import sosfilt
+
+        # Remove harsh highs (skipped if 8 kHz is above Nyquist)
+        if sample_rate > 16_000:
+            # float32 coefficients keep the filter (and its output) in float32
+            audio = sosfilt(_lowpass_sos(sample_rate), audio, axis=0)
+        else:
+            audio = audio.copy()
+
+        # Peak-normalise to -0.1 dBFS and add +2 dB in one multiply; the
+        # filter is linear so scaling after it is equivalent
+        peak = float(np.abs(audio).max()) or 1.0
+        audio *= 10 ** ((-0.1 + 2) / 20) / peak
+        np.clip(audio, -1.0, 1.0, out=audio)
+
+        out_path = audio_path.with_stem(audio_path.stem + "_processed")
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-v", "error",
+                "-f", "f32le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "-",
+                "-b:a", "192k", str(out_path),
+            ],
+            input=audio.tobytes(),
+            check=True,
+            capture_output=True,
+        )
+        logger.info(f"Voice effects applied: {out_path.name}")
+        return out_path
+
+    @staticmethod
+    def _probe_audio(path: Path) -> tuple[float, int, int]:
+        """Return (duration in seconds, sample rate, channels) of an audio file via ffprobe."""
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-select_streams", "a:0",
+                "-show_entries", "stream=sample_rate,channels:format=duration",
+                "-of", "json", str(path),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        info = json.loads(result.stdout)
+        stream = info["streams"][0]
+        return float(info["format"]["duration"]), int(stream["sample_rate"]), int(stream["channels"])
@@ -14,6 +14,10 @@ BASE_DIR = Path(__file__).parent
 OUTPUT_DIR = BASE_DIR / "output"
 LOGS_DIR = BASE_DIR / "logs"
 
+# ─── LOGGING ──────────────────────────────────────────────────────────────────
+# DEBUG for troubleshooting; at INFO, debug calls return before any formatting
+LOG_LEVEL = os.getenv("TOURISM_LOG_LEVEL", "INFO").upper()
+
 # ─── TARGET LOCATION ──────────────────────────────────────────────────────────
 LOCATION = {
     "name": "Tunis",
@@ -47,6 +51,14 @@ VIDEO_CONFIG = {
     "text_shadow": True
 }
 
+# H.264 encoder for exports: "auto" uses h264_nvenc or h264_vaapi when the
+# GPU can actually encode, else libx264; or name one of those explicitly
+VIDEO_ENCODER = os.getenv("VIDEO_ENCODER", "auto")
+
+# "moviepy" composes frames in Python; "ffmpeg" renders the same video as a
+# single ffmpeg filter graph (much faster; Ken Burns pans step by whole pixels)
+VIDEO_RENDERER = os.getenv("VIDEO_RENDERER", "moviepy")
+
 # ─── PUBLISHING SCHEDULE ──────────────────────────────────────────────────────
 SCHEDULE = {
     "post_times": ["09:00", "17:00", "20:00"],
@@ -54,6 +66,31 @@ SCHEDULE = {
     "platforms": ["youtube", "instagram", "facebook", "telegram"]
 }
 
+# ─── UPLOAD SETTINGS ──────────────────────────────────────────────────────────
+# YouTube resumable-upload chunk size; must be a multiple of 256 KB.
+# Files over 1 GB use 4× this to cut round trips further.
+YOUTUBE_CHUNK_SIZE = int(os.getenv("YOUTUBE_CHUNK_SIZE", 16 * 1024 * 1024))
+
+# Hard limit (seconds) for publishing to all platforms; platforms still
+# uploading when it expires are cancelled and reported as failed
+PUBLISH_TIMEOUT = float(os.getenv("PUBLISH_TIMEOUT", 3600))
+
+# ─── VOICE SETTINGS ───────────────────────────────────────────────────────────
+# ElevenLabs model; "eleven_turbo_v2" starts streaming sooner at a small
+# cost in expressiveness
+ELEVENLABS_MODEL = os.getenv("ELEVENLABS_MODEL", "eleven_monolingual_v1")
+
+# Seconds to wait for an ElevenLabs voiceover before falling back to gTTS
+TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT", 120))
+
+# Size cap (MB) for the on-disk cache of synthesised voiceovers
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", 500))
+
+# ─── BATCH MODE ───────────────────────────────────────────────────────────────
+# How many pipelines `--count N` runs at once (1 = one after another).
+# Each run stamps its output names, so concurrent pipelines don't collide
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 3))
+
 # ─── CONTENT STYLE ────────────────────────────────────────────────────────────
 CONTENT_STYLE = {
     "tone": "exciting and inspiring",
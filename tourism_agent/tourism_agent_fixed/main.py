@@ -17,9 +17,9 @@ Usage examples:
 
 import sys
 import asyncio
+import importlib
 import argparse
 import random
-from datetime import datetime
 from pathlib import Path
 
 from colorama import init as colorama_init, Fore, Style
@@ -31,29 +31,44 @@ colorama_init(autoreset=True)
 import config
 from config import LOCATION, CONTENT_STYLE, SCHEDULE
 from utils.logger import logger
-from utils.file_manager import ensure_dirs
+from utils.file_manager import ensure_dirs, unique_timestamp
 from utils.scheduler import AgentScheduler
-from agents.trend_agent     import TrendDiscoveryAgent
-from agents.script_agent    import ScriptWriterAgent
-from agents.image_agent     import ImageCollectorAgent
-from agents.video_agent     import VideoCreatorAgent
-from agents.voice_agent     import VoiceGeneratorAgent
-from agents.music_agent     import MusicAgent
-from agents.publisher_agent import PublisherAgent
-from agents.analytics_agent import AnalyticsAgent
 
 
 # ── Agent singletons ─────────────────────────────────────────────────────────
-trend_agent     = TrendDiscoveryAgent()
-script_agent    = ScriptWriterAgent()
-image_agent     = ImageCollectorAgent()
-video_agent     = VideoCreatorAgent()
-voice_agent     = VoiceGeneratorAgent()
-music_agent     = MusicAgent()
-publisher_agent = PublisherAgent()
-analytics_agent = AnalyticsAgent()
+# Agents pull in moviepy, gTTS, Google clients, … so each one is imported
+# and constructed only when first used; --help and --analytics stay fast.
+
+class _LazyAgent:
+    """Module-level stand-in that builds the real agent on first attribute access."""
+
+    def __init__(self, module: str, cls: str, setup=None) -> None:
+        self._spec  = (module, cls, setup)
+        self._agent = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._agent is not None
+
+    def __getattr__(self, name: str):
+        if self._agent is None:
+            module, cls, setup = self._spec
+            self._agent = getattr(importlib.import_module(module), cls)()
+            if setup:
+                setup(self._agent)
+        return getattr(self._agent, name)
+
+
 scheduler       = AgentScheduler()
-publisher_agent.set_scheduler(scheduler)
+trend_agent     = _LazyAgent("agents.trend_agent",     "TrendDiscoveryAgent")
+script_agent    = _LazyAgent("agents.script_agent",    "ScriptWriterAgent")
+image_agent     = _LazyAgent("agents.image_agent",     "ImageCollectorAgent")
+video_agent     = _LazyAgent("agents.video_agent",     "VideoCreatorAgent")
+voice_agent     = _LazyAgent("agents.voice_agent",     "VoiceGeneratorAgent")
+music_agent     = _LazyAgent("agents.music_agent",     "MusicAgent")
+publisher_agent = _LazyAgent("agents.publisher_agent", "PublisherAgent",
+                             setup=lambda agent: agent.set_scheduler(scheduler))
+analytics_agent = _LazyAgent("agents.analytics_agent", "AnalyticsAgent")
 
 
 # ── CLI argument parser ───────────────────────────────────────────────────────
@@ -102,6 +117,70 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
 # ── Core pipeline ─────────────────────────────────────────────────────────────
 
+def render_video(
+    images_with_text: list[Path],
+    script: dict,
+    final_audio: Path,
+    timestamp: str,
+) -> Path:
+    """
+    Render the final video with the configured renderer (blocking).
+
+    Args:
+        images_with_text: Slideshow images with captions burned in.
+        script:           Script dict from the script agent.
+        final_audio:      Mixed voice + music track.
+        timestamp:        Run timestamp used in the output filename.
+
+    Returns:
+        Path to the exported video (or a placeholder note).
+    """
+    loc_name = LOCATION["name"]
+    cta      = CONTENT_STYLE["call_to_action"]
+
+    if config.VIDEO_RENDERER == "ffmpeg":
+        video_path = video_agent.render_video_ffmpeg(
+            images_with_text, script, loc_name,
+            cta, loc_name,
+            audio_path=final_audio,
+            output_path=f"output/videos/tourism_{timestamp}.mp4",
+        )
+    else:
+        base_video = video_agent.create_image_slideshow(images_with_text)
+
+        if base_video is not None:
+            video_with_text  = video_agent.add_text_overlays(base_video, script)
+            video_with_intro = video_agent.add_intro_animation(
+                video_with_text, loc_name
+            )
+            video_with_outro = video_agent.add_outro_animation(
+                video_with_intro, cta
+            )
+            final_clip = video_agent.add_watermark(video_with_outro, loc_name)
+
+            # Attach the mixed audio
+            try:
+                from moviepy.editor import AudioFileClip
+                audio_clip = AudioFileClip(str(final_audio))
+                final_clip = final_clip.set_audio(audio_clip)
+            except Exception as exc:
+                logger.warning(f"Audio attachment failed: {exc}")
+
+            video_path = video_agent.export_video(
+                final_clip,
+                output_path=f"output/videos/tourism_{timestamp}.mp4",
+                quality="high",
+            )
+        else:
+            # moviepy unavailable – create a placeholder path
+            video_path = Path(f"output/videos/tourism_{timestamp}_placeholder.txt")
+            video_path.parent.mkdir(parents=True, exist_ok=True)
+            video_path.write_text("Video creation requires moviepy. Run: pip install moviepy")
+            logger.warning("Video creation skipped (moviepy not available)")
+
+    return video_path
+
+
 async def run_full_pipeline(
     override_topic: str | None = None,
     dry_run: bool = False,
@@ -121,7 +200,12 @@ async def run_full_pipeline(
         Dict of {platform: url/status} publish results.
     """
     banner("🚀 Starting Tourism Agent Pipeline")
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = unique_timestamp("pipeline")
+
+    # Settings used repeatedly below, bound once
+    loc_name   = LOCATION["name"]
+    images_per = config.VIDEO_CONFIG["images_per_video"]
+    duration   = config.VIDEO_CONFIG["duration_seconds"]
 
     # ── Step 1: Trend Discovery ───────────────────────────────────────────────
     step("1/10", "Discovering Trends")
@@ -150,89 +234,79 @@ async def run_full_pipeline(
     script_paths = script_agent.save_script(script, f"script_{timestamp}")
     step_ok(f"Title: '{script.get('title', 'Untitled')}'")
 
-    # ── Step 3: Image Collection ──────────────────────────────────────────────
-    step("3/10", "Collecting Images")
+    # ── Steps 3, 5, 6: Images, Voiceover and Music (in parallel) ──────────────
+    # None of the three depends on another, so their network calls overlap
+    step("3/10", "Collecting Images, Voiceover and Music")
     search_queries = script.get("search_queries") or [
-        f"{LOCATION['name']} travel",
-        f"{LOCATION['name']} landscape",
+        f"{loc_name} travel",
+        f"{loc_name} landscape",
         f"Tunisia tourism",
     ]
-    images = await image_agent.collect_all_images(
-        search_queries=search_queries,
-        total_needed=config.VIDEO_CONFIG["images_per_video"],
+    images, voiceover, music = await asyncio.gather(
+        image_agent.collect_all_images(
+            search_queries=search_queries,
+            total_needed=images_per,
+        ),
+        voice_agent.generate_voice(script.get("voiceover_script", "")),
+        music_agent.search_pixabay_music(mood="inspiring", genre="cinematic"),
+        return_exceptions=True,
     )
-    thumbnail = image_agent.create_thumbnail(
+    if isinstance(images, BaseException):
+        raise images    # nothing to build a video from
+    if isinstance(voiceover, BaseException):
+        logger.warning(f"Voiceover failed ({voiceover}); retrying with gTTS")
+        voiceover = await asyncio.to_thread(
+            voice_agent.generate_gtts_voice, script.get("voiceover_script", "")
+        )
+    if isinstance(music, BaseException):
+        logger.warning(f"Music sourcing failed ({music}); continuing without music")
+        music = None
+    thumbnail = await asyncio.to_thread(
+        image_agent.create_thumbnail,
         images[0],
-        script.get("thumbnail_text", f"Visit {LOCATION['name']}!"),
-        LOCATION["name"],
+        script.get("thumbnail_text", f"Visit {loc_name}!"),
+        loc_name,
     )
     step_ok(f"Collected {len(images)} images")
 
     # ── Step 4: Text Overlays ─────────────────────────────────────────────────
     step("4/10", "Adding Text Overlays to Images")
     transition_texts = script.get("transition_texts", [""] * len(images))
-    images_with_text = []
-    for img, text in zip(images, transition_texts):
-        processed = image_agent.add_text_overlay(img, text)
-        images_with_text.append(processed)
+    # Blocking image/audio/video work below runs on worker threads so the
+    # event loop (scheduler, streaming readers) stays responsive
+    images_with_text = await asyncio.to_thread(
+        image_agent.add_text_overlays, images, transition_texts
+    )
     step_ok(f"Overlays applied to {len(images_with_text)} images")
 
     # ── Step 5: Voiceover ─────────────────────────────────────────────────────
-    step("5/10", "Generating Voiceover")
-    voiceover = await voice_agent.generate_voice(script.get("voiceover_script", ""))
-    voiceover = voice_agent.adjust_audio_speed(
-        voiceover, config.VIDEO_CONFIG["duration_seconds"]
+    step("5/10", "Processing Voiceover")
+    # Speed fit and effects share a single decode/encode
+    voiceover = await asyncio.to_thread(
+        voice_agent.process_voiceover, voiceover, duration
     )
-    voiceover = voice_agent.add_voice_effects(voiceover)
     step_ok(f"Voiceover: {voiceover.name}")
 
     # ── Step 6: Background Music ──────────────────────────────────────────────
-    step("6/10", "Sourcing Background Music")
-    music = await music_agent.search_pixabay_music(mood="inspiring", genre="cinematic")
-    music = music_agent.sync_music_to_video(
-        music, config.VIDEO_CONFIG["duration_seconds"] + 5
-    )
-    step_ok(f"Music: {music.name}")
+    step("6/10", "Background Music")
+    # Looping/trimming to the voice length happens inside the mix step
+    step_ok(f"Music: {music.name if music else 'none'}")
 
     # ── Step 7: Mix Audio ─────────────────────────────────────────────────────
     step("7/10", "Mixing Audio")
-    final_audio = music_agent.mix_audio(voiceover, music, music_volume=0.15)
+    if music:
+        final_audio = await asyncio.to_thread(
+            music_agent.mix_audio, voiceover, music, music_volume=0.15
+        )
+    else:
+        final_audio = voiceover
     step_ok(f"Mixed audio: {final_audio.name}")
 
     # ── Step 8: Video Creation ────────────────────────────────────────────────
     step("8/10", "Creating Video")
-    base_video = video_agent.create_image_slideshow(images_with_text)
-
-    if base_video is not None:
-        video_with_text  = video_agent.add_text_overlays(base_video, script)
-        video_with_intro = video_agent.add_intro_animation(
-            video_with_text, LOCATION["name"]
-        )
-        video_with_outro = video_agent.add_outro_animation(
-            video_with_intro, CONTENT_STYLE["call_to_action"]
-        )
-        final_clip = video_agent.add_watermark(video_with_outro, LOCATION["name"])
-
-        # Attach the mixed audio
-        try:
-            from moviepy.editor import AudioFileClip
-            audio_clip = AudioFileClip(str(final_audio))
-            final_clip = final_clip.set_audio(audio_clip)
-        except Exception as exc:
-            logger.warning(f"Audio attachment failed: {exc}")
-
-        video_path = video_agent.export_video(
-            final_clip,
-            output_path=f"output/videos/tourism_{timestamp}.mp4",
-            quality="high",
-        )
-    else:
-        # moviepy unavailable – create a placeholder path
-        video_path = Path(f"output/videos/tourism_{timestamp}_placeholder.txt")
-        video_path.parent.mkdir(parents=True, exist_ok=True)
-        video_path.write_text("Video creation requires moviepy. Run: pip install moviepy")
-        logger.warning("Video creation skipped (moviepy not available)")
-
+    video_path = await asyncio.to_thread(
+        render_video, images_with_text, script, final_audio, timestamp
+    )
     step_ok(f"Video: {video_path.name}")
 
     # ── Step 9: Preview ───────────────────────────────────────────────────────
@@ -241,36 +315,30 @@ async def run_full_pipeline(
     # ── Step 10: Publish ──────────────────────────────────────────────────────
     step("10/10", "Publishing to Social Media")
 
-    # Build platform-specific captions
+    # Build platform-specific captions (passed down explicitly rather than
+    # patching the shared SCHEDULE, so concurrent pipelines don't collide)
+    platforms = [platform_filter] if platform_filter else list(SCHEDULE["platforms"])
     captions = {
         platform: script_agent.adapt_caption_for_platform(
             script.get("description", ""), platform
         )
-        for platform in SCHEDULE["platforms"]
+        for platform in platforms
     }
 
-    if platform_filter:
-        captions = {platform_filter: captions.get(platform_filter, "")}
-
     if dry_run:
         logger.info(f"{Fore.YELLOW}DRY RUN – skipping actual publishing{Style.RESET_ALL}")
         results = {p: "dry-run" for p in captions}
     else:
-        # Apply platform filter to SCHEDULE temporarily
-        original_platforms = SCHEDULE["platforms"]
-        if platform_filter:
-            SCHEDULE["platforms"] = [platform_filter]
-
         results = await publisher_agent.publish_to_all_platforms(
             video_path=video_path,
             content_data={
-                "title":     script.get("title", f"Visit {LOCATION['name']}"),
+                "title":     script.get("title", f"Visit {loc_name}"),
                 "captions":  captions,
                 "thumbnail": thumbnail,
                 "tags":      hashtags.get("instagram", LOCATION["hashtags"]),
             },
+            platforms=platforms,
         )
-        SCHEDULE["platforms"] = original_platforms
 
     step_ok(f"Published: {results}")
 
@@ -307,19 +375,26 @@ def step_ok(detail: str) -> None:
 
 
 async def run_batch(count: int, args: argparse.Namespace) -> None:
-    """Generate and schedule *count* videos."""
+    """Generate and schedule *count* videos, a few at a time."""
     logger.info(f"Batch mode: generating {count} videos")
-    for i in range(count):
-        logger.info(f"Batch video {i + 1}/{count}")
-        try:
-            await run_full_pipeline(
-                override_topic=args.topic,
-                dry_run=args.dry_run,
-                platform_filter=args.platform,
-                language=args.language,
-            )
-        except Exception as exc:
-            logger.error(f"Batch video {i + 1} failed: {exc}")
+    # Most of a pipeline is waiting on APIs, so several overlap well; the
+    # cap keeps rate-limited services (gTTS, ElevenLabs, Pixabay) happy
+    sem = asyncio.Semaphore(max(1, min(count, config.BATCH_CONCURRENCY)))
+
+    async def one(i: int) -> None:
+        async with sem:
+            logger.info(f"Batch video {i + 1}/{count}")
+            try:
+                await run_full_pipeline(
+                    override_topic=args.topic,
+                    dry_run=args.dry_run,
+                    platform_filter=args.platform,
+                    language=args.language,
+                )
+            except Exception as exc:
+                logger.error(f"Batch video {i + 1} failed: {exc}")
+
+    await asyncio.gather(*(one(i) for i in range(count)))
 
 
 async def run_scheduled() -> None:
@@ -327,13 +402,14 @@ async def run_scheduled() -> None:
     banner("⏰ Scheduled Mode")
     logger.info(f"Post times: {SCHEDULE['post_times']} ({SCHEDULE['timezone']})")
 
+    async def discover_trends() -> None:
+        await trend_agent.discover_all_trends()
+
+    # Jobs are coroutine functions so the scheduler awaits them on the loop;
+    # a sync lambda would run in a worker thread, where create_task() fails
     scheduler.start()
-    scheduler.schedule_pipeline(
-        lambda: asyncio.create_task(run_full_pipeline())
-    )
-    scheduler.schedule_trend_discovery(
-        lambda: asyncio.create_task(trend_agent.discover_all_trends())
-    )
+    scheduler.schedule_pipeline(run_full_pipeline)
+    scheduler.schedule_trend_discovery(discover_trends)
     scheduler.schedule_cleanup(
         lambda: None  # Add file cleanup logic here if needed
     )
@@ -350,52 +426,59 @@ async def run_scheduled() -> None:
 
 async def main() -> None:
     """Main async entry point."""
-    parser = build_arg_parser()
-    args   = parser.parse_args()
-
-    # Ensure output directories exist
-    ensure_dirs()
-
-    # ── Analytics-only mode ───────────────────────────────────────────────────
-    if args.analytics:
-        banner("📊 Analytics Mode")
-        insights = analytics_agent.analyze_performance()
-        report   = analytics_agent.generate_report()
-        print(f"\n{Fore.GREEN}Report saved: {report}{Style.RESET_ALL}")
-        import json
-        print(json.dumps(insights, indent=2))
-        return
-
-    # ── Scheduled mode ────────────────────────────────────────────────────────
-    if args.schedule:
-        await run_scheduled()
-        return
-
-    # ── Batch mode ────────────────────────────────────────────────────────────
-    if args.count > 1:
-        await run_batch(args.count, args)
-        return
-
-    # ── Single video pipeline ─────────────────────────────────────────────────
-    results = await run_full_pipeline(
-        override_topic=args.topic,
-        dry_run=args.dry_run,
-        platform_filter=args.platform,
-        language=args.language,
-    )
+    try:
+        parser = build_arg_parser()
+        args   = parser.parse_args()
+
+        # Ensure output directories exist
+        ensure_dirs()
+
+        # ── Analytics-only mode ───────────────────────────────────────────────
+        if args.analytics:
+            banner("📊 Analytics Mode")
+            insights = analytics_agent.analyze_performance()
+            report   = analytics_agent.generate_report()
+            print(f"\n{Fore.GREEN}Report saved: {report}{Style.RESET_ALL}")
+            import json
+            print(json.dumps(insights, indent=2))
+            return
+
+        # ── Scheduled mode ────────────────────────────────────────────────────
+        if args.schedule:
+            await run_scheduled()
+            return
 
-    # Preview confirmation
-    if args.preview and not args.dry_run:
-        print(f"\n{Fore.YELLOW}Video ready for publishing.{Style.RESET_ALL}")
-        confirm = input("Publish now? [y/N] ").strip().lower()
-        if confirm != "y":
-            logger.info("Publishing cancelled by user")
+        # ── Batch mode ────────────────────────────────────────────────────────
+        if args.count > 1:
+            await run_batch(args.count, args)
             return
 
-    print(f"\n{Fore.GREEN}🎉 Done! Results:{Style.RESET_ALL}")
-    for platform, url in results.items():
-        status = f"{Fore.GREEN}{url}{Style.RESET_ALL}" if url and url != "dry-run" else f"{Fore.YELLOW}{url or 'failed'}{Style.RESET_ALL}"
-        print(f"  {platform:12} → {status}")
+        # ── Single video pipeline ─────────────────────────────────────────────
+        results = await run_full_pipeline(
+            override_topic=args.topic,
+            dry_run=args.dry_run,
+            platform_filter=args.platform,
+            language=args.language,
+        )
+
+        # Preview confirmation
+        if args.preview and not args.dry_run:
+            print(f"\n{Fore.YELLOW}Video ready for publishing.{Style.RESET_ALL}")
+            confirm = input("Publish now? [y/N] ").strip().lower()
+            if confirm != "y":
+                logger.info("Publishing cancelled by user")
+                return
+
+        print(f"\n{Fore.GREEN}🎉 Done! Results:{Style.RESET_ALL}")
+        for platform, url in results.items():
+            status = f"{Fore.GREEN}{url}{Style.RESET_ALL}" if url and url != "dry-run" else f"{Fore.YELLOW}{url or 'failed'}{Style.RESET_ALL}"
+            print(f"  {platform:12} → {status}")
+
+    finally:
+        if publisher_agent.loaded:
+            await publisher_agent.aclose()
+        if trend_agent.loaded:
+            await trend_agent.aclose()
 
 
 if __name__ == "__main__":
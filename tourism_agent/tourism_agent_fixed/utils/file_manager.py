@@ -3,15 +3,28 @@ File-system helpers for the Tourism Agent pipeline.
 All paths use pathlib.Path for cross-platform support.
 """
 
+import os
+import mmap
+import time
 import shutil
 import hashlib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional
 from datetime import datetime
+
+from config import BASE_DIR, OUTPUT_DIR, LOGS_DIR   # resolved once, in config
 from utils.logger import logger
+from utils.hash_cache import HashCache
 
+# BLAKE3 is an optional, SIMD/multi-threaded hash; fall back to the stdlib
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
-BASE_DIR   = Path(__file__).parent.parent
-OUTPUT_DIR = BASE_DIR / "output"
 
 DIRS = {
     "videos":  OUTPUT_DIR / "videos",
@@ -19,21 +32,52 @@ DIRS = {
     "audio":   OUTPUT_DIR / "audio",
     "scripts": OUTPUT_DIR / "scripts",
     "reports": OUTPUT_DIR / "reports",
-    "logs":    BASE_DIR / "logs",
+    "cache":   OUTPUT_DIR / "cache",
+    "logs":    LOGS_DIR,
 }
 
 
+# Folders already created this process; get_output_path() skips mkdir for
+# these. Racing threads at worst both call the idempotent mkdir.
+_dirs_ready: set[Path] = set()
+
+
 def ensure_dirs() -> None:
     """Create all required output directories if they don't exist."""
     for name, path in DIRS.items():
         path.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"Directory ready: {path}")
+        _dirs_ready.add(path)
+        logger.debug("Directory ready: {}", path)
+
+
+_issued: set[str] = set()
+_issued_lock = threading.Lock()
+_last_stamp: tuple[int, str] = (0, "")   # (epoch second, its formatted stamp)
+
+
+def unique_timestamp(prefix: str = "") -> str:
+    """
+    Return a 'YYYYmmdd_HHMMSS' stamp, suffixed '_2', '_3', … when the same
+    *prefix* already got that stamp in this process, so pipelines running
+    concurrently never share output names.
+    """
+    global _last_stamp
+    now = int(time.time())
+    with _issued_lock:
+        if _last_stamp[0] != now:   # format once per second, not per file
+            _last_stamp = (now, time.strftime("%Y%m%d_%H%M%S", time.localtime(now)))
+        ts = _last_stamp[1]
+        stamp, n = ts, 1
+        while f"{prefix}|{stamp}" in _issued:
+            n += 1
+            stamp = f"{ts}_{n}"
+        _issued.add(f"{prefix}|{stamp}")
+    return stamp
 
 
 def timestamped_filename(prefix: str, ext: str) -> str:
     """Return a unique filename like 'video_20240601_153045.mp4'."""
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"{prefix}_{ts}.{ext.lstrip('.')}"
+    return f"{prefix}_{unique_timestamp(prefix)}.{ext.lstrip('.')}"
 
 
 def get_output_path(category: str, filename: str) -> Path:
@@ -48,80 +92,325 @@ def get_output_path(category: str, filename: str) -> Path:
         Full Path object.
     """
     folder = DIRS.get(category, OUTPUT_DIR)
-    folder.mkdir(parents=True, exist_ok=True)
+    if folder not in _dirs_ready:
+        folder.mkdir(parents=True, exist_ok=True)
+        _dirs_ready.add(folder)
     return folder / filename
 
 
+_HASH_CHUNK = 1024 * 1024
+_HASH_SEQUENTIAL_MIN = 256 * 1024 * 1024   # ask for aggressive read-ahead above this
+_HEAD_BYTES = 64 * 1024
+
+
+_HASH_ALGO = "blake3" if blake3 is not None else "blake2b"
+
+_hash_cache: Optional[HashCache] = None
+_hash_cache_lock = threading.Lock()
+
+
+def _get_hash_cache() -> Optional[HashCache]:
+    """Open the shared hash cache on first use; None if it can't be opened."""
+    global _hash_cache
+    with _hash_cache_lock:
+        if _hash_cache is None:
+            try:
+                _hash_cache = HashCache(DIRS["cache"] / "file_hashes.db")
+            except Exception as exc:
+                logger.warning(f"Hash cache unavailable: {exc}")
+                return None
+        return _hash_cache
+
+
 def file_hash(path: Path) -> str:
-    """Return MD5 hash of a file for deduplication checks."""
-    h = hashlib.md5()
+    """
+    Return a 128-bit content hash of a file for deduplication checks
+    (BLAKE3 when installed, otherwise BLAKE2b).
+
+    Hashes are cached on disk by path, size and mtime, so an unchanged
+    file is only read once across runs.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns, _HASH_ALGO)
+    cache = _get_hash_cache()
+    written = _write_hashes.pop(key[0], None)
+    if written is not None and written[:2] == key[1:3]:
+        digest = written[2]              # hashed by HashingWriter as it was written
+    else:
+        if cache is not None:
+            cached = cache.get(*key)
+            if cached:
+                return cached
+        digest = _compute_hash(path, st.st_size)
+    if cache is not None:
+        cache.put(*key, digest)
+    return digest
+
+
+# abspath → (size, mtime_ns, digest) for files written through HashingWriter;
+# bounded, as most files are never asked for their full hash
+_write_hashes: dict[str, tuple[int, int, str]] = {}
+_WRITE_HASHES_MAX = 4096
+
+
+class HashingWriter:
+    """
+    Binary file writer that hashes the data as it is written, so a later
+    file_hash() of the same, unchanged file needs no second read.
+
+    Data goes to a private ``.part`` file that is renamed over *path* only
+    on a clean exit, so readers never see a half-written file.
+
+    Usage::
+
+        with HashingWriter(dest) as f:
+            f.write(data)
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._part = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex[:8]}.part")
+        self._f = open(self._part, "wb")
+        self._h = blake3.blake3() if blake3 is not None else hashlib.blake2b(digest_size=16)
+
+    def write(self, data: bytes) -> int:
+        self._h.update(data)
+        return self._f.write(data)
+
+    def __enter__(self) -> "HashingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._f.close()
+        if exc_type is not None:
+            self._part.unlink(missing_ok=True)
+            return
+        os.replace(self._part, self.path)
+        digest = self._h.hexdigest(length=16) if blake3 is not None else self._h.hexdigest()
+        st = os.stat(self.path)
+        if len(_write_hashes) >= _WRITE_HASHES_MAX:
+            del _write_hashes[next(iter(_write_hashes))]   # oldest entry
+        _write_hashes[os.path.abspath(self.path)] = (st.st_size, st.st_mtime_ns, digest)
+
+
+def _compute_hash(path: Path, size: int) -> str:
+    """Hash the full contents of *path* (*size* bytes long)."""
+    if blake3 is not None:
+        h = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        if size > _HASH_CHUNK:
+            h.update_mmap(path)      # multi-threaded over the mapped file
+        else:
+            h.update(Path(path).read_bytes())
+        return h.hexdigest(length=16)
+
+    h = hashlib.blake2b(digest_size=16)
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
+        try:
+            # Hash the mapped file as one buffer: no per-chunk read() calls
+            # or copies, and hashlib drops the GIL for the whole update
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if len(mm) >= _HASH_SEQUENTIAL_MIN and hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                h.update(mm)
+        except (ValueError, OSError):   # empty file, or not mappable
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                h.update(chunk)
     return h.hexdigest()
 
 
+def _head_hash(path: Path) -> str:
+    """Hash of the first _HEAD_BYTES of a file – a cheap pre-filter for file_hash()."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(_HEAD_BYTES), digest_size=16).hexdigest()
+
+
 def deduplicate_files(paths: list[Path]) -> list[Path]:
     """
     Remove duplicate files (by content hash) from a list of paths.
 
+    Files are compared by size first, then by a hash of their first 64 KiB,
+    and only files that still collide are hashed in full, so the common
+    all-distinct case reads almost nothing.
+
     Args:
         paths: List of Path objects.
 
     Returns:
         De-duplicated list preserving original order.
     """
-    seen: set[str] = set()
-    unique: list[Path] = []
+    # keys[i] grows (size, head hash, full hash) only while it collides;
+    # None means the file could not be read and is kept as-is
+    keys: list[Optional[tuple]] = []
     for p in paths:
         try:
-            h = file_hash(p)
-            if h not in seen:
-                seen.add(h)
-                unique.append(p)
-        except Exception as exc:
+            keys.append((p.stat().st_size,))
+        except OSError as exc:
             logger.warning(f"Could not hash {p}: {exc}")
+            keys.append(None)
+
+    def refine(hasher, skip_small: bool = False) -> None:
+        counts: dict[tuple, int] = {}
+        for k in keys:
+            if k is not None:
+                counts[k] = counts.get(k, 0) + 1
+        todo = [
+            i for i, k in enumerate(keys)
+            if k is not None and counts[k] > 1 and not (skip_small and k[0] <= _HEAD_BYTES)
+        ]
+        if not todo:
+            return
+
+        def safe(i: int) -> Optional[str]:
+            try:
+                return hasher(paths[i])
+            except Exception as exc:
+                logger.warning(f"Could not hash {paths[i]}: {exc}")
+                return None
+
+        # Hashing is mostly I/O and runs without the GIL, so files overlap
+        workers = min(8, os.cpu_count() or 1, len(todo))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i, h in zip(todo, pool.map(safe, todo)):
+                keys[i] = None if h is None else keys[i] + (h,)
+
+    refine(_head_hash)
+    refine(file_hash, skip_small=True)   # a head hash already covers small files
+
+    seen: set[tuple] = set()
+    unique: list[Path] = []
+    for p, k in zip(paths, keys):
+        if k is None:
             unique.append(p)  # keep it rather than lose it
+        elif k not in seen:
+            seen.add(k)
+            unique.append(p)
     removed = len(paths) - len(unique)
     if removed:
         logger.info(f"Removed {removed} duplicate file(s)")
     return unique
 
 
+def _walk_files(folder) -> Iterator[os.DirEntry]:
+    """
+    Yield every regular file under *folder* (symlinks are not followed).
+    os.scandir gets each entry's type from the directory listing itself,
+    so no extra stat() or Path object is needed per entry.
+    """
+    with os.scandir(folder) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
 def cleanup_temp_files(folder: Path, older_than_days: int = 7) -> int:
     """
-    Delete files in *folder* that are older than *older_than_days*.
+    Delete files in *folder* that are older than *older_than_days*, and
+    drop file-hash cache entries older than 30 days.
 
     Returns:
         Number of files deleted.
     """
-    from datetime import timedelta
+    cache = _get_hash_cache()
+    if cache is not None:
+        cache.prune(older_than_days=30)
+
     cutoff = datetime.now().timestamp() - older_than_days * 86400
+    stale: list[str] = []
+    for entry in _walk_files(folder):
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                stale.append(entry.path)
+        except OSError:
+            pass   # vanished since the listing
+    if not stale:
+        return 0
+
     count = 0
-    for p in folder.rglob("*"):
-        if p.is_file() and p.stat().st_mtime < cutoff:
-            try:
-                p.unlink()
-                count += 1
-            except Exception as exc:
-                logger.warning(f"Could not delete {p}: {exc}")
+    failed: list[str] = []
+    for path in stale:
+        try:
+            os.unlink(path)
+            count += 1
+        except OSError:
+            failed.append(path)
+    if failed:
+        # One summary line, not a log record per file
+        logger.warning(f"Could not delete {len(failed)} file(s); first: {failed[:5]}")
     logger.info(f"Cleaned up {count} old temp file(s) from {folder}")
     return count
 
 
-def copy_to_output(src: Path, category: str, new_name: str | None = None) -> Path:
+def clone_file(src: Path, dest: Path) -> None:
+    """
+    Copy the contents of *src* to *dest* (no metadata).
+
+    On Linux this uses copy_file_range(), which the kernel turns into a
+    reflink on copy-on-write filesystems (btrfs, XFS) and an in-kernel copy
+    elsewhere; other platforms use shutil.copyfile().
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+            return
+        except OSError:
+            pass   # e.g. unsupported by this filesystem pair; copyfile below
+    shutil.copyfile(src, dest)
+
+
+def copy_to_output(
+    src: Path,
+    category: str,
+    new_name: str | None = None,
+    preserve_metadata: bool = False,
+    dedupe: bool = False,
+) -> Path:
     """
     Copy *src* into the appropriate output sub-folder.
 
+    With *dedupe*, file contents are stored once in a content-addressed
+    store under output/cache/cas and the output is a hard link to it, so
+    copying the same render twice costs no extra space. Such outputs are
+    read-only: editing one in place changes every link to it, so replace
+    it instead.
+
     Args:
-        src:      Source file path.
-        category: Output category folder name.
-        new_name: Optional new filename; defaults to original name.
+        src:               Source file path.
+        category:          Output category folder name.
+        new_name:          Optional new filename; defaults to original name.
+        preserve_metadata: Also copy timestamps and permission bits (always
+                           a private copy, even with *dedupe*).
+        dedupe:            Hard-link to the shared store instead of copying.
 
     Returns:
         Destination Path.
     """
     dest = get_output_path(category, new_name or src.name)
-    shutil.copy2(src, dest)
-    logger.debug(f"Copied {src.name} → {dest}")
+    if preserve_metadata or not dedupe:
+        clone_file(src, dest)
+        if preserve_metadata:
+            shutil.copystat(src, dest)
+        logger.debug("Copied {} → {}", src.name, dest)
+        return dest
+
+    try:
+        digest = file_hash(src)
+        blob = DIRS["cache"] / "cas" / digest[:2] / digest
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            part = blob.with_name(f"{digest}.{uuid.uuid4().hex[:8]}.part")
+            clone_file(src, part)
+            os.replace(part, blob)
+        dest.unlink(missing_ok=True)
+        os.link(blob, dest)
+        # A link shares the blob's old mtime; touch it so cleanup_temp_files()
+        # sees a fresh output
+        os.utime(dest)
+    except OSError as exc:   # e.g. EXDEV/EPERM: no hard links here
+        logger.debug("Hard link failed ({}); copying {}", exc, src.name)
+        clone_file(src, dest)
+    logger.debug("Copied {} → {}", src.name, dest)
     return dest
@@ -0,0 +1,83 @@
+"""
+Persistent cache of file content hashes.
+A file whose path, size and mtime are unchanged since it was last hashed
+is assumed unchanged, so repeat dedup passes cost a stat() per file
+instead of reading every byte again.
+"""
+
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from utils.logger import logger
+
+
+class HashCache:
+    """
+    SQLite table of (path, size, mtime_ns, algorithm) → hex digest.
+
+    One connection is shared by all threads; the lock serialises access
+    from the dedup worker pool.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.conn as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS hashes (
+                    path     TEXT PRIMARY KEY,
+                    size     INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    algo     TEXT NOT NULL,
+                    digest   TEXT NOT NULL,
+                    stored   REAL NOT NULL
+                )
+            """)
+
+    def get(self, path: str, size: int, mtime_ns: int, algo: str) -> Optional[str]:
+        """Return the stored digest if *path* still has this size and mtime, else None."""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT digest FROM hashes "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ? AND algo = ?",
+                    (path, size, mtime_ns, algo),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning(f"Hash cache read failed: {exc}")
+            return None
+        return row[0] if row else None
+
+    def put(self, path: str, size: int, mtime_ns: int, algo: str, digest: str) -> None:
+        """Remember *digest* for this version of *path*."""
+        try:
+            with self._lock, self.conn as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, size, mtime_ns, algo, digest, time.time()),
+                )
+        except sqlite3.Error as exc:
+            logger.warning(f"Hash cache write failed: {exc}")
+
+    def prune(self, older_than_days: int = 30) -> int:
+        """
+        Drop entries stored more than *older_than_days* ago.
+
+        Returns:
+            Number of entries removed.
+        """
+        cutoff = time.time() - older_than_days * 86400
+        try:
+            with self._lock, self.conn as conn:
+                return conn.execute("DELETE FROM hashes WHERE stored < ?", (cutoff,)).rowcount
+        except sqlite3.Error as exc:
+            logger.warning(f"Hash cache prune failed: {exc}")
+            return 0
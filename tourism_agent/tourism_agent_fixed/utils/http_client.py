@@ -0,0 +1,116 @@
+"""
+Shared HTTP helpers for the Tourism Agent pipeline.
+Every agent talks to rate-limited public APIs, so sessions come with a
+sized keep-alive pool and a retry policy for transient failures, and
+repeatable JSON searches can be cached on disk between runs.
+"""
+
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "TourismAgent/1.0"
+
+
+def create_session(
+    pool_connections: int = 8,
+    pool_maxsize: int = 32,
+    retries: int = 3,
+    backoff_factor: float = 0.3,
+    status_forcelist: tuple[int, ...] = (429, 500, 502, 503, 504),
+) -> requests.Session:
+    """
+    Build a requests.Session with connection pooling and retries.
+
+    Args:
+        pool_connections: Number of per-host pools to keep.
+        pool_maxsize:     Max keep-alive connections per host.
+        retries:          Total retry attempts for idempotent requests.
+        backoff_factor:   Exponential backoff base in seconds.
+        status_forcelist: HTTP status codes that trigger a retry.
+
+    Returns:
+        Configured requests.Session.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class JsonCache:
+    """
+    On-disk cache for JSON GET responses.
+
+    Entries younger than *ttl* are served without any request; older ones
+    are revalidated with If-None-Match / If-Modified-Since when the server
+    sent an ETag or Last-Modified header.
+    """
+
+    def __init__(self, folder: Path, ttl: float = 3600.0) -> None:
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(url: str, params: dict) -> str:
+        """Stable cache key for a GET of *url* with query *params*."""
+        raw = json.dumps([url, sorted(params.items())], default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the stored entry for *key*, or None."""
+        try:
+            return json.loads((self.folder / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Optional[dict]) -> bool:
+        """True when *entry* can be used without asking the server."""
+        return entry is not None and time.time() - entry["fetched"] < self.ttl
+
+    @staticmethod
+    def validators(entry: Optional[dict]) -> dict:
+        """Conditional-request headers for revalidating a stale *entry*."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, key: str, data, headers=None) -> None:
+        """Store *data* (and the response's validators) under *key*."""
+        headers = headers or {}
+        entry = {
+            "fetched":       time.time(),
+            "etag":          headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "data":          data,
+        }
+        try:
+            (self.folder / f"{key}.json").write_text(json.dumps(entry), encoding="utf-8")
+        except OSError:
+            pass  # caching is best-effort
+
+    def touch(self, key: str, entry: dict) -> None:
+        """Mark a revalidated (304) *entry* as fresh again."""
+        self.put(key, entry["data"], {
+            "ETag": entry.get("etag"), "Last-Modified": entry.get("last_modified"),
+        })
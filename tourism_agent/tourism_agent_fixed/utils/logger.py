@@ -3,38 +3,58 @@ Centralised logging for the Tourism Agent pipeline.
 Uses loguru for rich, coloured output + file rotation.
 """
 
+import os
 import sys
+import zipfile
+import threading
 from pathlib import Path
 from loguru import logger
 
-LOG_FILE = Path(__file__).parent.parent / "logs" / "agent.log"
+import config
+
+LOG_FILE = config.LOGS_DIR / "agent.log"
 LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-# Remove default handler then add our custom ones
+# Remove default handler then add our custom ones. Both sinks enqueue: the
+# caller formats the record and queues it, and a background thread does the
+# writing and (for the file) rotation and compression.
 logger.remove()
 
-# ── Console handler (coloured) ────────────────────────────────────────────────
+# ── Console handler (coloured when stdout is a terminal) ──────────────────────
 logger.add(
     sys.stdout,
-    colorize=True,
+    colorize=sys.stdout.isatty(),
     format=(
         "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
         "<level>{level: <8}</level> | "
         "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
         "<level>{message}</level>"
     ),
-    level="DEBUG",
+    level=config.LOG_LEVEL,
+    enqueue=True,
 )
 
-# ── File handler (rotated daily, kept 7 days) ─────────────────────────────────
+# ── File handler (rotated at 50 MB, kept 7 days) ──────────────────────────────
+def _zip_log(path: str) -> None:
+    with zipfile.ZipFile(f"{path}.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.write(path, arcname=Path(path).name)
+    os.remove(path)
+
+
+def _compress_in_background(path: str) -> None:
+    """Zip a rotated log on its own thread so the sink resumes writing at once."""
+    threading.Thread(target=_zip_log, args=(path,), name="log-compress").start()
+
+
 logger.add(
     str(LOG_FILE),
-    rotation="1 day",
+    rotation="50 MB",
     retention="7 days",
-    compression="zip",
+    compression=_compress_in_background,
     format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-    level="DEBUG",
+    level=config.LOG_LEVEL,
     encoding="utf-8",
+    enqueue=True,
 )
 
 __all__ = ["logger"]
@@ -4,10 +4,17 @@ Runs the full pipeline 3 × / day and handles analytics, cleanup, etc.
 """
 
 import asyncio
+import functools
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+from apscheduler.events import (
+    EVENT_JOB_ADDED, EVENT_JOB_REMOVED, EVENT_JOB_MODIFIED, EVENT_JOB_SUBMITTED,
+    EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR,
+)
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_RUNNING
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 
@@ -15,13 +22,60 @@ from utils.logger import logger
 from config import SCHEDULE
 
 
+def _off_loop(fn: callable) -> callable:
+    """
+    Wrap a sync callable in a coroutine that runs it in a worker thread, so
+    a slow job (e.g. a large cleanup) can never stall the event loop
+    whatever executor the job lands on. Coroutine functions pass through.
+    """
+    if asyncio.iscoroutinefunction(fn):
+        return fn
+
+    @functools.wraps(fn)
+    async def run(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return run
+
+
 class AgentScheduler:
     """Wraps APScheduler with convenience helpers for the pipeline."""
 
     def __init__(self) -> None:
         self.tz = ZoneInfo(SCHEDULE["timezone"])
         self.scheduler = AsyncIOScheduler(timezone=self.tz)
-        self._jobs: dict[str, object] = {}
+        self._jobs: dict[str, object] = {}   # job ID → Job, as returned by add_job
+        self._triggers: dict[tuple, CronTrigger] = {}   # see _cron()
+        # list_jobs() result, rebuilt only after a job is added, removed or run
+        self._jobs_snapshot: list[dict] | None = None
+        self.scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_ADDED | EVENT_JOB_REMOVED | EVENT_JOB_MODIFIED | EVENT_JOB_SUBMITTED
+            | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR,
+        )
+
+    def _on_job_event(self, event) -> None:
+        """Invalidate the job listing; forget jobs APScheduler has removed (e.g. finished one-offs)."""
+        if event.code == EVENT_JOB_REMOVED:
+            self._jobs.pop(event.job_id, None)
+        self._jobs_snapshot = None
+
+    def _cron(self, **fields) -> CronTrigger:
+        """
+        Return a CronTrigger for *fields* in the scheduler's timezone, built
+        once per distinct schedule. Triggers are stateless, so jobs can share one.
+        """
+        key = tuple(sorted(fields.items()))
+        trigger = self._triggers.get(key)
+        if trigger is None:
+            # The timezone must be explicit: a bare CronTrigger uses the host's
+            # local zone, not the scheduler's
+            trigger = self._triggers[key] = CronTrigger(timezone=self.tz, **fields)
+        return trigger
+
+    def _remember(self, job) -> None:
+        """Keep a reference to a newly added job and invalidate the listing."""
+        self._jobs[job.id] = job
+        self._jobs_snapshot = None
 
     # ── Lifecycle ─────────────────────────────────────────────────────────────
 
@@ -37,6 +91,21 @@ class AgentScheduler:
             self.scheduler.shutdown(wait=False)
             logger.info("Scheduler stopped")
 
+    @contextmanager
+    def _batched(self):
+        """
+        Pause a running scheduler while a group of jobs is added, so it
+        recomputes its next wake-up once on resume instead of per add_job.
+        """
+        if self.scheduler.state != STATE_RUNNING:
+            yield
+            return
+        self.scheduler.pause()
+        try:
+            yield
+        finally:
+            self.scheduler.resume()
+
     # ── Registration helpers ───────────────────────────────────────────────────
 
     def schedule_pipeline(self, pipeline_fn: callable) -> None:
@@ -46,48 +115,53 @@ class AgentScheduler:
         Args:
             pipeline_fn: Async callable that runs the full pipeline.
         """
-        for time_str in SCHEDULE["post_times"]:
-            hour, minute = map(int, time_str.split(":"))
-            job_id = f"pipeline_{time_str}"
-            self.scheduler.add_job(
-                pipeline_fn,
-                CronTrigger(hour=hour, minute=minute, timezone=self.tz),
-                id=job_id,
-                replace_existing=True,
-                misfire_grace_time=300,  # 5 min grace
-            )
-            logger.info(f"Pipeline scheduled at {time_str} ({SCHEDULE['timezone']})")
+        with self._batched():
+            for time_str in SCHEDULE["post_times"]:
+                hour, minute = map(int, time_str.split(":"))
+                job_id = f"pipeline_{time_str}"
+                job = self.scheduler.add_job(
+                    pipeline_fn,
+                    self._cron(hour=hour, minute=minute),
+                    id=job_id,
+                    replace_existing=True,
+                    misfire_grace_time=300,  # 5 min grace
+                )
+                self._remember(job)
+                logger.info(f"Pipeline scheduled at {time_str} ({SCHEDULE['timezone']})")
 
     def schedule_trend_discovery(self, trend_fn: callable) -> None:
         """Run trend discovery every morning at 07:00."""
-        self.scheduler.add_job(
+        job = self.scheduler.add_job(
             trend_fn,
-            CronTrigger(hour=7, minute=0, timezone=self.tz),
+            self._cron(hour=7, minute=0),
             id="trend_discovery",
             replace_existing=True,
         )
+        self._remember(job)
         logger.info("Trend discovery scheduled at 07:00 daily")
 
     def schedule_analytics(self, analytics_fn: callable, post_ids: dict) -> None:
         """Check analytics 24 hours after publishing."""
         run_at = datetime.now(tz=self.tz) + timedelta(hours=24)
         job_id = f"analytics_{run_at.strftime('%Y%m%d_%H%M%S')}"
-        self.scheduler.add_job(
+        job = self.scheduler.add_job(
             analytics_fn,
             DateTrigger(run_date=run_at, timezone=self.tz),
             id=job_id,
             args=[post_ids],
         )
+        self._remember(job)
         logger.info(f"Analytics check scheduled for {run_at.strftime('%Y-%m-%d %H:%M')}")
 
     def schedule_cleanup(self, cleanup_fn: callable) -> None:
         """Run temp-file cleanup every Sunday at 03:00."""
-        self.scheduler.add_job(
-            cleanup_fn,
-            CronTrigger(day_of_week="sun", hour=3, minute=0, timezone=self.tz),
+        job = self.scheduler.add_job(
+            _off_loop(cleanup_fn),
+            self._cron(day_of_week="sun", hour=3, minute=0),
             id="weekly_cleanup",
             replace_existing=True,
         )
+        self._remember(job)
         logger.info("Weekly cleanup scheduled for Sunday 03:00")
 
     def schedule_task(
@@ -101,7 +175,7 @@ class AgentScheduler:
         Schedule a one-off task to run after a delay.
 
         Args:
-            fn:               Async or sync callable.
+            fn:               Async or sync callable; sync ones run in a thread.
             run_after_hours:  Hours from now.
             args:             Positional arguments for *fn*.
             kwargs:           Keyword arguments for *fn*.
@@ -111,23 +185,32 @@ class AgentScheduler:
         """
         run_at = datetime.now(tz=self.tz) + timedelta(hours=run_after_hours)
         job_id = f"task_{fn.__name__}_{run_at.strftime('%Y%m%d_%H%M%S')}"
-        self.scheduler.add_job(
-            fn,
+        job = self.scheduler.add_job(
+            _off_loop(fn),
             DateTrigger(run_date=run_at, timezone=self.tz),
             id=job_id,
             args=args or [],
             kwargs=kwargs or {},
         )
+        self._remember(job)
         logger.info(f"Task '{fn.__name__}' scheduled for {run_at.strftime('%H:%M')} (+{run_after_hours}h)")
         return job_id
 
     def list_jobs(self) -> list[dict]:
-        """Return summary of all scheduled jobs."""
-        jobs = []
-        for job in self.scheduler.get_jobs():
-            jobs.append({
-                "id": job.id,
-                "next_run": str(job.next_run_time),
-                "func": job.func.__name__ if hasattr(job.func, "__name__") else str(job.func),
-            })
-        return jobs
+        """
+        Return summary of all scheduled jobs.
+
+        The list is cached until a job is added, removed or run, so polling
+        it does not touch the scheduler; treat it as read-only.
+        """
+        if self._jobs_snapshot is None:
+            self._jobs_snapshot = [
+                {
+                    "id": job.id,
+                    # unset until the scheduler has started
+                    "next_run": str(getattr(job, "next_run_time", None)),
+                    "func": job.func.__name__ if hasattr(job.func, "__name__") else str(job.func),
+                }
+                for job in self._jobs.values()
+            ]
+        return self._jobs_snapshot
@@ -0,0 +1,70 @@
+"""
+Client-side rate limiting for the Tourism Agent pipeline.
+Each upstream API ("realm") gets one token bucket shared by the whole
+process, so bursts go out immediately and only sustained traffic waits.
+"""
+
+import time
+import asyncio
+import threading
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to *capacity* requests, refilled evenly so an
+    empty bucket is full again after *fill_time_s* seconds.
+
+    Tokens may go negative: every caller reserves its slot up front and
+    then sleeps until that slot comes due, which keeps concurrent waiters
+    in arrival order without polling.
+    """
+
+    def __init__(self, capacity: int, fill_time_s: float) -> None:
+        self.capacity = capacity
+        self.rate = capacity / fill_time_s           # tokens per second
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()               # shared by threads and the loop
+
+    def _reserve(self) -> float:
+        """Take one token; return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be sent."""
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(realm: str, capacity: int, fill_time_s: float) -> TokenBucket:
+    """
+    Return the process-wide bucket for *realm*, creating it on first use.
+
+    Args:
+        realm:       API name, e.g. "reddit".
+        capacity:    Burst size in requests.
+        fill_time_s: Seconds to refill an empty bucket.
+
+    Returns:
+        The shared TokenBucket for *realm*.
+    """
+    with _buckets_lock:
+        if realm not in _buckets:
+            _buckets[realm] = TokenBucket(capacity, fill_time_s)
+        return _buckets[realm]
@@ -0,0 +1,79 @@
+"""
+Content-addressed cache for synthesised speech.
+The same narration with the same voice settings always produces the same
+audio, so a repeat request is served from disk instead of spending API
+quota and seconds of synthesis time.
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from utils.logger import logger
+from utils.file_manager import clone_file
+
+
+class AudioCache:
+    """
+    Directory of audio files named by a hash of everything that shaped
+    them, capped at *max_bytes* with least-recently-used eviction.
+    """
+
+    def __init__(self, folder: Path, max_bytes: int = 500 * 1024 * 1024) -> None:
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(text: str, *settings) -> str:
+        """Stable cache key for *text* rendered with *settings* (engine, voice, …)."""
+        raw = "|".join(map(str, settings)) + "|" + text
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str, dest: Path) -> Optional[Path]:
+        """
+        Copy the cached audio for *key* to *dest*.
+
+        Args:
+            key:  Key from AudioCache.key().
+            dest: Where the caller wants the file.
+
+        Returns:
+            *dest* on a hit, None on a miss.
+        """
+        cached = self.folder / f"{key}{dest.suffix}"
+        try:
+            clone_file(cached, dest)
+        except OSError:
+            return None
+        os.utime(cached)   # mark as recently used
+        logger.info(f"TTS cache hit: {dest.name}")
+        return dest
+
+    def put(self, key: str, src: Path) -> None:
+        """Store a copy of *src* under *key* (atomically), then enforce the size cap."""
+        cached = self.folder / f"{key}{src.suffix}"
+        part = cached.with_suffix(cached.suffix + ".part")
+        try:
+            clone_file(src, part)
+            os.replace(part, cached)
+        except OSError as exc:
+            logger.warning(f"TTS cache write failed: {exc}")
+            part.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until the folder fits in max_bytes."""
+        entries = []
+        for p in self.folder.iterdir():
+            if p.suffix != ".part":
+                st = p.stat()
+                entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size